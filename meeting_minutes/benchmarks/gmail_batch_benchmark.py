@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Offline benchmark of multi-recipient draft creation.
+
+Creates the minutes draft for N recipients against the offline fake Gmail
+service, once with a create_minutes_draft call per recipient (a Markdown
+render and an HTTP round trip each) and once with create_minutes_drafts
+(one render, one batch request), and reports wall time and HTTP requests.
+
+    python benchmarks/gmail_batch_benchmark.py --recipients 1,5,20 --latency-ms 150
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'meeting_minutes'))
+
+from email_delivery import create_minutes_draft, create_minutes_drafts
+from fake_gmail import FakeGmailService
+
+MINUTES = "# Meeting Minutes\n\n" + "\n".join(
+    f"## Topic {i}\n\n- Decision {i}: ship it\n- Owner: team {i}\n\n| Item | Due |\n|---|---|\n| Task {i} | Friday |"
+    for i in range(30)
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipients", default="1,5,20", help="Comma-separated recipient counts to compare")
+    parser.add_argument("--latency-ms", type=float, default=150, help="Fake Gmail latency per HTTP round trip")
+    args = parser.parse_args()
+
+    print(f"{'recipients':>10} {'mode':>10} {'wall s':>8} {'requests':>8} {'speedup':>7}")
+    for count in (int(value) for value in args.recipients.split(",")):
+        recipients = [f"group{i}@example.com" for i in range(count)]
+
+        service = FakeGmailService(latency_ms=args.latency_ms)
+        started = time.perf_counter()
+        sequential = [create_minutes_draft(MINUTES, "me@example.com", recipient, service=service)
+                      for recipient in recipients]
+        sequential_time = time.perf_counter() - started
+        assert all(result.success for result in sequential)
+        print(f"{count:>10} {'sequential':>10} {sequential_time:>8.2f} {service.http_requests:>8} {1:>7.1f}x")
+
+        service = FakeGmailService(latency_ms=args.latency_ms)
+        started = time.perf_counter()
+        batch = create_minutes_drafts(MINUTES, "me@example.com", recipients, service=service)
+        batch_time = time.perf_counter() - started
+        assert batch.success
+        print(f"{count:>10} {'batch':>10} {batch_time:>8.2f} {service.http_requests:>8} "
+              f"{sequential_time / batch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Benchmark of Markdown rendering for the minutes email.
+
+Renders a synthetic minutes document (headings, bullet lists, tables and
+code blocks) the way create_message used to (a new markdown.Markdown per
+call) and with the MarkdownRenderer, uncached (instance reused and reset)
+and cached, and reports the time per render.
+
+    python benchmarks/markdown_render_benchmark.py --sections 200 --repeat 20
+"""
+import argparse
+import os
+import sys
+import time
+
+import markdown
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'meeting_minutes'))
+
+from markdown_renderer import EXTENSIONS, HTML_TEMPLATE, MarkdownRenderer
+
+
+def synthetic_minutes(sections: int) -> str:
+    parts = ["# Meeting Minutes\n"]
+    for i in range(sections):
+        parts.append(
+            f"## Topic {i}\n\nDiscussion of item {i}, with **emphasis** and `inline code`.\n"
+            f"Second line of the paragraph.\n\n"
+            f"- Decision {i}: ship it\n- Owner: team {i}\n- Due: Friday\n\n"
+            f"| Item | Owner | Due |\n|------|-------|-----|\n| Task {i} | Ana | Friday |\n| Review {i} | Bo | Monday |\n\n"
+            f"```\nstatus = {i}\n```\n"
+        )
+    return "\n".join(parts)
+
+
+def timed(render, text: str, repeat: int, rounds: int = 3) -> float:
+    """Best average time per render over ``rounds`` rounds, after a warm-up render."""
+    render(text)
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            render(text)
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=200, help="Topics in the synthetic minutes")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    text = synthetic_minutes(args.sections)
+    print(f"Document: {len(text) / 1024:.0f} KiB of Markdown, {args.sections} sections")
+
+    def fresh(text):
+        return HTML_TEMPLATE.format(final_email_body=markdown.Markdown(extensions=list(EXTENSIONS)).convert(text))
+
+    uncached = MarkdownRenderer(cache_size=0, inline_css=False)
+    cached = MarkdownRenderer(inline_css=False)
+    inlined = MarkdownRenderer(inline_css=True, cache_size=0)
+    assert uncached.email_html(text) == fresh(text)
+
+    results = [
+        ("new Markdown per call", timed(fresh, text, args.repeat)),
+        ("reused instance", timed(uncached.email_html, text, args.repeat)),
+        ("reused + inline CSS", timed(inlined.email_html, text, args.repeat)),
+        ("cached", timed(cached.email_html, text, args.repeat)),
+    ]
+    baseline = results[0][1]
+    print(f"{'renderer':>22} {'ms/render':>10} {'speedup':>8}")
+    for name, seconds in results:
+        print(f"{name:>22} {seconds * 1000:>10.3f} {baseline / seconds:>7.1f}x")
+
+    # Small documents show the cost of building the Markdown instance itself
+    small = synthetic_minutes(3)
+    small_fresh = timed(fresh, small, args.repeat * 10)
+    small_reused = timed(uncached.email_html, small, args.repeat * 10)
+    print(f"3-section minutes: {small_fresh * 1000:.3f} ms new instance, {small_reused * 1000:.3f} ms reused "
+          f"({small_fresh / small_reused:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
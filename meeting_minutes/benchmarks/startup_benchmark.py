@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Cold-start import report of the meeting minutes modules.
+
+Imports a statement in a fresh interpreter with ``python -X importtime`` and
+prints the slowest imports (cumulative time, nested imports included) and
+which heavy dependencies were loaded, over several runs.
+
+    python benchmarks/startup_benchmark.py --statement "import main" --top 15
+"""
+import argparse
+import os
+import statistics
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'meeting_minutes')
+sys.path.append(SRC_DIR)
+
+from bootstrap import import_time_breakdown
+
+DEFAULT_STATEMENT = (
+    "import email_delivery, email_outbox, transcription, streaming_pipeline, markdown_renderer, "
+    "telemetry, flow_checkpoint, token_budget, summarization, llm_cache, import_helper"
+)
+HEAVY_MODULES = {"crewai", "litellm", "openai", "agentops", "pydub", "numpy", "markdown", "tiktoken",
+                 "googleapiclient", "streamlit"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statement", default=DEFAULT_STATEMENT)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals, last = [], []
+    for _ in range(args.runs):
+        last = import_time_breakdown(args.statement, path=[SRC_DIR])
+        totals.append(sum(entry.cumulative_us for entry in last if entry.depth == 0) / 1000)
+
+    print(args.statement)
+    print(f"Cold start: median {statistics.median(totals):.0f} ms, min {min(totals):.0f} ms over {args.runs} runs")
+    heavy = sorted({entry.module.split(".")[0] for entry in last} & HEAVY_MODULES)
+    print(f"Heavy modules loaded: {', '.join(heavy) or 'none'}")
+    print("Slowest imports (last run):")
+    for entry in sorted(last, key=lambda entry: entry.cumulative_us, reverse=True)[:args.top]:
+        print(f"  {entry.cumulative_us / 1000:8.1f} ms  {'  ' * entry.depth}{entry.module}")
+
+
+if __name__ == "__main__":
+    main()
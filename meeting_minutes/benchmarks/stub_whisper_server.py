@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Stand-in for the OpenAI transcription endpoint.
+
+Serves POST /v1/audio/transcriptions with the behaviour of the local
+transcription backend (latency, jitter, injected 503s and 429s, deterministic
+text), so the real OpenAI client and HTTP stack can be load-tested offline:
+
+    python benchmarks/stub_whisper_server.py --port 8099 --latency-ms 800 --error-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8099/v1 OPENAI_API_KEY=stub TRANSCRIPTION_CACHE=0 \\
+        python benchmarks/transcription_benchmark.py --backend openai
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'meeting_minutes'))
+
+from transcription_backends import LocalBackend, StubAPIError
+
+
+def uploaded_file(content_type: str, body: bytes) -> bytes:
+    """Bytes of the ``file`` field of a multipart/form-data request body."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True)
+    raise ValueError("multipart body has no 'file' field")
+
+
+def make_handler(backend: LocalBackend):
+    class StubWhisperHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, payload: dict, headers=None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not self.path.rstrip("/").endswith("/audio/transcriptions"):
+                self._reply(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+            try:
+                audio = uploaded_file(self.headers.get("Content-Type", ""), body)
+                text = backend.transcribe(io.BytesIO(audio), "upload", "whisper-1")
+            except StubAPIError as e:
+                self._reply(e.status_code, {"error": {"message": str(e)}}, e.response.headers)
+            except ValueError as e:
+                self._reply(400, {"error": {"message": str(e)}})
+            else:
+                self._reply(200, {"text": text})
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubWhisperHandler
+
+
+def start_server(backend: LocalBackend, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Serve ``backend`` on a background thread. Port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), make_handler(backend))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    backend = LocalBackend(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(backend))
+    print(f"Stand-in Whisper endpoint on http://{args.host}:{server.server_port}/v1/audio/transcriptions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Offline transcription pipeline benchmark.
+
+Runs chunking, encoding, request scheduling and the concurrent transcription
+engine against the local stand-in backend (or the stand-in HTTP server via
+--backend openai and OPENAI_BASE_URL) for several worker counts, and reports
+wall time, throughput and scheduler metrics. Without --audio a synthetic
+recording of alternating tone bursts and pauses is generated.
+
+    python benchmarks/transcription_benchmark.py --minutes 30 --workers 1,2,4,8 --latency-ms 800
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import wave
+
+import numpy as np
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'meeting_minutes'))
+
+# Measure the pipeline, not the cache
+os.environ["TRANSCRIPTION_CACHE"] = "0"
+
+from audio_chunking import open_chunk_source, probe_audio
+from rate_limiter import RequestScheduler
+from transcription import chunk_transcriber, transcribe_chunks
+from transcription_backends import LocalBackend, create_transcription_backend
+
+
+def write_synthetic_recording(path: str, minutes: float, frame_rate: int = 16000, seed: int = 0) -> None:
+    """Mono 16-bit WAV of 1-6s tone bursts separated by 0.3-3s pauses."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * frame_rate)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        written = 0
+        while written < total:
+            burst = min(total - written, int(rng.uniform(1, 6) * frame_rate))
+            t = np.arange(burst) / frame_rate
+            tone = 0.3 * np.sin(2 * np.pi * rng.uniform(120, 300) * t) + 0.02 * rng.standard_normal(burst)
+            wav.writeframes((tone * 32767).astype("<i2").tobytes())
+            written += burst
+            pause = min(total - written, int(rng.uniform(0.3, 3) * frame_rate))
+            wav.writeframes(np.zeros(pause, dtype="<i2").tobytes())
+            written += pause
+
+
+def run(audio_path: str, backend, workers: int, args):
+    scheduler = RequestScheduler(requests_per_minute=args.rpm, max_concurrent=workers, max_retries=args.max_retries)
+    chunks = open_chunk_source(audio_path, int(args.chunk_seconds * 1000), skip_silence=args.skip_silence)
+    result = transcribe_chunks(
+        chunks,
+        chunk_transcriber(backend, profile=args.profile, scheduler=scheduler),
+        max_workers=workers,
+    )
+    return result, scheduler.metrics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", help="Recording to transcribe (default: synthetic)")
+    parser.add_argument("--minutes", type=float, default=30, help="Length of the synthetic recording")
+    parser.add_argument("--chunk-seconds", type=float, default=60)
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts to compare")
+    parser.add_argument("--profile", default="speech_wav", help="Encoding profile (non-WAV profiles need ffmpeg)")
+    parser.add_argument("--skip-silence", action="store_true", help="Use the silence-aware chunker")
+    parser.add_argument("--backend", default="local", help="local, or openai to target OPENAI_BASE_URL")
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--jitter-ms", type=float, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=float, default=6000, help="Scheduler requests-per-minute limit")
+    parser.add_argument("--max-retries", type=int, default=6)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_path = args.audio
+        if not audio_path:
+            audio_path = os.path.join(temp_dir, "synthetic.wav")
+            write_synthetic_recording(audio_path, args.minutes)
+        _, duration_ms = probe_audio(audio_path)
+        audio_seconds = (duration_ms or 0) / 1000
+        print(f"Recording: {audio_seconds / 60:.1f} min, {args.chunk_seconds:.0f}s chunks, profile {args.profile}")
+
+        print(f"{'workers':>7} {'chunks':>6} {'wall s':>8} {'audio s/s':>9} {'speedup':>7} "
+              f"{'MB up':>7} {'retries':>7} {'avg wait s':>10} {'peak queue':>10}  transcript")
+        baseline = None
+        for workers in (int(w) for w in args.workers.split(",")):
+            if args.backend == "local":
+                backend = LocalBackend(
+                    latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                    throttle_rate=args.throttle_rate, seed=workers,
+                )
+            else:
+                backend = create_transcription_backend(args.backend)
+            result, metrics = run(audio_path, backend, workers, args)
+            baseline = baseline or result.wall_time
+            print(
+                f"{workers:>7} {len(result.chunks):>6} {result.wall_time:>8.2f} "
+                f"{audio_seconds / result.wall_time:>9.1f} {baseline / result.wall_time:>6.1f}x "
+                f"{result.bytes_uploaded / 1024 / 1024:>7.1f} {metrics.retries:>7} "
+                f"{metrics.average_wait:>10.2f} {metrics.max_queue_depth:>10}  "
+                f"{hashlib.sha256(result.text.encode()).hexdigest()[:12]}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Streaming audio chunker.
+
+Reads a recording one window at a time instead of decoding the whole file
+into a single pydub.AudioSegment, so peak memory depends on the chunk length
+rather than the meeting length. WAV files are read directly with the ``wave``
+module; anything else is decoded to PCM by an ffmpeg subprocess and read from
+its stdout pipe.
+"""
+
+import math
+import os
+import subprocess
+import tempfile
+import wave
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+DEFAULT_CHUNK_LENGTH_MS = 60000
+
+
+@dataclass
+class PCMParams:
+    """Raw PCM layout of a decoded audio stream."""
+
+    sample_width: int
+    frame_rate: int
+    channels: int
+
+    @property
+    def frame_size(self) -> int:
+        return self.sample_width * self.channels
+
+    def frames_for(self, duration_ms: int) -> int:
+        return max(1, int(self.frame_rate * duration_ms / 1000))
+
+
+def _read_exactly(stream, size: int) -> bytes:
+    """Read ``size`` bytes from a pipe, or fewer only at end of stream."""
+    parts = []
+    remaining = size
+    while remaining > 0:
+        data = stream.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
+
+
+def _is_wav(path: str) -> bool:
+    try:
+        with wave.open(path, "rb"):
+            return True
+    except (wave.Error, EOFError):
+        return False
+
+
+def ffmpeg_binary() -> str:
+    """Path of the ffmpeg executable pydub is configured to use."""
+    try:
+        from pydub import AudioSegment
+        return AudioSegment.converter
+    except ImportError:
+        return "ffmpeg"
+
+
+def probe_audio(path: str):
+    """Return ``(PCMParams, duration_ms)`` for a recording without decoding it.
+
+    Duration is None if it cannot be determined from the container.
+    """
+    if _is_wav(path):
+        with wave.open(path, "rb") as wav:
+            params = PCMParams(wav.getsampwidth(), wav.getframerate(), wav.getnchannels())
+            duration_ms = int(wav.getnframes() * 1000 / wav.getframerate())
+        return params, duration_ms
+
+    from pydub.utils import mediainfo
+
+    info = mediainfo(path)
+    params = PCMParams(
+        sample_width=2,
+        frame_rate=int(info.get("sample_rate") or 44100),
+        channels=int(info.get("channels") or 1),
+    )
+    try:
+        duration_ms = int(float(info["duration"]) * 1000)
+    except (KeyError, ValueError):
+        duration_ms = None
+    return params, duration_ms
+
+
+def iter_pcm_windows(path: str, chunk_length_ms: int = DEFAULT_CHUNK_LENGTH_MS,
+                     params: Optional[PCMParams] = None) -> Iterator[bytes]:
+    """Yield raw PCM for consecutive ``chunk_length_ms`` windows of a recording.
+
+    Only one window is held in memory at a time. The last window may be shorter.
+    """
+    if _is_wav(path):
+        with wave.open(path, "rb") as wav:
+            frames = PCMParams(wav.getsampwidth(), wav.getframerate(), wav.getnchannels()).frames_for(chunk_length_ms)
+            while True:
+                data = wav.readframes(frames)
+                if not data:
+                    break
+                yield data
+        return
+
+    if params is None:
+        params, _ = probe_audio(path)
+    window_bytes = params.frames_for(chunk_length_ms) * params.frame_size
+    command = [
+        ffmpeg_binary(), "-nostdin", "-v", "error",
+        "-i", path,
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ar", str(params.frame_rate), "-ac", str(params.channels),
+        "-",
+    ]
+    # stderr goes to a file: a full stderr pipe would stall ffmpeg while we wait on stdout
+    stderr = tempfile.TemporaryFile()
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+    except BaseException:
+        stderr.close()
+        raise
+    try:
+        while True:
+            data = _read_exactly(process.stdout, window_bytes)
+            if not data:
+                break
+            yield data
+        if process.wait() != 0:
+            stderr.seek(0)
+            error = stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed to decode {path}: {error}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        stderr.close()
+
+
+class AudioChunkSource:
+    """Iterable of fixed-length pydub.AudioSegment chunks read lazily from disk.
+
+    Drop-in replacement for ``make_chunks(AudioSegment.from_file(path), ms)``:
+    it supports ``len()`` and iteration, but decodes one chunk at a time.
+    """
+
+    def __init__(self, path: str, chunk_length_ms: int = DEFAULT_CHUNK_LENGTH_MS):
+        self.path = str(path)
+        self.chunk_length_ms = chunk_length_ms
+        self.params, self.duration_ms = probe_audio(self.path)
+
+    def __len__(self) -> int:
+        if self.duration_ms is None:
+            raise TypeError("chunk count is unknown for this recording")
+        return max(1, math.ceil(self.duration_ms / self.chunk_length_ms))
+
+    def chunk_offset_ms(self, index: int) -> int:
+        """Start of chunk ``index`` in the recording."""
+        return index * self.chunk_length_ms
+
+    def __iter__(self):
+        from pydub import AudioSegment
+
+        for data in iter_pcm_windows(self.path, self.chunk_length_ms, self.params):
+            yield AudioSegment(
+                data=data,
+                sample_width=self.params.sample_width,
+                frame_rate=self.params.frame_rate,
+                channels=self.params.channels,
+            )
+
+
+def silence_skipping_enabled() -> bool:
+    """TRANSCRIPTION_SKIP_SILENCE is on unless set to 0/false/off."""
+    return os.getenv("TRANSCRIPTION_SKIP_SILENCE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def open_chunk_source(path: str, chunk_length_ms: int = DEFAULT_CHUNK_LENGTH_MS,
+                      skip_silence: Optional[bool] = None, max_chunk_ms: Optional[int] = None):
+    """Return the chunk source used by the CLI flow and the Streamlit app.
+
+    With ``skip_silence`` (default: silence_skipping_enabled()) chunks are cut
+    at pauses and long silences are dropped, see
+    voice_activity.SilenceAwareChunkSource; ``max_chunk_ms`` caps how far a
+    chunk may run past ``chunk_length_ms`` while waiting for a pause.
+    Otherwise chunks are fixed length windows.
+    """
+    if skip_silence is None:
+        skip_silence = silence_skipping_enabled()
+    if not skip_silence:
+        return AudioChunkSource(path, chunk_length_ms)
+
+    try:
+        from .voice_activity import SilenceAwareChunkSource
+    except ImportError:
+        from voice_activity import SilenceAwareChunkSource
+    return SilenceAwareChunkSource(path, chunk_length_ms, max_chunk_ms=max_chunk_ms)
@@ -0,0 +1,160 @@
+"""
+One-time process setup shared by every entry point, and startup timing.
+
+``bootstrap()`` sets the ChromaDB/tokenizer environment variables, installs
+the warning filters and applies the SQLite compatibility patch. The CLI flow,
+the Streamlit app, the package ``__init__`` and import_helper all call it;
+only the first call in a process does anything.
+
+Heavy dependencies (crewai crews, agentops, tiktoken, markdown, pydub,
+NumPy, the OpenAI and Google clients) are imported where they are first
+used rather than at startup. ``lazy_import`` and ``startup_phase`` record
+how long each of those first loads took, and ``startup_report()`` lists
+them (STARTUP_REPORT=1 prints it). For a full ``-X importtime`` breakdown of
+a statement, see ``import_time_breakdown``.
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+import types
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, List
+
+# Set before ChromaDB (pulled in by crewai) is imported
+CHROMA_ENVIRONMENT = {
+    "CHROMA_SILENCE_DEPRECATION_WARNINGS": "1",
+    "TOKENIZERS_PARALLELISM": "false",
+    "CHROMA_DB_IMPL": "duckdb+parquet",
+}
+
+IGNORED_WARNING_MESSAGES = (".*sqlite3.*", ".*SQLite.*", ".*Chroma.*", ".*unsupported version.*")
+
+# This file is imported both as meeting_minutes.bootstrap (the package) and as
+# bootstrap (src/meeting_minutes on sys.path, as streamlit_app and the flat
+# import fallbacks do), which gives two module objects. Their state is kept in
+# one shared object in sys.modules, so the setup still runs once per process.
+_STATE_KEY = "meeting_minutes._bootstrap_state"
+_state = sys.modules.get(_STATE_KEY)
+if _state is None:
+    _state = types.ModuleType(_STATE_KEY)
+    _state.bootstrapped = False
+    _state.bootstrap_lock = threading.Lock()
+    _state.started = time.perf_counter()
+    _state.phases = {}
+    _state.phases_lock = threading.Lock()
+    _state = sys.modules.setdefault(_STATE_KEY, _state)
+
+
+def startup_report_enabled() -> bool:
+    """STARTUP_REPORT: print the startup timing report (default off)."""
+    return os.getenv("STARTUP_REPORT", "0").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _patch_sqlite() -> None:
+    try:
+        from .sqlite_patch import force_chromadb_compatibility, patch_sqlite_version
+    except ImportError:
+        try:
+            from sqlite_patch import force_chromadb_compatibility, patch_sqlite_version
+        except ImportError as e:
+            print(f"⚠️  Could not import SQLite patch: {e}")
+            try:
+                import pysqlite3
+                sys.modules['sqlite3'] = pysqlite3
+                print("✅ Replaced sqlite3 with pysqlite3")
+            except ImportError:
+                print("⚠️  pysqlite3 not available, using system sqlite3")
+            return
+    patch_sqlite_version()
+    force_chromadb_compatibility()
+
+
+def bootstrap() -> bool:
+    """Apply the process-wide setup once. Returns False if it had already run."""
+    with _state.bootstrap_lock:
+        if _state.bootstrapped:
+            return False
+        with startup_phase("bootstrap"):
+            for name, value in CHROMA_ENVIRONMENT.items():
+                os.environ.setdefault(name, value)
+            for message in IGNORED_WARNING_MESSAGES:
+                warnings.filterwarnings("ignore", message=message)
+            warnings.filterwarnings("ignore", category=RuntimeWarning)
+            _patch_sqlite()
+        _state.bootstrapped = True
+        return True
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Record how long the block takes, e.g. the first import of a heavy dependency."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _state.phases_lock:
+            _state.phases[name] = _state.phases.get(name, 0.0) + time.perf_counter() - started
+
+
+def lazy_import(name: str):
+    """Import ``name`` on first use, recording the time of the first import."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    with startup_phase(f"import {name}"):
+        return importlib.import_module(name)
+
+
+def startup_report() -> List[str]:
+    """Time since bootstrap was imported and the recorded phases, slowest first."""
+    with _state.phases_lock:
+        phases = sorted(_state.phases.items(), key=lambda item: item[1], reverse=True)
+    lines = [f"Startup: {(time.perf_counter() - _state.started) * 1000:.0f} ms since bootstrap"]
+    lines += [f"  {name}: {seconds * 1000:.0f} ms" for name, seconds in phases]
+    return lines
+
+
+def print_startup_report() -> None:
+    """Print startup_report() if STARTUP_REPORT is on."""
+    if startup_report_enabled():
+        for line in startup_report():
+            print(line)
+
+
+@dataclass
+class ImportTime:
+    """One line of ``python -X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def import_time_breakdown(statement: str, path: List[str] = ()) -> List[ImportTime]:
+    """Run ``statement`` in a fresh interpreter with ``-X importtime`` and parse its report.
+
+    Args:
+        statement: Python code, e.g. ``"import main"``.
+        path: Directories prepended to the child's PYTHONPATH.
+    """
+    import subprocess
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([*path, env.get("PYTHONPATH", "")]).strip(os.pathsep)
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                               capture_output=True, text=True, env=env, check=True)
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        # One space, then two per nesting level
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        entries.append(ImportTime(module.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
@@ -0,0 +1,88 @@
+"""
+crewai LLM that serves repeated completions from the LLM cache.
+"""
+
+import os
+import time
+
+from crewai import LLM
+
+try:
+    from .llm_cache import completion_cache_key, get_llm_cache, llm_cache_bypassed
+    from .telemetry import current_span, span
+    from .token_budget import count_message_tokens, count_tokens, get_usage_recorder
+except ImportError:
+    from llm_cache import completion_cache_key, get_llm_cache, llm_cache_bypassed
+    from telemetry import current_span, span
+    from token_budget import count_message_tokens, count_tokens, get_usage_recorder
+
+# crewai's default when no model is configured
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+class CachedLLM(LLM):
+    """LLM whose text completions are cached by model, parameters, messages and tools.
+
+    Calls that let the LLM execute functions itself (``available_functions``)
+    are never cached, so tool side effects always happen.
+    """
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        task = kwargs.get("from_task")
+        with span("llm_call", kind="client", model=self.model, task=getattr(task, "name", None)):
+            return self._cached_call(messages, tools=tools, callbacks=callbacks,
+                                     available_functions=available_functions, **kwargs)
+
+    def _cached_call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        started = time.perf_counter()
+        cache = get_llm_cache()
+        if cache is None or available_functions:
+            text = super().call(messages, tools=tools, callbacks=callbacks,
+                                available_functions=available_functions, **kwargs)
+            self._record_usage(messages, text, kwargs.get("from_task"), started)
+            return text
+
+        key = completion_cache_key(
+            self.model, messages, tools,
+            temperature=getattr(self, "temperature", None),
+            stop=getattr(self, "stop", None),
+            response_format=str(getattr(self, "response_format", None)),
+        )
+        if not llm_cache_bypassed():
+            text = cache.get(key)
+            if text is not None:
+                self._record_usage(messages, text, kwargs.get("from_task"), started, cached=True)
+                return text
+
+        text = super().call(messages, tools=tools, callbacks=callbacks, **kwargs)
+        if isinstance(text, str) and text:
+            cache.set(key, text)
+        self._record_usage(messages, text, kwargs.get("from_task"), started)
+        return text
+
+    def _record_usage(self, messages, text, task, started: float, cached: bool = False) -> None:
+        """Attribute this call's tokens and time to its task (see token_budget.UsageRecorder) and span."""
+        if not isinstance(text, str):
+            return
+        prompt_tokens = count_message_tokens(messages, self.model)
+        completion_tokens = count_tokens(text, self.model)
+        call_span = current_span()
+        if call_span is not None:
+            call_span.set_attribute("llm.prompt_tokens", prompt_tokens)
+            call_span.set_attribute("llm.completion_tokens", completion_tokens)
+            call_span.set_attribute("cached", cached)
+        recorder = get_usage_recorder(task)
+        if recorder is None:
+            return
+        recorder.record_call(
+            getattr(task, "name", None) or "unattributed",
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            elapsed=time.perf_counter() - started,
+            cached=cached,
+        )
+
+
+def default_llm() -> CachedLLM:
+    """Cached LLM for the model crewai would pick (MODEL / OPENAI_MODEL_NAME)."""
+    return CachedLLM(model=os.getenv("MODEL") or os.getenv("OPENAI_MODEL_NAME") or DEFAULT_MODEL)
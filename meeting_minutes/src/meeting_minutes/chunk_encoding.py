@@ -0,0 +1,205 @@
+"""
+In-memory encoding of audio chunks for upload.
+
+Chunks are exported into a SpooledTemporaryFile that lives in memory and only
+spills to a temporary directory when it grows past a configurable size. No
+chunk files are written to the working directory, so concurrent runs cannot
+overwrite each other's chunks and nothing is left behind.
+
+Before export, chunks are converted according to an EncodingProfile. Speech
+recognition only needs 16 kHz mono, so the default profile resamples and
+downmixes and stores the result as FLAC, which is lossless and roughly a
+tenth of the size of a 44.1 kHz stereo WAV chunk. FLAC needs the ffmpeg
+binary; without it the default falls back to 16 kHz mono WAV, which pydub
+writes itself. ffmpeg's output is streamed into the buffer, so a long chunk
+is never held in memory twice.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Optional, Union
+
+try:
+    from .audio_chunking import ffmpeg_binary
+except ImportError:
+    from audio_chunking import ffmpeg_binary
+
+DEFAULT_SPILL_THRESHOLD_MB = 32
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """How a chunk is converted before upload.
+
+    ``sample_rate`` and ``channels`` of None keep the source values.
+    """
+
+    name: str
+    format: str
+    sample_rate: Optional[int] = 16000
+    channels: Optional[int] = 1
+    codec: Optional[str] = None
+    bitrate: Optional[str] = None
+
+    @property
+    def extension(self) -> str:
+        return self.format
+
+
+ENCODING_PROFILES = {
+    "source_wav": EncodingProfile("source_wav", "wav", sample_rate=None, channels=None),
+    "speech_wav": EncodingProfile("speech_wav", "wav"),
+    "speech_flac": EncodingProfile("speech_flac", "flac"),
+    "speech_ogg": EncodingProfile("speech_ogg", "ogg", codec="libopus", bitrate="24k"),
+    "speech_mp3": EncodingProfile("speech_mp3", "mp3", codec="libmp3lame", bitrate="32k"),
+}
+
+DEFAULT_ENCODING_PROFILE = "speech_flac"
+# Used instead of DEFAULT_ENCODING_PROFILE when ffmpeg is not installed
+FALLBACK_ENCODING_PROFILE = "speech_wav"
+# Read size when copying ffmpeg's output into the buffer
+COPY_BLOCK_BYTES = 1024 * 1024
+
+_PCM_FORMATS = {1: "u8", 2: "s16le", 3: "s24le", 4: "s32le"}
+
+_warned_no_ffmpeg = False
+
+
+def ffmpeg_available() -> bool:
+    """Whether the ffmpeg binary pydub is configured to use can be found."""
+    return shutil.which(ffmpeg_binary()) is not None
+
+
+def needs_ffmpeg(profile: EncodingProfile) -> bool:
+    """Whether encoding with ``profile`` runs an ffmpeg process (WAV is written by pydub)."""
+    return profile.format != "wav" or bool(profile.codec)
+
+
+def get_spill_threshold_bytes(default_mb: float = DEFAULT_SPILL_THRESHOLD_MB) -> int:
+    """Read the in-memory size limit from TRANSCRIPTION_SPILL_THRESHOLD_MB."""
+    value = os.getenv("TRANSCRIPTION_SPILL_THRESHOLD_MB")
+    try:
+        mb = float(value) if value else default_mb
+    except ValueError:
+        print(f"⚠️  Invalid TRANSCRIPTION_SPILL_THRESHOLD_MB={value!r}, using {default_mb}")
+        mb = default_mb
+    return max(0, int(mb * 1024 * 1024))
+
+
+def get_encoding_profile(profile: Union[str, EncodingProfile, None] = None) -> EncodingProfile:
+    """Resolve a profile name (or TRANSCRIPTION_ENCODING_PROFILE) to an EncodingProfile."""
+    global _warned_no_ffmpeg
+    if isinstance(profile, EncodingProfile):
+        return profile
+    name = profile or os.getenv("TRANSCRIPTION_ENCODING_PROFILE")
+    if not name:
+        name = DEFAULT_ENCODING_PROFILE
+        if needs_ffmpeg(ENCODING_PROFILES[name]) and not ffmpeg_available():
+            if not _warned_no_ffmpeg:
+                print(f"⚠️  ffmpeg not found, encoding chunks as {FALLBACK_ENCODING_PROFILE} instead of {name}")
+                _warned_no_ffmpeg = True
+            name = FALLBACK_ENCODING_PROFILE
+    try:
+        return ENCODING_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown encoding profile {name!r}. Available: {', '.join(ENCODING_PROFILES)}"
+        ) from None
+
+
+def _export_with_ffmpeg(chunk, profile: EncodingProfile, buffer) -> None:
+    """Pipe the chunk's raw PCM through ffmpeg and write the encoded audio to ``buffer``."""
+    command = [
+        ffmpeg_binary(), "-nostdin", "-v", "error",
+        "-f", _PCM_FORMATS[chunk.sample_width],
+        "-ar", str(chunk.frame_rate), "-ac", str(chunk.channels),
+        "-i", "pipe:0",
+    ]
+    if profile.sample_rate:
+        command += ["-ar", str(profile.sample_rate)]
+    if profile.channels:
+        command += ["-ac", str(profile.channels)]
+    if profile.codec:
+        command += ["-acodec", profile.codec]
+    if profile.bitrate:
+        command += ["-b:a", profile.bitrate]
+    command += ["-f", profile.format, "pipe:1"]
+
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr)
+
+        def feed():
+            try:
+                process.stdin.write(chunk.raw_data)
+            except BrokenPipeError:
+                # ffmpeg exited early; its return code and stderr report why
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+
+        # PCM is written from a thread while the output is copied, so neither pipe fills up
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        try:
+            shutil.copyfileobj(process.stdout, buffer, COPY_BLOCK_BYTES)
+        finally:
+            process.stdout.close()
+            feeder.join()
+            returncode = process.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            error = stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed to encode chunk as {profile.name}: {error}")
+
+
+def encode_chunk(chunk, profile: Union[str, EncodingProfile, None] = None,
+                 spill_threshold: Optional[int] = None, spill_dir: Optional[str] = None):
+    """Encode a pydub.AudioSegment into a rewound file-like buffer.
+
+    Args:
+        chunk: Audio chunk to encode.
+        profile: EncodingProfile or profile name. Defaults to
+            TRANSCRIPTION_ENCODING_PROFILE or DEFAULT_ENCODING_PROFILE.
+        spill_threshold: Size in bytes above which the buffer moves to disk.
+            Defaults to TRANSCRIPTION_SPILL_THRESHOLD_MB.
+        spill_dir: Directory for spilled buffers (system temp dir if None).
+
+    Returns:
+        A SpooledTemporaryFile positioned at the start. Close it (or use it
+        as a context manager) to release the memory or temporary file.
+    """
+    profile = get_encoding_profile(profile)
+    if spill_threshold is None:
+        spill_threshold = get_spill_threshold_bytes()
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=spill_threshold, mode="w+b", dir=spill_dir)
+    try:
+        if not needs_ffmpeg(profile):
+            # pydub writes WAV itself, no ffmpeg process needed
+            if profile.sample_rate:
+                chunk = chunk.set_frame_rate(profile.sample_rate)
+            if profile.channels:
+                chunk = chunk.set_channels(profile.channels)
+            chunk.export(buffer, format="wav")
+        else:
+            _export_with_ffmpeg(chunk, profile, buffer)
+        buffer.seek(0)
+    except BaseException:
+        buffer.close()
+        raise
+    return buffer
+
+
+def encoded_size(buffer) -> int:
+    """Size in bytes of an encoded chunk buffer, leaving it rewound."""
+    buffer.seek(0, os.SEEK_END)
+    size = buffer.tell()
+    buffer.seek(0)
+    return size
@@ -0,0 +1,198 @@
+"""
+Chunk length planning.
+
+Every transcription request carries a fixed latency, so fewer, larger chunks
+finish sooner. The planner estimates the encoded bitrate of the configured
+encoding profile and picks the longest chunk that stays under the provider's
+upload limit with a safety margin. Chunk length is also capped so the raw PCM
+of every chunk transcription holds at once, in the source format the chunks
+are read in, stays within a memory budget. That cap is never allowed below
+MIN_CHUNK_MS; the upload limit is applied last and always holds. The
+resulting plan (chunk count and expected bytes) is available before any
+upload starts.
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    from .audio_chunking import PCMParams, open_chunk_source, probe_audio, silence_skipping_enabled
+    from .chunk_encoding import EncodingProfile, get_encoding_profile
+    from .transcription import max_chunks_in_flight
+except ImportError:
+    from audio_chunking import PCMParams, open_chunk_source, probe_audio, silence_skipping_enabled
+    from chunk_encoding import EncodingProfile, get_encoding_profile
+    from transcription import max_chunks_in_flight
+
+DEFAULT_UPLOAD_LIMIT_MB = 25
+DEFAULT_SAFETY_MARGIN = 0.8
+DEFAULT_MAX_PCM_MB = 512
+MIN_CHUNK_MS = 30000
+
+# Silence-aware chunks may run this far past their target while waiting for a pause
+# (mirrors voice_activity.MAX_CHUNK_OVERSHOOT without importing NumPy here)
+SILENCE_AWARE_OVERSHOOT = 1.25
+
+# Lossless FLAC of speech typically lands at 50-60% of 16-bit PCM
+FLAC_COMPRESSION_RATIO = 0.7
+# Container and framing overhead on top of the nominal bitrate of lossy codecs
+LOSSY_OVERHEAD = 1.05
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def _parse_bitrate(bitrate: str) -> int:
+    """Bits per second from an ffmpeg bitrate such as ``"32k"``."""
+    value = bitrate.strip().lower()
+    if value.endswith("k"):
+        return int(float(value[:-1]) * 1000)
+    return int(value)
+
+
+def estimate_bytes_per_second(params: PCMParams, profile: EncodingProfile) -> float:
+    """Expected size of one second of audio after encoding with ``profile``."""
+    if profile.bitrate:
+        return _parse_bitrate(profile.bitrate) / 8 * LOSSY_OVERHEAD
+
+    pcm_bytes = upload_pcm_bytes_per_second(params, profile)
+    if profile.format == "flac":
+        return pcm_bytes * FLAC_COMPRESSION_RATIO
+    return pcm_bytes
+
+
+def upload_pcm_bytes_per_second(params: PCMParams, profile: EncodingProfile) -> int:
+    """Raw PCM bytes per second of audio converted to ``profile``'s rate and channels."""
+    sample_rate = profile.sample_rate or params.frame_rate
+    channels = profile.channels or params.channels
+    sample_width = params.sample_width if profile.name == "source_wav" else 2
+    return sample_rate * channels * sample_width
+
+
+@dataclass
+class ChunkPlan:
+    """Chunk length chosen for a recording and what it is expected to upload."""
+
+    chunk_length_ms: int
+    max_chunk_ms: int
+    chunk_count: Optional[int]
+    bytes_per_second: float
+    upload_limit_bytes: int
+
+    @property
+    def expected_chunk_bytes(self) -> int:
+        return int(self.bytes_per_second * self.chunk_length_ms / 1000)
+
+    @property
+    def expected_total_bytes(self) -> Optional[int]:
+        if self.chunk_count is None:
+            return None
+        return self.expected_chunk_bytes * self.chunk_count
+
+    def describe(self) -> str:
+        count = self.chunk_count if self.chunk_count is not None else "?"
+        total = self.expected_total_bytes
+        total_mb = f"{total / 1024 / 1024:.1f} MB" if total is not None else "unknown"
+        return (
+            f"{count} chunk(s) of up to {self.chunk_length_ms / 60000:.1f} min, "
+            f"~{self.expected_chunk_bytes / 1024 / 1024:.1f} MB each, ~{total_mb} total"
+        )
+
+
+def plan_chunks(duration_ms: Optional[int], params: PCMParams, profile=None,
+                upload_limit_bytes: Optional[int] = None, safety_margin: Optional[float] = None,
+                max_pcm_bytes: Optional[int] = None, in_flight_chunks: Optional[int] = None,
+                overshoot: float = 1.0, chunk_length_ms: Optional[int] = None) -> ChunkPlan:
+    """Pick the longest chunk length whose encoded size fits the upload limit.
+
+    Args:
+        duration_ms: Recording length, or None if unknown.
+        params: PCM layout of the decoded recording.
+        profile: Encoding profile (see chunk_encoding.get_encoding_profile).
+        upload_limit_bytes: Provider upload limit. Defaults to
+            TRANSCRIPTION_UPLOAD_LIMIT_MB (25 MB for Whisper).
+        safety_margin: Fraction of the limit to plan for. Defaults to
+            TRANSCRIPTION_UPLOAD_SAFETY_MARGIN.
+        max_pcm_bytes: Memory budget for the raw PCM of all chunks in
+            flight, in the source format. Defaults to TRANSCRIPTION_MAX_PCM_MB.
+        in_flight_chunks: Chunks held in memory at once. Defaults to what
+            transcription.transcribe_chunks keeps for TRANSCRIPTION_MAX_WORKERS.
+        overshoot: How far a chunk may run past its target length before it
+            is force-split (silence-aware chunks close at the next pause).
+        chunk_length_ms: Use this chunk length instead of planning one; the
+            plan then only reports the expected count and sizes.
+
+    Returns:
+        ChunkPlan whose ``max_chunk_ms`` stays within both limits.
+    """
+    profile = get_encoding_profile(profile)
+    if upload_limit_bytes is None:
+        upload_limit_bytes = int(_env_float("TRANSCRIPTION_UPLOAD_LIMIT_MB", DEFAULT_UPLOAD_LIMIT_MB) * 1024 * 1024)
+    if safety_margin is None:
+        safety_margin = _env_float("TRANSCRIPTION_UPLOAD_SAFETY_MARGIN", DEFAULT_SAFETY_MARGIN)
+    if max_pcm_bytes is None:
+        max_pcm_bytes = int(_env_float("TRANSCRIPTION_MAX_PCM_MB", DEFAULT_MAX_PCM_MB) * 1024 * 1024)
+    if in_flight_chunks is None:
+        in_flight_chunks = max_chunks_in_flight()
+
+    bytes_per_second = estimate_bytes_per_second(params, profile)
+    if chunk_length_ms is not None:
+        max_chunk_ms = int(chunk_length_ms * overshoot)
+    else:
+        # Chunks are read and queued in the source format, whatever they are uploaded in
+        chunk_pcm_bytes = max_pcm_bytes / max(1, in_flight_chunks)
+        memory_ms = max(MIN_CHUNK_MS, chunk_pcm_bytes / (params.frame_rate * params.frame_size) * 1000)
+        upload_ms = upload_limit_bytes * safety_margin / bytes_per_second * 1000
+        # The minimum only lifts the memory cap; a small upload limit still wins
+        max_chunk_ms = max(1, int(min(memory_ms, upload_ms)))
+        chunk_length_ms = max(1, int(max_chunk_ms / overshoot))
+
+    if duration_ms is not None and duration_ms <= chunk_length_ms:
+        chunk_length_ms = max(1, duration_ms)
+    chunk_count = max(1, math.ceil(duration_ms / chunk_length_ms)) if duration_ms is not None else None
+
+    return ChunkPlan(
+        chunk_length_ms=chunk_length_ms,
+        max_chunk_ms=max(max_chunk_ms, chunk_length_ms),
+        chunk_count=chunk_count,
+        bytes_per_second=bytes_per_second,
+        upload_limit_bytes=upload_limit_bytes,
+    )
+
+
+def plan_recording(audio_path: str, profile=None, overshoot: float = 1.0) -> ChunkPlan:
+    """Plan chunking for a file on disk without decoding it.
+
+    TRANSCRIPTION_CHUNK_SECONDS forces a fixed chunk length instead.
+    """
+    params, duration_ms = probe_audio(str(audio_path))
+    fixed_seconds = _env_float("TRANSCRIPTION_CHUNK_SECONDS", 0)
+    return plan_chunks(
+        duration_ms, params, profile=profile, overshoot=overshoot,
+        chunk_length_ms=int(fixed_seconds * 1000) if fixed_seconds > 0 else None,
+    )
+
+
+def open_planned_chunk_source(audio_path: str, profile=None, skip_silence: Optional[bool] = None):
+    """Plan chunking for ``audio_path`` and open the matching chunk source.
+
+    Returns:
+        ``(plan, chunks)`` where ``chunks`` is what open_chunk_source returns
+        for the planned chunk length.
+    """
+    if skip_silence is None:
+        skip_silence = silence_skipping_enabled()
+    overshoot = SILENCE_AWARE_OVERSHOOT if skip_silence else 1.0
+    plan = plan_recording(audio_path, profile=profile, overshoot=overshoot)
+    chunks = open_chunk_source(
+        audio_path, plan.chunk_length_ms, skip_silence=skip_silence, max_chunk_ms=plan.max_chunk_ms
+    )
+    return plan, chunks
@@ -10,6 +10,10 @@ except ImportError:
     import os
     sys.path.append(os.path.join(os.path.dirname(__file__), 'tools'))
     from gmail_tool import GmailTool
+try:
+    from ...cached_llm import default_llm
+except ImportError:
+    from cached_llm import default_llm
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
@@ -32,6 +36,8 @@ class GmailCrew():
         return Agent(
             config=self.agents_config['gmail_draft_agent'], # type: ignore[index]
             tools=[GmailTool()], # type: ignore[index]
+            # Completions are cached; the Gmail tool itself always runs
+            llm=default_llm(),
             verbose=True
         )
 
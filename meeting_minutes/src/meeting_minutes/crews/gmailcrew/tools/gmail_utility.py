@@ -1,93 +1,314 @@
 
 import os
 import base64
+import json
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
 from email.mime.text import MIMEText
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from email.message import EmailMessage
 
-import markdown
+try:
+    from ....markdown_renderer import get_renderer
+except ImportError:
+    # Fallback for when running as standalone script
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+    from markdown_renderer import get_renderer
 
 SCOPES = ['https://www.googleapis.com/auth/gmail.compose']
 
-HTML_TEMPLATE = """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body>
-        {final_email_body}
-    </body>
-    </html>
-"""
+# The Google client libraries are imported where they are used, so messages
+# can be built and inserted through any service object without them.
 
-def authenticate_gmail():
-    """Shows basic usage of the Gmail API.
-        Returns:
-        service: Authorized Gmail API service instance.
+# Access tokens are refreshed this long before they expire, so no request
+# starts with a token that lapses mid-flight
+DEFAULT_REFRESH_MARGIN_SECONDS = 300
+
+
+@dataclass
+class GmailServiceMetrics:
+    """Counters and timings of the Gmail service cache."""
+
+    credential_loads: int = 0
+    refreshes: int = 0
+    refresh_seconds: float = 0.0
+    discovery_loads: int = 0
+    discovery_seconds: float = 0.0
+    builds: int = 0
+    build_seconds: float = 0.0
+    cache_hits: int = 0
+
+    def describe(self):
+        return (
+            f"Gmail service: {self.builds} build(s) in {self.build_seconds:.2f}s, "
+            f"{self.cache_hits} reuse(s), {self.refreshes} token refresh(es) in {self.refresh_seconds:.2f}s, "
+            f"discovery document loaded {self.discovery_loads} time(s) in {self.discovery_seconds:.2f}s"
+        )
+
+
+class GmailServiceCache:
+    """Process-wide Gmail API client.
+
+    The credentials are read from token.json once and refreshed shortly
+    before they expire. The discovery document is parsed once.
+    googleapiclient services are not thread-safe (each wraps an httplib2
+    connection), so every thread, e.g. every Streamlit session, gets its own
+    service built from the cached document and sharing the credentials.
+
+    Loading and refreshing the credentials (a network round trip) happen
+    under their own lock, never under the lock guarding the cache state. While
+    one thread refreshes a token that is still valid, the others keep using it.
     """
-    # Get the directory where this script is located
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    token_path = os.path.join(current_dir, 'token.json')
-    credentials_path = os.path.join(current_dir, 'credentials.json')
-
-    creds = None
-    # The file token.json stores the user's access and refresh tokens, and is
-    # created automatically when the authorization flow completes for the first time.
-    if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-    # If there are no (valid) credentials available, let the user log in.
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
+
+    def __init__(self, token_path=None, credentials_path=None, refresh_margin=None):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.token_path = token_path or os.path.join(current_dir, 'token.json')
+        self.credentials_path = credentials_path or os.path.join(current_dir, 'credentials.json')
+        if refresh_margin is None:
+            refresh_margin = _env_float("GMAIL_TOKEN_REFRESH_MARGIN_SECONDS", DEFAULT_REFRESH_MARGIN_SECONDS)
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+
+        self._lock = threading.Lock()
+        # Held while credentials are loaded or refreshed and while the discovery document is parsed
+        self._credentials_lock = threading.Lock()
+        self._discovery_lock = threading.Lock()
+        self._local = threading.local()
+        self._creds = None
+        self._discovery = None
+        # Bumped whenever the credentials object is replaced; per-thread services built before are dropped
+        self._generation = 0
+        self._metrics = GmailServiceMetrics()
+
+    def service(self):
+        """Authorized Gmail service for the calling thread."""
+        creds, generation = self._valid_credentials()
+        local = self._local
+        if getattr(local, 'service', None) is not None and local.generation == generation:
+            with self._lock:
+                self._metrics.cache_hits += 1
+            return local.service
+
+        discovery = self._discovery_document()
+        started = time.perf_counter()
+        service = self._build(discovery, creds)
+        with self._lock:
+            self._metrics.builds += 1
+            self._metrics.build_seconds += time.perf_counter() - started
+        local.service, local.generation = service, generation
+        return service
+
+    def metrics(self):
+        """Snapshot of the cache metrics."""
+        with self._lock:
+            return replace(self._metrics)
+
+    def invalidate(self):
+        """Forget the credentials and services, e.g. after the token was revoked."""
+        with self._lock:
+            self._creds = None
+            self._generation += 1
+
+    def _needs_refresh(self, creds):
+        if not creds.valid:
+            return True
+        expiry = getattr(creds, 'expiry', None)
+        if expiry is None:
+            return False
+        if expiry.tzinfo is None:
+            # google-auth keeps expiry as a naive UTC datetime
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        return expiry - datetime.now(timezone.utc) < self.refresh_margin
+
+    def _valid_credentials(self):
+        """Current credentials and their generation, loading or refreshing them if due."""
+        with self._lock:
+            creds, generation = self._creds, self._generation
+        if creds is not None and not self._needs_refresh(creds):
+            return creds, generation
+        if creds is not None and creds.valid:
+            # Inside the refresh margin but not expired: if another thread is refreshing, keep using it
+            if not self._credentials_lock.acquire(blocking=False):
+                return creds, generation
         else:
-            if not os.path.exists(credentials_path):
-                raise FileNotFoundError(
-                    f"credentials.json not found at {credentials_path}. "
-                    "Please ensure you have downloaded your OAuth 2.0 credentials "
-                    "from Google Cloud Console and placed them in the correct location."
-                )
-            
-            flow = InstalledAppFlow.from_client_secrets_file(
-                credentials_path, SCOPES)
-            creds = flow.run_local_server(port=0)
+            self._credentials_lock.acquire()
+        try:
+            return self._load_or_refresh()
+        finally:
+            self._credentials_lock.release()
+
+    def _load_or_refresh(self):
+        # Under _credentials_lock; another thread may have finished the work meanwhile
+        with self._lock:
+            creds = self._creds
+        replaced = False
+        if creds is None:
+            creds = self._load_credentials()
+            replaced = True
+            with self._lock:
+                self._metrics.credential_loads += 1
+        if self._needs_refresh(creds):
+            if creds.refresh_token:
+                started = time.perf_counter()
+                # Refreshed in place, so services already built keep working
+                self._refresh(creds)
+                self._save(creds)
+                with self._lock:
+                    self._metrics.refreshes += 1
+                    self._metrics.refresh_seconds += time.perf_counter() - started
+            else:
+                creds = self._authorize()
+                self._save(creds)
+                replaced = True
+                with self._lock:
+                    self._metrics.credential_loads += 1
+        with self._lock:
+            if replaced:
+                self._creds = creds
+                self._generation += 1
+            return self._creds, self._generation
+
+    def _discovery_document(self):
+        with self._lock:
+            if self._discovery is not None:
+                return self._discovery
+        with self._discovery_lock:
+            if self._discovery is None:
+                started = time.perf_counter()
+                discovery = self._load_discovery()
+                with self._lock:
+                    self._discovery = discovery
+                    self._metrics.discovery_loads += 1
+                    self._metrics.discovery_seconds += time.perf_counter() - started
+            return self._discovery
+
+    def _load_credentials(self):
+        """Credentials from token.json, or from the interactive authorization flow."""
+        from google.oauth2.credentials import Credentials
+
+        # The file token.json stores the user's access and refresh tokens, and is
+        # created automatically when the authorization flow completes for the first time.
+        if os.path.exists(self.token_path):
+            return Credentials.from_authorized_user_file(self.token_path, SCOPES)
+        creds = self._authorize()
+        self._save(creds)
+        return creds
+
+    def _authorize(self):
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        if not os.path.exists(self.credentials_path):
+            raise FileNotFoundError(
+                f"credentials.json not found at {self.credentials_path}. "
+                "Please ensure you have downloaded your OAuth 2.0 credentials "
+                "from Google Cloud Console and placed them in the correct location."
+            )
+        flow = InstalledAppFlow.from_client_secrets_file(self.credentials_path, SCOPES)
+        return flow.run_local_server(port=0)
+
+    def _refresh(self, creds):
+        from google.auth.transport.requests import Request
+
+        creds.refresh(Request())
+
+    def _save(self, creds):
         # Save the credentials for the next run
-        with open(token_path, 'w') as token:
+        with open(self.token_path, 'w') as token:
             token.write(creds.to_json())
 
-    service = build('gmail', 'v1', credentials=creds)
-    return service
+    def _load_discovery(self):
+        """Parsed Gmail discovery document shipped with googleapiclient, or None."""
+        from googleapiclient import discovery_cache
+
+        document = discovery_cache.get_static_doc('gmail', 'v1')
+        return json.loads(document) if document else None
+
+    def _build(self, discovery, creds):
+        from googleapiclient.discovery import build, build_from_document
+
+        if discovery is None:
+            return build('gmail', 'v1', credentials=creds)
+        return build_from_document(discovery, credentials=creds)
+
+
+_service_cache = None
+_service_cache_lock = threading.Lock()
+
+
+def _env_float(name, default):
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def get_gmail_service_cache():
+    """The process-wide GmailServiceCache."""
+    global _service_cache
+    with _service_cache_lock:
+        if _service_cache is None:
+            _service_cache = GmailServiceCache()
+        return _service_cache
+
+
+def gmail_service_metrics():
+    """Metrics of the process-wide Gmail service cache."""
+    return get_gmail_service_cache().metrics()
+
+
+def authenticate_gmail():
+    """Authorized Gmail API service for the calling thread.
+
+    Served from the process-wide GmailServiceCache: token.json is read and
+    the discovery document parsed once per process, and the token is
+    refreshed ahead of expiry.
+
+        Returns:
+        service: Authorized Gmail API service instance.
+    """
+    return get_gmail_service_cache().service()
+
+def render_email_html(message_text):
+    """Render Markdown email text into the HTML email document.
+
+    The shared MarkdownRenderer reuses its Markdown instances and caches
+    the document, so the same minutes are converted once.
+
+    Args:
+    message_text: The text of the email, in Markdown.
+
+    Returns:
+        The complete HTML document.
+    """
+    return get_renderer().email_html(message_text)
+
+def build_message(sender, to, subject, html, message_id=None):
+    """Create a message from an already rendered HTML body.
+
+    Rendering once and building one message per recipient avoids
+    converting the same Markdown again for every recipient.
 
-def create_message(sender, to, subject, message_text):
-    """Create a message for an email.
-    
     Args:
     sender: Email address of the sender.
     to: Email address of the receiver.
     subject: The subject of the email.
-    message_text: The text of the email.
+    html: The HTML document (see render_email_html).
+    message_id: Optional Message-ID header, e.g. to find the draft again later.
 
     Returns:
         An object containing a base64url encoded email object.
     """
-
-    md = markdown.Markdown(extensions=['tables', 'fenced_code', 'nl2br'])
-    
-    # Format the HTML content
-    formatted_html = HTML_TEMPLATE.format(
-        final_email_body=md.convert(message_text)
-    )
-
     msg = EmailMessage()
-    content=formatted_html
+    content=html
 
     msg['To'] = to
     msg['From'] = sender
     msg['Subject'] = subject
+    if message_id:
+        msg['Message-ID'] = message_id
     msg.add_header('Content-Type','text/html')
     msg.set_payload(content)
 
@@ -96,6 +317,105 @@ def create_message(sender, to, subject, message_text):
     # The API expects a dictionary with a 'raw' key containing the encoded message
     return {'raw': encodedMsg}
 
+def create_message(sender, to, subject, message_text, message_id=None):
+    """Create a message for an email.
+    
+    Args:
+    sender: Email address of the sender.
+    to: Email address of the receiver.
+    subject: The subject of the email.
+    message_text: The text of the email.
+    message_id: Optional Message-ID header, e.g. to find the draft again later.
+
+    Returns:
+        An object containing a base64url encoded email object.
+    """
+    return build_message(sender, to, subject, render_email_html(message_text), message_id=message_id)
+
+def insert_draft(service, user_id, message_body):
+    """Insert a draft email, raising on API errors.
+
+    Args:
+    service: Authorized Gmail API service instance.
+    user_id: User's email address. The special value "me"
+             can be used to indicate the authenticated user.
+    message_body: The body of the draft email.
+
+    Returns:
+        The created draft.
+    """
+    return service.users().drafts().create(userId=user_id, body={'message': message_body}).execute()
+
+def find_draft(service, user_id, message_id):
+    """Return the draft whose message has the Message-ID header ``message_id``, or None.
+
+    Args:
+    service: Authorized Gmail API service instance.
+    user_id: User's email address. The special value "me"
+             can be used to indicate the authenticated user.
+    message_id: Message-ID header value, including the angle brackets.
+    """
+    response = service.users().drafts().list(userId=user_id, q=f'rfc822msgid:{message_id}').execute()
+    drafts = response.get('drafts') or []
+    return drafts[0] if drafts else None
+
+# Gmail accepts up to 100 calls per batch request, but recommends at most 50
+BATCH_SIZE = 50
+
+def execute_batch(service, requests):
+    """Execute Gmail API requests in batch HTTP requests (one round trip per BATCH_SIZE).
+
+    Args:
+    service: Authorized Gmail API service instance.
+    requests: Unexecuted API requests, e.g. ``service.users().drafts().create(...)``.
+
+    Returns:
+        One ``(response, exception)`` pair per request, in request order. If a
+        batch request itself fails, only its requests that got no response
+        carry that error; the results of the other batches are kept.
+    """
+    results = [None] * len(requests)
+
+    def callback(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    for start in range(0, len(requests), BATCH_SIZE):
+        indexes = range(start, min(start + BATCH_SIZE, len(requests)))
+        batch = service.new_batch_http_request(callback=callback)
+        for index in indexes:
+            batch.add(requests[index], request_id=str(index))
+        try:
+            batch.execute()
+        except Exception as e:
+            for index in indexes:
+                if results[index] is None:
+                    results[index] = (None, e)
+    return results
+
+def insert_drafts(service, user_id, message_bodies):
+    """Insert several draft emails in batch requests.
+
+    Returns:
+        One ``(draft, exception)`` pair per message, in order.
+    """
+    drafts = service.users().drafts()
+    return execute_batch(service, [drafts.create(userId=user_id, body={'message': body}) for body in message_bodies])
+
+def find_drafts(service, user_id, message_ids):
+    """Look up the drafts with the given Message-ID headers in batch requests.
+
+    Returns:
+        One ``(draft or None, exception)`` pair per Message-ID, in order.
+    """
+    drafts = service.users().drafts()
+    results = execute_batch(
+        service, [drafts.list(userId=user_id, q=f'rfc822msgid:{message_id}') for message_id in message_ids]
+    )
+    return [
+        (((response or {}).get('drafts') or [None])[0], exception)
+        for response, exception in results
+    ]
+
 def create_draft(service, user_id, message_body):
     """Create and insert a draft email.
 
@@ -109,7 +429,7 @@ def create_draft(service, user_id, message_body):
         The created draft.
     """
     try:
-        draft = service.users().drafts().create(userId=user_id, body={'message': message_body}).execute()
+        draft = insert_draft(service, user_id, message_body)
         print(f'Draft id: {draft["id"]}\nDraft message: {draft["message"]}')
         return draft
     except Exception as error:
@@ -2,26 +2,18 @@ from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
-from crewai.tools import BaseTool
-
-
-class FileWriterTool(BaseTool):
-    name: str = "file_writer"
-    description: str = "Writes content to a file."
-
-    def _run(self, file_name: str, content: str, directory: str = "."):
-        import os
-        os.makedirs(directory, exist_ok=True)
-        file_path = os.path.join(directory, file_name)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return f"Written to {file_path}"
-
-
-file_writer_tool_summary = FileWriterTool()
-file_writer_tool_action_items = FileWriterTool()
-file_writer_tool_sentiment = FileWriterTool()
-
+try:
+    from ...cached_llm import default_llm
+except ImportError:
+    from cached_llm import default_llm
+try:
+    from .models import ActionItems, MeetingSummary, SentimentAnalysis
+except ImportError:
+    # Fallback for when running as standalone script
+    import sys
+    import os
+    sys.path.append(os.path.dirname(__file__))
+    from models import ActionItems, MeetingSummary, SentimentAnalysis
 
 
 @CrewBase
@@ -37,28 +29,63 @@ class MeetingMinutesCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
-    # If you would lik to add tools to your crew, you can learn more about it here:
-    # https://docs.crewai.com/concepts/agents#agent-tools
+    # Analyses return typed outputs (see models.py) that reach the writer as task
+    # context and the flow as structured state, without tool round trips to files
     @agent
     def meeting_minutes_summarizer(self) -> Agent:
         return Agent(
             config=self.agents_config["meeting_minutes_summarizer"],  # type: ignore[index]
-            tools=[file_writer_tool_summary, file_writer_tool_action_items, file_writer_tool_sentiment]
+            llm=default_llm(),
+        )
+
+    @agent
+    def meeting_action_items_extractor(self) -> Agent:
+        return Agent(
+            config=self.agents_config["meeting_action_items_extractor"],  # type: ignore[index]
+            llm=default_llm(),
+        )
+
+    @agent
+    def meeting_sentiment_analyst(self) -> Agent:
+        return Agent(
+            config=self.agents_config["meeting_sentiment_analyst"],  # type: ignore[index]
+            llm=default_llm(),
         )
 
     @agent
     def meeting_minutes_writer(self) -> Agent:
         return Agent(
             config=self.agents_config["meeting_minutes_writer"],
+            llm=default_llm(),
         )
 
     # To learn more about structured task outputs,
     # task dependencies, and task callbacks, check out the documentation:
     # https://docs.crewai.com/concepts/tasks#overview-of-a-task
+    # The summary, action item and sentiment analyses are independent, so they
+    # run concurrently; the writer task waits for all three through its context
     @task
     def meeting_minutes_summarizer_task(self) -> Task:
         return Task(
             config=self.tasks_config["meeting_minutes_summarizer_task"],  # type: ignore[index]
+            async_execution=True,
+            output_pydantic=MeetingSummary,
+        )
+
+    @task
+    def meeting_action_items_task(self) -> Task:
+        return Task(
+            config=self.tasks_config["meeting_action_items_task"],  # type: ignore[index]
+            async_execution=True,
+            output_pydantic=ActionItems,
+        )
+
+    @task
+    def meeting_sentiment_task(self) -> Task:
+        return Task(
+            config=self.tasks_config["meeting_sentiment_task"],  # type: ignore[index]
+            async_execution=True,
+            output_pydantic=SentimentAnalysis,
         )
 
     @task
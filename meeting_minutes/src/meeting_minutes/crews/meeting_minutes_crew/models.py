@@ -0,0 +1,52 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ActionItem(BaseModel):
+    """A follow-up agreed in the meeting"""
+
+    description: str = Field(description="What needs to be done")
+    owner: Optional[str] = Field(default=None, description="Who is responsible, if mentioned")
+    due: Optional[str] = Field(default=None, description="Deadline, if mentioned")
+
+
+class MeetingSummary(BaseModel):
+    """Output of the summarizer task"""
+
+    summary: str = Field(description="Concise abstract of the meeting")
+
+
+class ActionItems(BaseModel):
+    """Output of the action items task"""
+
+    action_items: List[ActionItem] = Field(default_factory=list)
+
+
+class SentimentAnalysis(BaseModel):
+    """Output of the sentiment task"""
+
+    sentiment: str = Field(description="positive, negative, neutral or mixed")
+    explanation: str = Field(description="Brief explanation of the tone of the discussion")
+
+
+class MeetingAnalysis(BaseModel):
+    """Summary, action items and sentiment of one meeting, passed to the writer and kept in flow state"""
+
+    summary: str = ""
+    action_items: List[ActionItem] = Field(default_factory=list)
+    sentiment: Optional[SentimentAnalysis] = None
+
+    @classmethod
+    def from_crew_output(cls, output) -> "MeetingAnalysis":
+        """Collect the structured task outputs of a MeetingMinutesCrew run."""
+        analysis = cls()
+        for task_output in getattr(output, "tasks_output", None) or []:
+            result = getattr(task_output, "pydantic", None)
+            if isinstance(result, MeetingSummary):
+                analysis.summary = result.summary
+            elif isinstance(result, ActionItems):
+                analysis.action_items = result.action_items
+            elif isinstance(result, SentimentAnalysis):
+                analysis.sentiment = result
+        return analysis
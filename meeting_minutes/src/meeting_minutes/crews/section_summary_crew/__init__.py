@@ -0,0 +1 @@
+"""Section summary crew for map-reduce summarization of long transcripts."""
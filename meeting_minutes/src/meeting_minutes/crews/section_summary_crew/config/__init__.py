@@ -0,0 +1 @@
+# Config package for section summary crew
\ No newline at end of file
@@ -0,0 +1,42 @@
+from crewai import Agent, Crew, Process, Task
+from crewai.project import CrewBase, agent, crew, task
+from crewai.agents.agent_builder.base_agent import BaseAgent
+from typing import List
+try:
+    from ...cached_llm import default_llm
+except ImportError:
+    from cached_llm import default_llm
+
+
+@CrewBase
+class SectionSummaryCrew:
+    """Summarizes one section of a long transcript (the map step of map-reduce summarization)"""
+
+    agents: List[BaseAgent]
+    tasks: List[Task]
+
+    agents_config = "config/agents.yaml"
+    tasks_config = "config/tasks.yaml"
+
+    @agent
+    def section_summarizer(self) -> Agent:
+        return Agent(
+            config=self.agents_config["section_summarizer"],  # type: ignore[index]
+            llm=default_llm(),
+        )
+
+    @task
+    def section_summary_task(self) -> Task:
+        return Task(
+            config=self.tasks_config["section_summary_task"],  # type: ignore[index]
+        )
+
+    @crew
+    def crew(self) -> Crew:
+        """Creates the Section Summary Crew"""
+        return Crew(
+            agents=self.agents,
+            tasks=self.tasks,
+            process=Process.sequential,
+            verbose=False,
+        )
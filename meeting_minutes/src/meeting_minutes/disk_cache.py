@@ -0,0 +1,171 @@
+"""
+Persistent key/value cache backed by SQLite.
+
+Stores text values under content-derived keys with least-recently-used
+eviction once the stored values exceed a size limit, and optional expiry of
+entries older than a time-to-live. Safe to share between
+threads (Streamlit sessions, transcription workers) and between processes
+pointing at the same file.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "meeting_minutes"
+# Same default as LLM_CACHE_TTL_HOURS
+DEFAULT_RUN_STATE_TTL_HOURS = 24 * 7
+
+_pruned = set()
+_pruned_lock = threading.Lock()
+
+
+def get_cache_dir() -> Path:
+    """Directory for on-disk caches, from MEETING_MINUTES_CACHE_DIR."""
+    path = Path(os.getenv("MEETING_MINUTES_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def run_state_ttl() -> Optional[float]:
+    """RUN_STATE_TTL_HOURS in seconds: how long transcription journals, flow checkpoints
+    and delivered outbox entries are kept (default a week; 0 keeps them forever)."""
+    value = os.getenv("RUN_STATE_TTL_HOURS")
+    try:
+        hours = float(value) if value else DEFAULT_RUN_STATE_TTL_HOURS
+    except ValueError:
+        print(f"⚠️  Invalid RUN_STATE_TTL_HOURS={value!r}, using {DEFAULT_RUN_STATE_TTL_HOURS}")
+        hours = DEFAULT_RUN_STATE_TTL_HOURS
+    return hours * 3600 if hours > 0 else None
+
+
+def prune_stale_files(directory, pattern: str, ttl: Optional[float] = None, force: bool = False) -> int:
+    """Delete files in ``directory`` matching ``pattern`` not modified for ``ttl`` seconds.
+
+    ``ttl`` defaults to run_state_ttl(). Each directory is pruned once per
+    process unless ``force`` is set. Returns the number of files removed.
+    """
+    directory = Path(directory)
+    with _pruned_lock:
+        if (directory, pattern) in _pruned and not force:
+            return 0
+        _pruned.add((directory, pattern))
+    if ttl is None:
+        ttl = run_state_ttl()
+        if ttl is None:
+            return 0
+    cutoff = time.time() - ttl
+    removed = 0
+    for path in directory.glob(pattern):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            # Removed by another process, or in use
+            continue
+    return removed
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for this process plus the current store size."""
+
+    hits: int
+    misses: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DiskCache:
+    """SQLite-backed string cache with LRU, size-bounded eviction.
+
+    Args:
+        path: SQLite database file.
+        max_bytes: Evict least recently used entries once stored values
+            exceed this many bytes.
+        ttl: Treat entries stored more than this many seconds ago as missing
+            and delete them. None keeps entries until they are evicted.
+    """
+
+    def __init__(self, path, max_bytes: int = 100 * 1024 * 1024, ttl: Optional[float] = None):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value and mark it recently used, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and row[1] < now - self.ttl:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting least recently used entries if over the size limit."""
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM cache WHERE created_at < ?", (time.time() - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at ASC"):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        return CacheStats(hits=self.hits, misses=self.misses, entries=entries, size_bytes=size)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
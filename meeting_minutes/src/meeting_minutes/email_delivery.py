@@ -0,0 +1,276 @@
+"""
+Delivery of the meeting minutes as a Gmail draft.
+
+The minutes are already final when they reach this step, so by default
+(EMAIL_DELIVERY=direct) the draft is created by calling the Gmail utility
+functions directly: no LLM round trip, no minutes re-sent as prompt tokens
+and no chance of the body being paraphrased. The Gmail crew, whose agent
+calls GmailTool with the body, remains available with EMAIL_DELIVERY=crew.
+
+Both paths return a DraftResult instead of a string to search for
+"successfully". GMAIL_RECIPIENT may list several addresses (separated by
+commas or semicolons): the HTML body is then rendered once and every
+recipient's draft is created in one Gmail batch HTTP request, with a
+DraftResult per recipient collected in a BatchDraftResult.
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Sequence, Union
+
+try:
+    from .telemetry import span
+except ImportError:
+    from telemetry import span
+
+DELIVERY_MODES = ("direct", "crew")
+
+
+@dataclass
+class DraftResult:
+    """Outcome of creating the minutes email draft."""
+
+    success: bool
+    mode: str
+    draft_id: Optional[str] = None
+    recipient: Optional[str] = None
+    subject: Optional[str] = None
+    latency: float = 0.0
+    error: Optional[str] = None
+
+    def describe(self) -> str:
+        if not self.success:
+            return f"Email draft failed via {self.mode} delivery after {self.latency:.1f}s: {self.error}"
+        return (
+            f"Email draft {self.draft_id or '(unknown id)'} for {self.recipient} created via "
+            f"{self.mode} delivery in {self.latency:.1f}s"
+        )
+
+
+@dataclass
+class BatchDraftResult:
+    """Outcome of creating the minutes draft for every recipient."""
+
+    mode: str
+    results: List[DraftResult]
+    latency: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return bool(self.results) and all(result.success for result in self.results)
+
+    @property
+    def error(self) -> Optional[str]:
+        """The first recipient's error, if any draft failed."""
+        return next((result.error for result in self.results if not result.success), None)
+
+    @property
+    def failed(self) -> List[DraftResult]:
+        return [result for result in self.results if not result.success]
+
+    def describe(self) -> str:
+        if len(self.results) == 1:
+            return self.results[0].describe()
+        created = len(self.results) - len(self.failed)
+        summary = f"{created}/{len(self.results)} email drafts created via {self.mode} delivery in {self.latency:.1f}s"
+        errors = "; ".join(f"{result.recipient}: {result.error}" for result in self.failed)
+        return f"{summary} (failed: {errors})" if errors else summary
+
+
+def get_recipients(value: Union[str, Sequence[str], None] = None) -> List[str]:
+    """Recipients from ``value`` or GMAIL_RECIPIENT, split on commas and semicolons, without duplicates."""
+    if value is None:
+        value = os.getenv("GMAIL_RECIPIENT") or ""
+    if isinstance(value, str):
+        value = [value]
+    recipients: List[str] = []
+    for item in value:
+        for address in re.split(r"[,;]", item or ""):
+            address = address.strip()
+            if address and address.lower() not in (r.lower() for r in recipients):
+                recipients.append(address)
+    return recipients
+
+
+def get_delivery_mode() -> str:
+    """EMAIL_DELIVERY: ``direct`` (default) or ``crew``."""
+    mode = (os.getenv("EMAIL_DELIVERY") or "direct").strip().lower()
+    if mode not in DELIVERY_MODES:
+        print(f"⚠️  Invalid EMAIL_DELIVERY={mode!r}, using direct")
+        return "direct"
+    return mode
+
+
+def minutes_subject(date: Optional[datetime] = None) -> str:
+    """Subject line of the minutes email, as GmailTool writes it."""
+    return f"Meeting Minutes - {(date or datetime.now()).strftime('%B %d, %Y')}"
+
+
+def _gmail_utility():
+    # Package-relative first, as in main.py, so the service cache is loaded under one module name
+    try:
+        from .crews.gmailcrew.tools import gmail_utility
+    except ImportError:
+        from crews.gmailcrew.tools import gmail_utility
+    return gmail_utility
+
+
+def create_minutes_draft(body: str, sender: str, recipient: str, subject: Optional[str] = None,
+                         service=None, message_id: Optional[str] = None) -> DraftResult:
+    """Create the draft with the Gmail API directly.
+
+    Args:
+        body: Meeting minutes in Markdown; rendered to HTML as GmailTool does.
+        sender: From address.
+        recipient: To address.
+        subject: Defaults to minutes_subject().
+        service: Authorized Gmail service. Defaults to authenticate_gmail().
+        message_id: Message-ID header for the draft. If a draft with this
+            Message-ID already exists it is returned instead of creating a
+            second one, so a retried delivery is idempotent.
+    """
+    subject = subject or minutes_subject()
+    started = time.perf_counter()
+    with span("gmail_create_draft", kind="client", recipients=1) as draft_span:
+        try:
+            gmail_utility = _gmail_utility()
+            if service is None:
+                service = gmail_utility.authenticate_gmail()
+            draft = gmail_utility.find_draft(service, "me", message_id) if message_id else None
+            if draft is None:
+                message = gmail_utility.create_message(sender, recipient, subject, body, message_id=message_id)
+                draft_span.set_attribute("bytes_uploaded", len(message["raw"]))
+                draft = gmail_utility.insert_draft(service, "me", message)
+        except Exception as e:
+            draft_span.record_error(e)
+            return DraftResult(success=False, mode="direct", recipient=recipient, subject=subject,
+                               latency=time.perf_counter() - started, error=str(e))
+    return DraftResult(success=True, mode="direct", draft_id=draft.get("id"), recipient=recipient,
+                       subject=subject, latency=time.perf_counter() - started)
+
+
+def create_minutes_drafts(body: str, sender: str, recipients: Sequence[str], subject: Optional[str] = None,
+                          service=None, message_ids: Optional[Sequence[str]] = None,
+                          find_existing: bool = True) -> BatchDraftResult:
+    """Create one draft per recipient, rendering the body once and batching the API calls.
+
+    Args:
+        body: Meeting minutes in Markdown.
+        sender: From address.
+        recipients: To addresses; each gets its own draft.
+        subject: Defaults to minutes_subject().
+        service: Authorized Gmail service. Defaults to authenticate_gmail().
+        message_ids: Message-ID header per recipient. With ``find_existing``,
+            drafts that already have theirs are returned instead of created
+            again (one extra batch request).
+        find_existing: Look up existing drafts by ``message_ids`` first.
+    """
+    subject = subject or minutes_subject()
+    recipients = list(recipients)
+    message_ids = list(message_ids) if message_ids else [None] * len(recipients)
+    started = time.perf_counter()
+    drafts: List[Optional[dict]] = [None] * len(recipients)
+    errors: List[Optional[str]] = [None] * len(recipients)
+    with span("gmail_create_drafts", kind="client", recipients=len(recipients)) as drafts_span:
+        try:
+            gmail_utility = _gmail_utility()
+            if service is None:
+                service = gmail_utility.authenticate_gmail()
+            if find_existing and any(message_ids):
+                lookup = [index for index, message_id in enumerate(message_ids) if message_id]
+                with span("gmail_find_drafts", kind="client", requests=len(lookup)):
+                    found = gmail_utility.find_drafts(service, "me", [message_ids[index] for index in lookup])
+                for index, (draft, exception) in zip(lookup, found):
+                    drafts[index], errors[index] = draft, str(exception) if exception else None
+
+            missing = [index for index in range(len(recipients)) if drafts[index] is None and errors[index] is None]
+            if missing:
+                html = gmail_utility.render_email_html(body)
+                messages = [gmail_utility.build_message(sender, recipients[index], subject, html,
+                                                        message_id=message_ids[index]) for index in missing]
+                size = sum(len(message["raw"]) for message in messages)
+                with span("gmail_insert_drafts", kind="client", requests=len(missing), bytes_uploaded=size):
+                    created = gmail_utility.insert_drafts(service, "me", messages)
+                drafts_span.set_attribute("bytes_uploaded", size)
+                for index, (draft, exception) in zip(missing, created):
+                    drafts[index], errors[index] = draft, str(exception) if exception else None
+        except Exception as e:
+            drafts_span.record_error(e)
+            latency = time.perf_counter() - started
+            return BatchDraftResult(mode="direct", latency=latency, results=[
+                DraftResult(success=False, mode="direct", recipient=recipient, subject=subject, latency=latency,
+                            error=str(e))
+                for recipient in recipients
+            ])
+        drafts_span.set_attribute("failed", sum(1 for error in errors if error))
+
+    # Batched calls complete together, so each recipient waited for the whole request
+    latency = time.perf_counter() - started
+    results = [
+        DraftResult(success=draft is not None and error is None, mode="direct",
+                    draft_id=(draft or {}).get("id"), recipient=recipient, subject=subject, latency=latency,
+                    error=error if error or draft is not None else "No draft returned")
+        for recipient, draft, error in zip(recipients, drafts, errors)
+    ]
+    return BatchDraftResult(mode="direct", results=results, latency=latency)
+
+
+def crew_minutes_draft(body: str, recipient: Optional[str] = None) -> DraftResult:
+    """Create the draft through the Gmail crew (an LLM agent calling GmailTool).
+
+    GmailTool reads the sender and recipient from GMAIL_SENDER and
+    GMAIL_RECIPIENT.
+    """
+    try:
+        from .crews.gmailcrew.gmailcrew import GmailCrew
+    except ImportError:
+        from crews.gmailcrew.gmailcrew import GmailCrew
+
+    started = time.perf_counter()
+    with span("gmail_crew_draft", kind="client") as crew_span:
+        try:
+            output = str(GmailCrew().crew().kickoff(inputs={"body": body}))
+        except Exception as e:
+            crew_span.record_error(e)
+            return DraftResult(success=False, mode="crew", recipient=recipient,
+                               latency=time.perf_counter() - started, error=str(e))
+    latency = time.perf_counter() - started
+    # The agent's final answer is free text; GmailTool reports "... successfully! Draft id: <id>"
+    match = re.search(r"Draft id:?\s*([\w-]+)", output)
+    success = "successfully" in output.lower()
+    return DraftResult(success=success, mode="crew", draft_id=match.group(1) if match else None,
+                       recipient=recipient, subject=minutes_subject(), latency=latency,
+                       error=None if success else output)
+
+
+def describe_gmail_service() -> Optional[str]:
+    """One-line report of the Gmail service cache, or None if it was not used."""
+    metrics = _gmail_utility().gmail_service_metrics()
+    if not metrics.builds and not metrics.cache_hits:
+        return None
+    return metrics.describe()
+
+
+def deliver_minutes(body: str, sender: Optional[str] = None,
+                    recipients: Union[str, Sequence[str], None] = None,
+                    mode: Optional[str] = None, service=None) -> BatchDraftResult:
+    """Create the minutes email drafts with the configured delivery mode.
+
+    Sender and recipients default to GMAIL_SENDER and GMAIL_RECIPIENT; see
+    get_recipients for the accepted forms.
+    """
+    mode = mode or get_delivery_mode()
+    sender = sender or os.getenv("GMAIL_SENDER")
+    recipients = get_recipients(recipients)
+    if not sender or not recipients:
+        return BatchDraftResult(mode=mode, results=[DraftResult(
+            success=False, mode=mode, recipient=", ".join(recipients) or None,
+            error="Missing GMAIL_SENDER or GMAIL_RECIPIENT")])
+    if mode == "crew":
+        # GmailTool addresses a single draft to GMAIL_RECIPIENT as it is set
+        result = crew_minutes_draft(body, recipient=", ".join(recipients))
+        return BatchDraftResult(mode=mode, results=[result], latency=result.latency)
+    return create_minutes_drafts(body, sender, recipients, service=service)
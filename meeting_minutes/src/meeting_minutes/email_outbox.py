@@ -0,0 +1,437 @@
+"""
+Durable outbox for the meeting minutes email drafts.
+
+Instead of blocking on the Gmail API, the pipeline enqueues the finished
+minutes in a SQLite outbox (``outbox.sqlite3`` under
+MEETING_MINUTES_CACHE_DIR) and returns. A background worker creates the
+drafts, retrying failures with exponential backoff. Each entry is given a
+Message-ID when it is enqueued, and before a retry the worker looks for a
+draft that already has it (``rfc822msgid:``). A draft whose API response was
+lost is therefore not created twice. Entries survive restarts; pending ones
+are picked up by the next worker.
+
+Minutes for several recipients are queued as one entry per recipient. The
+worker claims every due entry (up to ``batch_size``) at once and creates
+drafts sharing a body in one Gmail batch request.
+
+Enqueueing the same minutes for the same meeting and recipient again returns
+the existing entry, queued again if it had failed for good. ``delivery_status(meeting_id)`` reports where each email
+of a meeting stands.
+
+Delivered entries are deleted RUN_STATE_TTL_HOURS (default a week) after
+delivery; failed ones are kept until they are queued again.
+
+EMAIL_OUTBOX=0 creates drafts synchronously instead (see email_delivery).
+"""
+
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import make_msgid
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .disk_cache import get_cache_dir, run_state_ttl
+    from .email_delivery import DraftResult, create_minutes_drafts, minutes_subject
+except ImportError:
+    from disk_cache import get_cache_dir, run_state_ttl
+    from email_delivery import DraftResult, create_minutes_drafts, minutes_subject
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BASE_DELAY = 2.0
+DEFAULT_MAX_DELAY = 300.0
+# Entries claimed per round; matches the Gmail batch request size
+DEFAULT_BATCH_SIZE = 50
+# An entry left in "sending" this long (the process died mid-send) is retried
+STALE_SENDING_SECONDS = 600
+
+PENDING = "pending"
+SENDING = "sending"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+_COLUMNS = ("id, meeting_id, idempotency_key, message_id, sender, recipient, subject, body, status, attempts, "
+            "draft_id, last_error, created_at, updated_at, next_attempt_at")
+
+_outbox = None
+_outbox_lock = threading.Lock()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def outbox_enabled() -> bool:
+    """EMAIL_OUTBOX: queue drafts for background delivery (default on)."""
+    return os.getenv("EMAIL_OUTBOX", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def meeting_id_for(text: str) -> str:
+    """Stable meeting id derived from its transcript (or any identifying text)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class OutboxEntry:
+    """One queued email draft and its delivery state."""
+
+    id: int
+    meeting_id: str
+    idempotency_key: str
+    message_id: str
+    sender: str
+    recipient: str
+    subject: str
+    body: str
+    status: str
+    attempts: int
+    draft_id: Optional[str]
+    last_error: Optional[str]
+    created_at: float
+    updated_at: float
+    next_attempt_at: float
+
+    def describe(self) -> str:
+        if self.status == DELIVERED:
+            return f"Draft {self.draft_id} for {self.recipient} delivered after {self.attempts} attempt(s)"
+        if self.status == FAILED:
+            return f"Draft for {self.recipient} failed after {self.attempts} attempt(s): {self.last_error}"
+        retry = f", last error: {self.last_error}" if self.last_error else ""
+        return f"Draft for {self.recipient} {self.status} ({self.attempts} attempt(s){retry})"
+
+
+class EmailOutbox:
+    """SQLite-backed queue of email drafts.
+
+    Safe to share between threads and between processes using the same file.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " meeting_id TEXT NOT NULL,"
+            " idempotency_key TEXT NOT NULL UNIQUE,"
+            " message_id TEXT NOT NULL,"
+            " sender TEXT NOT NULL,"
+            " recipient TEXT NOT NULL,"
+            " subject TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " draft_id TEXT,"
+            " last_error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " next_attempt_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_meeting ON outbox (meeting_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+
+    def enqueue(self, meeting_id: str, body: str, sender: str, recipient: str,
+                subject: Optional[str] = None) -> OutboxEntry:
+        """Queue a draft; the same minutes for the same meeting and recipient are queued once.
+
+        The subject is not part of the key: the dated default subject would
+        queue a second draft on the next day, so the first enqueue's subject
+        is kept. An entry that failed for good is queued again; pending and
+        delivered ones are returned as is.
+        """
+        subject = subject or minutes_subject()
+        key = hashlib.sha256("\0".join((meeting_id, sender, recipient, body)).encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            # Queueing again after a permanent failure retries it from the start
+            # (the kept last_error makes the next attempt look for an existing draft first)
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, updated_at = ?, next_attempt_at = ?"
+                " WHERE idempotency_key = ? AND status = ?",
+                (PENDING, now, now, key, FAILED),
+            )
+            self._conn.execute(
+                f"INSERT OR IGNORE INTO outbox ({_COLUMNS})"
+                f" VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, 0, NULL, NULL, ?, ?, ?)",
+                (meeting_id, key, make_msgid(domain="meeting-minutes.local"), sender, recipient, subject, body,
+                 PENDING, now, now, now),
+            )
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM outbox WHERE idempotency_key = ?", (key,)).fetchone()
+        return OutboxEntry(*row)
+
+    def claim(self) -> Optional[OutboxEntry]:
+        """Take the next due entry for delivery, or None."""
+        entries = self.claim_batch(1)
+        return entries[0] if entries else None
+
+    def claim_batch(self, limit: int) -> List[OutboxEntry]:
+        """Take up to ``limit`` due entries for delivery, oldest due first."""
+        now = time.time()
+        with self._lock:
+            # SELECT then UPDATE under a write lock rather than UPDATE ... RETURNING,
+            # which needs SQLite 3.35 (sqlite_patch does not upgrade older hosts)
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                ids = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM outbox WHERE status = ? AND next_attempt_at <= ?"
+                    " ORDER BY next_attempt_at, id LIMIT ?",
+                    (PENDING, now, limit),
+                )]
+                rows = []
+                if ids:
+                    marks = ", ".join("?" * len(ids))
+                    self._conn.execute(
+                        f"UPDATE outbox SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id IN ({marks})",
+                        (SENDING, now, *ids),
+                    )
+                    rows = self._conn.execute(
+                        f"SELECT {_COLUMNS} FROM outbox WHERE id IN ({marks})", ids
+                    ).fetchall()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return sorted((OutboxEntry(*row) for row in rows), key=lambda entry: (entry.next_attempt_at, entry.id))
+
+    def mark_delivered(self, entry_id: int, draft_id: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, draft_id = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                (DELIVERED, draft_id, time.time(), entry_id),
+            )
+
+    def mark_failed(self, entry_id: int, error: str, retry_at: Optional[float]) -> None:
+        """Record a failed attempt; retried at ``retry_at``, or failed for good if None."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, last_error = ?, updated_at = ?, next_attempt_at = ? WHERE id = ?",
+                (FAILED if retry_at is None else PENDING, error, now, retry_at or now, entry_id),
+            )
+
+    def recover_stale(self, older_than: float = STALE_SENDING_SECONDS) -> int:
+        """Put entries stuck in ``sending`` (the sender died) back in the queue."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE outbox SET status = ?, next_attempt_at = ? WHERE status = ? AND updated_at < ?",
+                (PENDING, now, SENDING, now - older_than),
+            )
+        return cursor.rowcount
+
+    def prune_delivered(self, older_than: float) -> int:
+        """Delete entries delivered more than ``older_than`` seconds ago."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND updated_at < ?", (DELIVERED, time.time() - older_than)
+            )
+        return cursor.rowcount
+
+    def next_attempt_at(self) -> Optional[float]:
+        """When the earliest pending entry is due, or None if nothing is pending."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status = ?", (PENDING,)
+            ).fetchone()
+        return row[0]
+
+    def get(self, entry_id: int) -> Optional[OutboxEntry]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM outbox WHERE id = ?", (entry_id,)).fetchone()
+        return OutboxEntry(*row) if row else None
+
+    def delivery_status(self, meeting_id: str) -> List[OutboxEntry]:
+        """Every queued email of a meeting, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM outbox WHERE meeting_id = ? ORDER BY id", (meeting_id,)
+            ).fetchall()
+        return [OutboxEntry(*row) for row in rows]
+
+    def recent(self, limit: int = 10) -> List[OutboxEntry]:
+        """The most recently queued entries, newest first."""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_COLUMNS} FROM outbox ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [OutboxEntry(*row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def gmail_outbox_sender(entries: Sequence[OutboxEntry], service=None) -> List[DraftResult]:
+    """Create the entries' drafts, one batch request per shared body.
+
+    Only entries attempted before (retried, or queued again after failing)
+    are looked up by Message-ID first: on the first attempt no draft can
+    exist yet.
+    """
+    groups: Dict[Tuple[str, str, str, bool], List[int]] = {}
+    for index, entry in enumerate(entries):
+        retried = entry.attempts > 1 or entry.last_error is not None
+        groups.setdefault((entry.body, entry.sender, entry.subject, retried), []).append(index)
+
+    results: List[Optional[DraftResult]] = [None] * len(entries)
+    for (body, sender, subject, retried), indexes in groups.items():
+        batch = create_minutes_drafts(
+            body, sender, [entries[index].recipient for index in indexes], subject=subject, service=service,
+            message_ids=[entries[index].message_id for index in indexes], find_existing=retried,
+        )
+        for index, result in zip(indexes, batch.results):
+            results[index] = result
+    return results
+
+
+class OutboxWorker(threading.Thread):
+    """Delivers due outbox entries until the outbox has nothing pending.
+
+    Not a daemon thread: a CLI run waits for its queued drafts (including
+    retries) before the process exits. Start another worker after enqueueing
+    more entries; see start_outbox_worker.
+    """
+
+    def __init__(self, outbox: EmailOutbox,
+                 send: Callable[[List[OutboxEntry]], List[DraftResult]] = gmail_outbox_sender,
+                 max_attempts: Optional[int] = None, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, on_result: Optional[Callable[[OutboxEntry], None]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        super().__init__(name="email-outbox")
+        self.outbox = outbox
+        self.send = send
+        self.max_attempts = max_attempts or _env_int("EMAIL_OUTBOX_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_result = on_result
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+        self._exit_lock = threading.Lock()
+        self._exiting = False
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def keep_alive(self) -> bool:
+        """Have this worker pick up newly queued entries; False if it has already finished."""
+        with self._exit_lock:
+            return self.is_alive() and not self._exiting
+
+    def run(self) -> None:
+        errors = 0
+        recovered = False
+        while not self._stop_event.is_set():
+            try:
+                if not recovered:
+                    self.outbox.recover_stale()
+                    recovered = True
+                if not self._deliver_due():
+                    return
+                errors = 0
+            except Exception as e:
+                # The outbox could not be read; its entries stay queued for the next worker
+                errors += 1
+                print(f"⚠️  Email outbox error ({errors}/{self.max_attempts}): {e}")
+                if errors >= self.max_attempts:
+                    with self._exit_lock:
+                        self._exiting = True
+                    print("⚠️  Email outbox worker stopped; queued drafts are retried by the next worker")
+                    return
+                self._stop_event.wait(min(self.max_delay, self.base_delay * 2 ** (errors - 1)))
+
+    def _deliver_due(self) -> bool:
+        """Deliver the due entries or wait for the next one; False once nothing is pending."""
+        entries = self.outbox.claim_batch(self.batch_size)
+        if entries:
+            self._deliver(entries)
+            return True
+        due = self.outbox.next_attempt_at()
+        if due is None:
+            # Decided under the lock, so an entry queued meanwhile either is
+            # seen here or makes start_outbox_worker start a new worker
+            with self._exit_lock:
+                if self.outbox.next_attempt_at() is None:
+                    self._exiting = True
+                    return False
+            return True
+        self._stop_event.wait(max(0.0, min(due - time.time(), self.max_delay)))
+        return True
+
+    def _deliver(self, entries: List[OutboxEntry]) -> None:
+        try:
+            results = self.send(entries)
+        except Exception as e:
+            results = [DraftResult(success=False, mode="direct", recipient=entry.recipient, error=str(e))
+                       for entry in entries]
+        for entry, result in zip(entries, results):
+            try:
+                self._record(entry, result)
+            except Exception as e:
+                # Left in "sending"; recover_stale queues it again
+                print(f"⚠️  Could not record the outbox result for {entry.recipient}: {e}")
+
+    def _record(self, entry: OutboxEntry, result: DraftResult) -> None:
+        if result.success:
+            self.outbox.mark_delivered(entry.id, result.draft_id)
+        elif entry.attempts >= self.max_attempts:
+            self.outbox.mark_failed(entry.id, result.error or "unknown error", retry_at=None)
+        else:
+            # Full jitter, as for the transcription requests
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (entry.attempts - 1)))
+            self.outbox.mark_failed(entry.id, result.error or "unknown error", retry_at=time.time() + delay)
+        if self.on_result:
+            self.on_result(self.outbox.get(entry.id))
+
+
+def get_outbox() -> EmailOutbox:
+    """Process-wide outbox in ``outbox.sqlite3`` under MEETING_MINUTES_CACHE_DIR."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = EmailOutbox(get_cache_dir() / "outbox.sqlite3")
+            ttl = run_state_ttl()
+            if ttl is not None:
+                _outbox.prune_delivered(ttl)
+        return _outbox
+
+
+def _report(entry: OutboxEntry) -> None:
+    mark = {DELIVERED: "✓", FAILED: "✗"}.get(entry.status, "…")
+    print(f"{mark} Outbox: {entry.describe()}")
+
+
+def start_outbox_worker() -> OutboxWorker:
+    """Make sure a worker is delivering the process-wide outbox."""
+    global _worker
+    outbox = get_outbox()
+    with _worker_lock:
+        if _worker is None or not _worker.keep_alive():
+            _worker = OutboxWorker(outbox, on_result=_report)
+            _worker.start()
+        return _worker
+
+
+def enqueue_minutes(meeting_id: str, body: str, sender: str, recipients: Sequence[str],
+                    subject: Optional[str] = None) -> List[OutboxEntry]:
+    """Queue a minutes draft per recipient and make sure a worker delivers them."""
+    outbox = get_outbox()
+    subject = subject or minutes_subject()
+    entries = [outbox.enqueue(meeting_id, body, sender, recipient, subject=subject) for recipient in recipients]
+    start_outbox_worker()
+    return entries
+
+
+def delivery_status(meeting_id: str) -> List[OutboxEntry]:
+    """Delivery state of every email queued for ``meeting_id``."""
+    return get_outbox().delivery_status(meeting_id)
@@ -0,0 +1,143 @@
+"""
+Offline stand-in for the Gmail API service.
+
+Implements the part of the googleapiclient Gmail service the delivery code
+uses: ``users().drafts().create/list(...).execute()`` and
+``new_batch_http_request()``. Every HTTP round trip (a single request or a
+whole batch) sleeps ``latency_ms``, so sequential and batched delivery can
+be compared offline. Failures can be injected per recipient, and responses
+can be "lost" after the draft was created, as on a timeout.
+"""
+
+import base64
+import email
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class FakeHttpError(Exception):
+    """Mimics googleapiclient.errors.HttpError closely enough for error reporting."""
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(f"<HttpError {status}: {reason}>")
+        self.status_code = status
+        self.reason = reason
+
+
+class FakeRequest:
+    """An unexecuted API call."""
+
+    def __init__(self, service: "FakeGmailService", method: str, **kwargs):
+        self._service = service
+        self.method = method
+        self.kwargs = kwargs
+
+    def execute(self):
+        self._service._round_trip()
+        return self._service._handle(self)
+
+
+class FakeBatch:
+    """Batch of API calls sent in one HTTP round trip."""
+
+    def __init__(self, service: "FakeGmailService", callback=None):
+        self._service = service
+        self._callback = callback
+        self._requests: List[tuple] = []
+
+    def add(self, request: FakeRequest, callback=None, request_id: Optional[str] = None) -> None:
+        self._requests.append((request, callback or self._callback, request_id or str(len(self._requests))))
+
+    def execute(self) -> None:
+        self._service._round_trip()
+        self._service.batches += 1
+        if self._service.batches in self._service.fail_batches:
+            raise FakeHttpError(503, "Backend Error")
+        for request, callback, request_id in self._requests:
+            try:
+                response, exception = self._service._handle(request), None
+            except Exception as e:
+                response, exception = None, e
+            if callback:
+                callback(request_id, response, exception)
+
+
+class _Drafts:
+    def __init__(self, service: "FakeGmailService"):
+        self._service = service
+
+    def create(self, userId: str, body: dict) -> FakeRequest:
+        return FakeRequest(self._service, "create", userId=userId, body=body)
+
+    def list(self, userId: str, q: str = "") -> FakeRequest:
+        return FakeRequest(self._service, "list", userId=userId, q=q)
+
+
+class _Users:
+    def __init__(self, service: "FakeGmailService"):
+        self._service = service
+
+    def drafts(self) -> _Drafts:
+        return _Drafts(self._service)
+
+
+class FakeGmailService:
+    """In-memory Gmail service holding the drafts it was asked to create.
+
+    Args:
+        latency_ms: Sleep per HTTP round trip.
+        fail_recipients: Creating a draft to any of these raises a 400 error.
+        lose_responses: This many successful creates raise a timeout instead
+            of returning, as if the response was lost.
+        fail_batches: Batch requests (numbered from 1) whose HTTP request
+            fails as a whole, before any of their calls run.
+    """
+
+    def __init__(self, latency_ms: float = 0, fail_recipients: Iterable[str] = (), lose_responses: int = 0,
+                 fail_batches: Iterable[int] = ()):
+        self.latency_ms = latency_ms
+        self.fail_recipients = set(fail_recipients)
+        self.lose_responses = lose_responses
+        self.fail_batches = set(fail_batches)
+        self.drafts: List[dict] = []
+        self.http_requests = 0
+        self.batches = 0
+        self._by_message_id: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def users(self) -> _Users:
+        return _Users(self)
+
+    def new_batch_http_request(self, callback=None) -> FakeBatch:
+        return FakeBatch(self, callback)
+
+    def _round_trip(self) -> None:
+        with self._lock:
+            self.http_requests += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def _handle(self, request: FakeRequest):
+        if request.method == "list":
+            prefix = "rfc822msgid:"
+            query = request.kwargs.get("q", "")
+            with self._lock:
+                draft = self._by_message_id.get(query[len(prefix):]) if query.startswith(prefix) else None
+            return {"drafts": [draft], "resultSizeEstimate": 1} if draft else {"resultSizeEstimate": 0}
+
+        message = email.message_from_bytes(base64.urlsafe_b64decode(request.kwargs["body"]["message"]["raw"]))
+        if message["To"] in self.fail_recipients:
+            raise FakeHttpError(400, f"Invalid To header: {message['To']}")
+        with self._lock:
+            draft = {"id": f"draft-{len(self.drafts) + 1}", "message": {"id": f"msg-{len(self.drafts) + 1}"}}
+            self.drafts.append({"id": draft["id"], "to": message["To"], "subject": message["Subject"],
+                                "message_id": message["Message-ID"], "html": message.get_payload()})
+            if message["Message-ID"]:
+                self._by_message_id[message["Message-ID"]] = draft
+            lose = self.lose_responses > 0
+            if lose:
+                self.lose_responses -= 1
+        if lose:
+            raise TimeoutError("The read operation timed out")
+        return draft
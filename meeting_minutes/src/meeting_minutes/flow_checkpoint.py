@@ -0,0 +1,194 @@
+"""
+Checkpointed flow state, so a rerun resumes after the last completed stage.
+
+After every stage of the meeting minutes flow, the flow state (transcript,
+normalized transcript, minutes, analysis) and the stage's completion are
+written to ``flow_runs/<run id>.json`` under MEETING_MINUTES_CACHE_DIR. The
+run id is derived from the input recording, so kicking off the flow again
+for the same audio restores the state and skips the stages that already
+completed: a failed draft is retried without transcribing the meeting or
+generating the minutes again.
+
+A stage that returns STAGE_INCOMPLETE (e.g. the draft could not be created)
+is not recorded and runs again next time. A draft queued in the email outbox
+counts as complete; the outbox delivers it. FLOW_FORCE_STAGES names stages to
+run again even though they completed (``all`` for every stage); once a stage
+runs, every later stage runs as well, since its inputs may have changed.
+FLOW_CHECKPOINT=0 runs every stage and writes no checkpoint. Checkpoints not
+written to for RUN_STATE_TTL_HOURS (default a week) are deleted.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from .disk_cache import get_cache_dir, prune_stale_files
+    from .transcription_journal import recording_run_id
+except ImportError:
+    from disk_cache import get_cache_dir, prune_stale_files
+    from transcription_journal import recording_run_id
+
+# Returned by a stage that ended without doing its job, so it is retried on resume
+STAGE_INCOMPLETE = "stage-incomplete"
+
+# Fields of the flow state that are not restored (CrewAI assigns a new id per flow)
+_SKIPPED_FIELDS = frozenset({"id"})
+
+
+def checkpointing_enabled() -> bool:
+    """FLOW_CHECKPOINT: persist the flow state after each stage and resume from it (default on)."""
+    return os.getenv("FLOW_CHECKPOINT", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_forced_stages() -> List[str]:
+    """FLOW_FORCE_STAGES: comma-separated stages to recompute (``all`` for every stage)."""
+    return [stage.strip() for stage in (os.getenv("FLOW_FORCE_STAGES") or "").split(",") if stage.strip()]
+
+
+def flow_run_id(audio_path: str) -> str:
+    """Stable id of a flow run over ``audio_path``."""
+    return recording_run_id(audio_path, kind="flow")
+
+
+def dump_state(state) -> Dict[str, Any]:
+    """JSON-compatible snapshot of a pydantic (or plain) state object."""
+    if hasattr(state, "model_dump"):
+        data = state.model_dump(mode="json")
+    else:
+        data = json.loads(json.dumps(vars(state), default=str))
+    return {name: value for name, value in data.items() if name not in _SKIPPED_FIELDS}
+
+
+def restore_state(state, data: Dict[str, Any]) -> None:
+    """Set ``state``'s fields from a dump_state snapshot, validating nested models."""
+    data = {name: value for name, value in data.items() if name not in _SKIPPED_FIELDS}
+    if hasattr(state, "model_validate"):
+        restored = type(state).model_validate({**state.model_dump(), **data})
+        data = {name: getattr(restored, name) for name in data}
+    for name, value in data.items():
+        setattr(state, name, value)
+
+
+class FlowCheckpoint:
+    """Stage completions and the latest state snapshot of one flow run.
+
+    Args:
+        path: JSON file of the run.
+        force: Stages to run again even if completed (``all`` for every stage).
+    """
+
+    def __init__(self, path, force: Iterable[str] = ()):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.force = set(force)
+        self._lock = threading.Lock()
+        self._stages: Dict[str, dict] = {}
+        self._state: Optional[Dict[str, Any]] = None
+        # Set once a stage runs in this process; every later stage then runs too
+        self._rerunning = False
+        self._restored = False
+        self._load()
+
+    @classmethod
+    def for_recording(cls, audio_path: str, force: Iterable[str] = ()) -> "FlowCheckpoint":
+        """Open the checkpoint of the flow run over ``audio_path``."""
+        directory = get_cache_dir() / "flow_runs"
+        if directory.exists():
+            prune_stale_files(directory, "*.json")
+        return cls(directory / f"{flow_run_id(audio_path)}.json", force=force)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as checkpoint_file:
+                data = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Ignoring unreadable flow checkpoint {self.path}: {e}")
+            return
+        self._stages = data.get("stages") or {}
+        self._state = data.get("state")
+
+    def _write(self) -> None:
+        # Written to a temporary file and renamed, so a crash never leaves half a checkpoint
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump({"stages": self._stages, "state": self._state}, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temp_path, self.path)
+
+    def completed_stages(self) -> List[str]:
+        """Completed stages, in the order they completed."""
+        with self._lock:
+            return sorted(self._stages, key=lambda stage: self._stages[stage]["completed_at"])
+
+    def should_skip(self, stage: str) -> bool:
+        """Whether ``stage`` completed before and may be skipped now."""
+        with self._lock:
+            if self._rerunning or stage not in self._stages:
+                return False
+            return stage not in self.force and "all" not in self.force
+
+    def restore(self, state) -> bool:
+        """Load the saved state into ``state`` (once per run). False if there is none."""
+        with self._lock:
+            if self._state is None or self._restored:
+                return self._restored
+            restore_state(state, self._state)
+            self._restored = True
+            return True
+
+    def start(self, stage: str) -> None:
+        """Record that ``stage`` is running; it and the stages after it are no longer complete."""
+        with self._lock:
+            self._rerunning = True
+            if stage in self._stages:
+                cutoff = self._stages[stage]["completed_at"]
+                self._stages = {name: record for name, record in self._stages.items()
+                                if record["completed_at"] < cutoff}
+                self._write()
+
+    def complete(self, stage: str, state, elapsed: float) -> None:
+        """Persist ``stage`` as completed together with the state it produced."""
+        with self._lock:
+            self._stages[stage] = {"completed_at": time.time(), "elapsed": elapsed}
+            self._state = dump_state(state)
+            self._write()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stages, self._state = {}, None
+            self.path.unlink(missing_ok=True)
+
+
+def checkpointed(method):
+    """Make a flow stage skip itself when its checkpoint says it completed.
+
+    The flow keeps its FlowCheckpoint (or None) in ``self.checkpoint``.
+    Apply below ``@start``/``@listen`` so CrewAI registers the wrapper.
+    """
+    stage = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        checkpoint = getattr(self, "checkpoint", None)
+        if checkpoint is None:
+            return method(self, *args, **kwargs)
+        if checkpoint.should_skip(stage):
+            checkpoint.restore(self.state)
+            print(f"Skipping {stage}: completed in an earlier run")
+            return None
+        checkpoint.start(stage)
+        started = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        if result is not STAGE_INCOMPLETE:
+            checkpoint.complete(stage, self.state, time.perf_counter() - started)
+        return result
+
+    return wrapper
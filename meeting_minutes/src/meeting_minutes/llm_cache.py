@@ -0,0 +1,223 @@
+"""
+Persistent cache for LLM responses and crew kickoffs.
+
+Two layers share one SQLite store:
+- Kickoff cache: the final output of a side-effect-free crew (meeting minutes,
+  section summaries), keyed on the models, the rendered task and agent
+  prompts and the tool schemas. A repeat run with the same transcript skips
+  the LLM stage entirely.
+- Completion cache: individual LLM completions keyed on model, parameters,
+  rendered messages and tool schema (see cached_llm.CachedLLM). Crews whose
+  tools have side effects (the Gmail crew) use this layer only, so their
+  tools still run while the LLM round trips are replayed.
+
+Controlled by LLM_CACHE (default on), LLM_CACHE_BYPASS (skip lookups but
+store fresh results), LLM_CACHE_TTL_HOURS and LLM_CACHE_MAX_MB.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    from .disk_cache import DiskCache, get_cache_dir
+    from .telemetry import span
+except ImportError:
+    from disk_cache import DiskCache, get_cache_dir
+    from telemetry import span
+
+DEFAULT_TTL_HOURS = 24 * 7
+DEFAULT_CACHE_MAX_MB = 50
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def llm_cache_bypassed() -> bool:
+    """LLM_CACHE_BYPASS: ignore cached responses (fresh results are still stored)."""
+    return _env_flag("LLM_CACHE_BYPASS", "0")
+
+
+def get_llm_cache() -> Optional[DiskCache]:
+    """Process-wide LLM response cache, or None if LLM_CACHE is off.
+
+    Stored in ``llm.sqlite3`` under MEETING_MINUTES_CACHE_DIR.
+    """
+    global _cache
+    if not _env_flag("LLM_CACHE", "1"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskCache(
+                get_cache_dir() / "llm.sqlite3",
+                max_bytes=int(_env_float("LLM_CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB) * 1024 * 1024),
+                ttl=_env_float("LLM_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS) * 3600,
+            )
+        return _cache
+
+
+def _digest(kind: str, payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return f"{kind}:" + hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def completion_cache_key(model: str, messages, tools=None, **params) -> str:
+    """Key for one LLM completion."""
+    return _digest("completion", {"model": model, "messages": messages, "tools": tools, "params": params})
+
+
+def render_template(text: Optional[str], inputs: Dict[str, Any]) -> str:
+    """Fill ``{name}`` placeholders of a task or agent template the way crewai does."""
+    text = text or ""
+    for name, value in inputs.items():
+        text = text.replace("{" + name + "}", str(value))
+    return text
+
+
+def _tool_schema(tool) -> dict:
+    schema = getattr(tool, "args_schema", None)
+    if schema is not None and hasattr(schema, "model_json_schema"):
+        schema = schema.model_json_schema()
+    return {"name": getattr(tool, "name", type(tool).__name__),
+            "description": getattr(tool, "description", ""), "args": schema}
+
+
+def _model_name(agent) -> str:
+    llm = getattr(agent, "llm", None)
+    return str(getattr(llm, "model", llm))
+
+
+def kickoff_cache_key(crew, inputs: Dict[str, Any]) -> str:
+    """Key for a crew run: every agent's model, prompt and tools plus every rendered task."""
+    agents = [
+        {
+            "model": _model_name(agent),
+            "role": render_template(agent.role, inputs),
+            "goal": render_template(agent.goal, inputs),
+            "backstory": render_template(agent.backstory, inputs),
+            "tools": [_tool_schema(tool) for tool in (agent.tools or [])],
+        }
+        for agent in crew.agents
+    ]
+    tasks = [
+        {
+            "description": render_template(task.description, inputs),
+            "expected_output": render_template(task.expected_output, inputs),
+            "agent": getattr(task.agent, "role", None),
+            "async": getattr(task, "async_execution", False),
+            "tools": [_tool_schema(tool) for tool in (task.tools or [])],
+            "output": getattr(getattr(task, "output_pydantic", None), "__name__", None),
+        }
+        for task in crew.tasks
+    ]
+    return _digest("kickoff", {"process": str(getattr(crew, "process", "")), "agents": agents, "tasks": tasks})
+
+
+@dataclass
+class CachedTaskOutput:
+    """Stands in for crewai's TaskOutput in a cached kickoff."""
+
+    raw: str
+    pydantic: Any = None
+
+
+@dataclass
+class CachedCrewOutput:
+    """Stands in for crewai's CrewOutput when a kickoff is served from the cache."""
+
+    raw: str
+    tasks_output: List[CachedTaskOutput] = field(default_factory=list)
+    cached: bool = True
+    token_usage: Dict[str, int] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        return self.raw
+
+
+def _serialize_output(output) -> Optional[str]:
+    raw = getattr(output, "raw", None)
+    if not isinstance(raw, str) or not raw:
+        return None
+    tasks = []
+    for task_output in getattr(output, "tasks_output", None) or []:
+        structured = getattr(task_output, "pydantic", None)
+        tasks.append({
+            "raw": str(getattr(task_output, "raw", "")),
+            "pydantic": structured.model_dump_json() if hasattr(structured, "model_dump_json") else None,
+        })
+    return json.dumps({"raw": raw, "tasks": tasks})
+
+
+def _deserialize_output(crew, value: str) -> CachedCrewOutput:
+    try:
+        stored = json.loads(value)
+    except json.JSONDecodeError:
+        stored = None
+    if not isinstance(stored, dict):
+        return CachedCrewOutput(raw=value)
+    tasks_output = []
+    for task, task_output in zip(crew.tasks, stored.get("tasks", [])):
+        model = getattr(task, "output_pydantic", None)
+        structured = task_output.get("pydantic")
+        tasks_output.append(CachedTaskOutput(
+            raw=task_output.get("raw", ""),
+            pydantic=model.model_validate_json(structured) if model is not None and structured else None,
+        ))
+    return CachedCrewOutput(raw=stored["raw"], tasks_output=tasks_output)
+
+
+def cached_kickoff(crew, inputs: Dict[str, Any], cache: Optional[DiskCache] = None):
+    """``crew.kickoff(inputs)``, served from the kickoff cache when possible.
+
+    The final output and every task's structured output are cached. Only use
+    for crews without side effects: a cache hit runs no tasks.
+    """
+    if cache is None:
+        cache = get_llm_cache()
+    with span("crew_kickoff", tasks=len(getattr(crew, "tasks", None) or [])) as kickoff_span:
+        if cache is None:
+            return crew.kickoff(inputs=inputs)
+
+        key = kickoff_cache_key(crew, inputs)
+        if not llm_cache_bypassed():
+            value = cache.get(key)
+            if value is not None:
+                kickoff_span.set_attribute("cached", True)
+                return _deserialize_output(crew, value)
+
+        output = crew.kickoff(inputs=inputs)
+        value = _serialize_output(output)
+        if value is not None:
+            cache.set(key, value)
+        return output
+
+
+def describe_cache_stats(cache: Optional[DiskCache] = None) -> Optional[str]:
+    """One-line hit-rate report for the LLM cache, or None if disabled or unused."""
+    if cache is None:
+        cache = get_llm_cache()
+    if cache is None:
+        return None
+    stats = cache.stats()
+    if not stats.hits + stats.misses:
+        return None
+    return (
+        f"LLM cache: {stats.hits} hit(s), {stats.misses} miss(es) ({stats.hit_rate:.0%} hit rate), "
+        f"{stats.entries} entries, {stats.size_bytes / 1024:.0f} KB"
+    )
@@ -1,55 +1,51 @@
 #!/usr/bin/env python
 # SQLite compatibility fix - MUST be applied before any ChromaDB imports
 import sys
-import warnings
-import os
-
-# Set environment variables to suppress ChromaDB warnings
-os.environ["CHROMA_SILENCE_DEPRECATION_WARNINGS"] = "1"
-os.environ["TOKENIZERS_PARALLELISM"] = "false"
-os.environ["CHROMA_DB_IMPL"] = "duckdb+parquet"  # Alternative backend
-
-# Suppress all SQLite and ChromaDB warnings
-warnings.filterwarnings("ignore", message=".*sqlite3.*")
-warnings.filterwarnings("ignore", message=".*SQLite.*")
-warnings.filterwarnings("ignore", message=".*Chroma.*")
-warnings.filterwarnings("ignore", message=".*unsupported version.*")
-warnings.filterwarnings("ignore", category=RuntimeWarning)
 
-# Try to import and apply SQLite patch
 try:
-    from sqlite_patch import patch_sqlite_version, force_chromadb_compatibility
-    patch_sqlite_version()
-    force_chromadb_compatibility()
-    print("✅ SQLite compatibility patches applied successfully")
-except ImportError as e:
-    print(f"⚠️  Could not import SQLite patch: {e}")
-    # Try alternative approach
-    try:
-        import pysqlite3
-        sys.modules['sqlite3'] = pysqlite3
-        print("✅ Replaced sqlite3 with pysqlite3")
-    except ImportError:
-        print("⚠️  pysqlite3 not available, using system sqlite3")
+    from .bootstrap import bootstrap, lazy_import, print_startup_report, startup_phase
+except ImportError:
+    from bootstrap import bootstrap, lazy_import, print_startup_report, startup_phase
+
+bootstrap()
 
 import os
-from datetime import datetime
 from pydantic import BaseModel
 from crewai.flow.flow import Flow, listen, start
-from openai import OpenAI
-from pydub import AudioSegment
-from pydub.utils import make_chunks
 from pathlib import Path
+from typing import List
 
 try:
-    from crews.meeting_minutes_crew.meeting_minutes_crew import MeetingMinutesCrew
-    from crews.gmailcrew.gmailcrew import GmailCrew
+    from .chunk_planner import open_planned_chunk_source
+    from .crews.meeting_minutes_crew.models import MeetingAnalysis
+    from .email_delivery import deliver_minutes, describe_gmail_service, get_delivery_mode, get_recipients, minutes_subject
+    from .email_outbox import FAILED, delivery_status, enqueue_minutes, meeting_id_for, outbox_enabled
+    from .flow_checkpoint import STAGE_INCOMPLETE, FlowCheckpoint, checkpointed, checkpointing_enabled, get_forced_stages
+    from .llm_cache import cached_kickoff, describe_cache_stats
+    from .minutes_export import export_minutes_in_background
+    from .rate_limiter import get_scheduler
+    from .streaming_pipeline import OrderedEmitter, StreamingSummarizer, streaming_enabled
+    from .telemetry import current_span, describe_trace, span, traced
+    from .token_budget import budget_transcript, describe_token_usage, instrument_crew
+    from .transcript_normalizer import prepare_llm_transcript
+    from .transcription import chunk_transcriber, open_transcription_journal, transcribe_chunks
+    from .transcription_backends import get_transcription_backend
 except ImportError:
-    # Fallback to import helper
-    from import_helper import import_crews
-    MeetingMinutesCrew, GmailCrew = import_crews()
+    from chunk_planner import open_planned_chunk_source
+    from crews.meeting_minutes_crew.models import MeetingAnalysis
+    from email_delivery import deliver_minutes, describe_gmail_service, get_delivery_mode, get_recipients, minutes_subject
+    from email_outbox import FAILED, delivery_status, enqueue_minutes, meeting_id_for, outbox_enabled
+    from flow_checkpoint import STAGE_INCOMPLETE, FlowCheckpoint, checkpointed, checkpointing_enabled, get_forced_stages
+    from llm_cache import cached_kickoff, describe_cache_stats
+    from minutes_export import export_minutes_in_background
+    from rate_limiter import get_scheduler
+    from streaming_pipeline import OrderedEmitter, StreamingSummarizer, streaming_enabled
+    from telemetry import current_span, describe_trace, span, traced
+    from token_budget import budget_transcript, describe_token_usage, instrument_crew
+    from transcript_normalizer import prepare_llm_transcript
+    from transcription import chunk_transcriber, open_transcription_journal, transcribe_chunks
+    from transcription_backends import get_transcription_backend
 
-import agentops
 from dotenv import load_dotenv
 
 # Fix Unicode encoding issues on Windows
@@ -65,47 +61,137 @@ if sys.platform == "win32":
 
 load_dotenv()
 
-client = OpenAI()
+AUDIO_PATH = str(Path(__file__).parent / "EarningsCall.wav")
+
+
+def load_meeting_minutes_crew():
+    """Import the crew (and with it crewai's agents, tools and LLM clients) on first use."""
+    with startup_phase("import crews"):
+        try:
+            # Same package as MeetingAnalysis above, so the crew's models are loaded once
+            from .crews.meeting_minutes_crew.meeting_minutes_crew import MeetingMinutesCrew
+        except ImportError:
+            try:
+                from crews.meeting_minutes_crew.meeting_minutes_crew import MeetingMinutesCrew
+            except ImportError:
+                # Fallback to import helper
+                from import_helper import import_crews
+                MeetingMinutesCrew, _ = import_crews()
+    return MeetingMinutesCrew
 
 class MeetingMinutesState(BaseModel):
     transcript: str = ""
+    transcript_chunks: List[str] = []
+    # What the LLM stage receives; the transcript above is kept for display
+    normalized_transcript: str = ""
+    # Streaming mode: section notes summarized while the audio was transcribed
+    condensed_transcript: str = ""
+    analysis: MeetingAnalysis = MeetingAnalysis()
     meeting_minutes: str = ""
 
 
 class MeetingMinutesFlow(Flow[MeetingMinutesState]):
 
+    def __init__(self, audio_path=AUDIO_PATH, checkpoint=None, **kwargs):
+        super().__init__(**kwargs)
+        self.audio_path = audio_path
+        # Stages completed in an earlier run over the same audio are skipped (see flow_checkpoint)
+        self.checkpoint = checkpoint
+
     @start()
+    @traced
+    @checkpointed
     def transcribe_meeting(self):
         print("Generating Transcription")
 
-        SCRIPT_DIR = Path(__file__).parent
-        audio_path = str(SCRIPT_DIR / "EarningsCall.wav")
+        audio_path = self.audio_path
         
-        # Load the audio file
-        audio = AudioSegment.from_file(audio_path, format="wav")
-        
-        # Define chunk length in milliseconds (e.g., 1 minute = 60,000 ms)
-        chunk_length_ms = 60000
-        chunks = make_chunks(audio, chunk_length_ms)
-
-        # Transcribe each chunk
-        full_transcription = ""
-        for i, chunk in enumerate(chunks):
-            print(f"Transcribing chunk {i+1}/{len(chunks)}")
-            chunk_path = f"chunk_{i}.wav"
-            chunk.export(chunk_path, format="wav")
-            
-            with open(chunk_path, "rb") as audio_file:
-                transcription = client.audio.transcriptions.create(
-                    model="whisper-1", 
-                    file=audio_file
-                )
-                full_transcription += transcription.text + " "
+        # Pick the largest chunk that fits the upload limit, then stream the
+        # audio file one chunk at a time, cutting at pauses and skipping long silences
+        plan, chunks = open_planned_chunk_source(audio_path)
+        print(f"Chunk plan: {plan.describe()}")
+
+        # In streaming mode (STREAMING_PIPELINE), sections of the transcript are
+        # summarized as soon as their chunks are in, while later chunks upload
+        streaming = StreamingSummarizer() if streaming_enabled() else None
+        emitter = OrderedEmitter(streaming.add_chunk) if streaming else None
+
+        # Transcribe chunks concurrently; the transcript is reassembled in chunk order
+        def report_progress(result, completed, total):
+            print(
+                f"Transcribed chunk {result.index + 1} ({completed}/{total or '?'}) in {result.elapsed:.1f}s, "
+                f"uploaded {result.bytes_uploaded / 1024:.0f} KB"
+            )
+            if emitter:
+                emitter.add(result.index, result.text)
+
+        # Finished chunks are journaled so a rerun after a failure resumes
+        backend = get_transcription_backend()
+        journal = open_transcription_journal(audio_path, chunks, backend=backend)
 
-        self.state.transcript = full_transcription
+        try:
+            result = transcribe_chunks(
+                chunks,
+                chunk_transcriber(backend),
+                on_progress=report_progress,
+                journal=journal,
+            )
+        except BaseException:
+            if streaming:
+                streaming.close()
+            raise
+        print(
+            f"Transcribed {len(result.chunks)} chunks in {result.wall_time:.1f}s, "
+            f"uploaded {result.bytes_uploaded / 1024 / 1024:.1f} MB"
+        )
+        stage_span = current_span()
+        if stage_span:
+            stage_span.set_attribute("chunks", len(result.chunks))
+            stage_span.set_attribute("bytes_uploaded", result.bytes_uploaded)
+        if result.resumed_chunks:
+            print(f"Resumed {result.resumed_chunks}/{len(result.chunks)} chunks from an earlier run")
+        if result.cached_chunks:
+            print(f"Reused {result.cached_chunks}/{len(result.chunks)} chunk transcriptions from cache")
+        requests = get_scheduler().metrics()
+        print(
+            f"Sent {requests.requests} request(s): {requests.retries} retried, {requests.throttled} throttled, "
+            f"average wait {requests.average_wait:.1f}s, peak queue depth {requests.max_queue_depth}"
+        )
+        silence = getattr(chunks, "stats", None)
+        if silence and silence.total_ms:
+            print(
+                f"Skipped {silence.skipped_ms / 1000:.0f}s of silence "
+                f"({silence.skipped_ratio:.0%} of {silence.total_ms / 1000:.0f}s)"
+            )
+
+        self.state.transcript = result.text
+        self.state.transcript_chunks = [c.text for c in result.chunks]
         print(f"Transcription: {self.state.transcript}")
 
+        if streaming:
+            emitter.drain(result.chunks)
+            reduction = streaming.finish()
+            self.state.condensed_transcript = reduction.text
+            if reduction.reduced:
+                print(
+                    f"Summarized {reduction.sections[0]} sections while transcribing; "
+                    f"the final reduce took {reduction.wall_time:.1f}s"
+                )
+
     @listen(transcribe_meeting)
+    @traced
+    @checkpointed
+    def normalize_meeting_transcript(self):
+        # Drop fillers, repetitions and duplicates at chunk seams before the
+        # transcript is copied into every task prompt (TRANSCRIPT_NORMALIZE)
+        normalized = prepare_llm_transcript(self.state.transcript_chunks or self.state.transcript)
+        self.state.normalized_transcript = normalized.text
+        if normalized.text != normalized.original:
+            print(f"Normalized transcript: {normalized.describe()}")
+
+    @listen(normalize_meeting_transcript)
+    @traced
+    @checkpointed
     def generate_meeting_minutes(self):
         print("Generating Meeting Minutes")
         # result = (
@@ -115,70 +201,156 @@ class MeetingMinutesFlow(Flow[MeetingMinutesState]):
         # )
 
 
-        crew = MeetingMinutesCrew()
+        crew = load_meeting_minutes_crew()().crew()
+
+        # Estimate the prompt tokens before any LLM call; long transcripts and
+        # transcripts over LLM_TOKEN_BUDGET are summarized section by section
+        # in parallel first, so no single LLM call has to take the whole meeting
+        transcript = (
+            self.state.condensed_transcript or self.state.normalized_transcript or self.state.transcript
+        )
+        reduction, estimate = budget_transcript(transcript, crew)
+        if reduction.reduced:
+            print(
+                f"Condensed ~{reduction.original_tokens} transcript tokens to ~{reduction.tokens} "
+                f"via {' + '.join(map(str, reduction.sections))} section summaries in {reduction.wall_time:.1f}s"
+            )
+        print(f"Pre-flight estimate: {estimate.describe()}")
 
         inputs = {
-            "transcript": self.state.transcript
+            "transcript": reduction.text
         }
 
-
-        meeting_minutes = crew.crew().kickoff(inputs)
+        # Identical transcripts and task config are answered from the LLM cache
+        usage = instrument_crew(crew)
+        meeting_minutes = cached_kickoff(crew, inputs)
+        if getattr(meeting_minutes, "cached", False):
+            print("Meeting minutes served from the LLM cache")
+        for line in usage.describe():
+            print(f"  {line}")
+        provider_usage = describe_token_usage(meeting_minutes)
+        if provider_usage:
+            print(provider_usage)
         # Convert CrewOutput to string if needed
         if hasattr(meeting_minutes, 'raw'):
             self.state.meeting_minutes = str(meeting_minutes.raw)
         else:
             self.state.meeting_minutes = str(meeting_minutes)
+        self.state.analysis = MeetingAnalysis.from_crew_output(meeting_minutes)
+        print(
+            f"Analysis: {len(self.state.analysis.action_items)} action item(s), "
+            f"sentiment {self.state.analysis.sentiment.sentiment if self.state.analysis.sentiment else 'unknown'}"
+        )
+
+        # Optional on-disk copy (MEETING_MINUTES_EXPORT_DIR), written in the background
+        export_minutes_in_background(self.state.analysis, self.state.meeting_minutes, self.state.transcript)
 
     @listen(generate_meeting_minutes)
+    @traced
+    @checkpointed
     def create_meeting_minutes_draft(self):
         print("Creating Meeting Minutes Email Draft")
         
         # Get email configuration
         sender = os.getenv("GMAIL_SENDER")
-        recipient = os.getenv("GMAIL_RECIPIENT")
+        recipients = get_recipients()
         
-        current_date = datetime.now().strftime("%B %d, %Y")
         print(f"Email Configuration:")
         print(f"  From: {sender}")
-        print(f"  To: {recipient}")
-        print(f"  Subject: Meeting Minutes - {current_date}")
+        print(f"  To: {', '.join(recipients)}")
+        print(f"  Subject: {minutes_subject()}")
         
-        if not sender or not recipient:
+        if not sender or not recipients:
             print("✗ ERROR: Missing email configuration!")
             print("Please set GMAIL_SENDER and GMAIL_RECIPIENT environment variables")
-            return
+            return STAGE_INCOMPLETE
         
-        crew = GmailCrew()
-        inputs = {
-            "body": str(self.state.meeting_minutes)
-        }
-        
-        print("Creating email draft...")
-        result = crew.crew().kickoff(inputs)
-        result_str = str(result)
-        print(f"Draft Result: {result_str}")
+        cache_report = describe_cache_stats()
+        if cache_report:
+            print(cache_report)
+
+        # Queue the draft in the durable outbox and return; a background worker
+        # creates it with retries (EMAIL_OUTBOX=0 waits for the Gmail API instead)
+        if get_delivery_mode() == "direct" and outbox_enabled():
+            entries = enqueue_minutes(meeting_id_for(self.state.transcript), str(self.state.meeting_minutes),
+                                      sender, recipients)
+            for entry in entries:
+                print(f"Queued the email draft for meeting {entry.meeting_id}: {entry.describe()}")
+            # Complete once queued: the outbox owns delivery from here, and a resumed
+            # run reports its progress (see kickoff) instead of queueing again
+            return
+
+        # The minutes go to the Gmail API as they are (EMAIL_DELIVERY=crew routes
+        # them through the Gmail crew's agent instead)
+        print(f"Creating email draft ({get_delivery_mode()} delivery)...")
+        result = deliver_minutes(str(self.state.meeting_minutes), sender, recipients)
+        print(f"Draft Result: {result.describe()}")
+        gmail_report = describe_gmail_service()
+        if gmail_report:
+            print(gmail_report)
         
-        if "successfully" in result_str.lower():
+        if result.success:
             print("✓ Email draft created successfully!")
             print(f"Check your Gmail drafts folder for the meeting minutes draft.")
-            print(f"The draft will be sent to: {recipient}")
+            print(f"The drafts will be sent to: {', '.join(recipients)}")
         else:
             print("✗ Email draft creation failed!")
             print("Check the error message above for details.")
+            # Left incomplete, so the next kickoff retries only the draft
+            return STAGE_INCOMPLETE
 
-def kickoff():
+def print_delivery_status(meeting_id):
+    """Print where each queued draft of the meeting is in the email outbox."""
+    entries = delivery_status(meeting_id)
+    for entry in entries:
+        print(f"Email outbox, meeting {meeting_id}: {entry.describe()}")
+    if any(entry.status == FAILED for entry in entries):
+        print("Rerun with FLOW_FORCE_STAGES=create_meeting_minutes_draft to queue the failed drafts again")
 
-    try:
-        session = agentops.init(api_key=os.getenv("AGENTOPS_API_KEY"))
-        print("AgentOps initialized successfully")
-    except Exception as e:
-        print(f"Warning: AgentOps initialization failed: {e}")
-        print("Continuing without AgentOps tracing...")
-        session = None
-    
-    meeting_minutes_flow = MeetingMinutesFlow()
+
+def kickoff(resume=None, force_stages=None):
+    """Run the flow over AUDIO_PATH.
+
+    Args:
+        resume: Skip the stages completed by an earlier run over the same
+            audio; defaults to FLOW_CHECKPOINT.
+        force_stages: Stages to recompute even if completed (``all`` for
+            every stage); defaults to FLOW_FORCE_STAGES.
+    """
+    # agentops is only imported when it will be used
+    agentops = session = None
+    if os.getenv("AGENTOPS_API_KEY"):
+        try:
+            agentops = lazy_import("agentops")
+            session = agentops.init(api_key=os.getenv("AGENTOPS_API_KEY"))
+            print("AgentOps initialized successfully")
+        except Exception as e:
+            print(f"Warning: AgentOps initialization failed: {e}")
+            print("Continuing without AgentOps tracing...")
+            session = None
+    else:
+        print("AGENTOPS_API_KEY not set, continuing without AgentOps tracing")
+    print_startup_report()
+
+    resume = checkpointing_enabled() if resume is None else resume
+    force_stages = get_forced_stages() if force_stages is None else list(force_stages)
+    unknown = [stage for stage in force_stages if stage != "all" and not hasattr(MeetingMinutesFlow, stage)]
+    if unknown:
+        print(f"⚠️  Unknown stage(s) to force: {', '.join(unknown)}")
+    checkpoint = FlowCheckpoint.for_recording(AUDIO_PATH, force=force_stages) if resume else None
+    if checkpoint and checkpoint.completed_stages():
+        print(f"Resuming run {checkpoint.path.stem}: completed {', '.join(checkpoint.completed_stages())}")
+
+    meeting_minutes_flow = MeetingMinutesFlow(checkpoint=checkpoint)
     meeting_minutes_flow.plot()
-    meeting_minutes_flow.kickoff()
+    # Stage, chunk upload, LLM and Gmail spans go to the local telemetry file (TELEMETRY_FILE)
+    with span("meeting_minutes_flow", audio_path=AUDIO_PATH) as flow_span:
+        meeting_minutes_flow.kickoff()
+    if get_delivery_mode() == "direct" and outbox_enabled() and meeting_minutes_flow.state.transcript:
+        print_delivery_status(meeting_id_for(meeting_minutes_flow.state.transcript))
+    print(f"Slowest spans of trace {flow_span.trace_id}:")
+    for line in describe_trace(flow_span.trace_id):
+        print(f"  {line}")
     
     if session:
         try:
@@ -0,0 +1,199 @@
+"""
+Markdown to HTML rendering for the minutes email and the Streamlit view.
+
+Building a ``markdown.Markdown`` loads and registers every extension, which
+costs more than converting a typical document. The renderer keeps one
+instance per thread (Markdown instances are not thread-safe) and resets it
+between documents. Rendered HTML is memoized by the SHA-256 of the Markdown
+in a small LRU, so the email draft, a retried draft and the Streamlit view
+of the same minutes convert them once.
+
+With MARKDOWN_INLINE_CSS=1 the email HTML gets ``style`` attributes on its
+headings, paragraphs, lists, tables and code blocks (many mail clients drop
+``<style>`` sheets). They are added once per document, before caching.
+MARKDOWN_CACHE_SIZE sets how many documents are kept (0 disables the cache).
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+EXTENSIONS = ("tables", "fenced_code", "nl2br")
+DEFAULT_CACHE_SIZE = 64
+
+HTML_TEMPLATE = """
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body>
+        {final_email_body}
+    </body>
+    </html>
+"""
+
+# Styles inlined into the email HTML with MARKDOWN_INLINE_CSS=1
+EMAIL_STYLES: Dict[str, str] = {
+    "h1": "color:#1e40af;font-size:24px;margin:0 0 16px;",
+    "h2": "color:#1e40af;font-size:20px;margin:24px 0 12px;",
+    "h3": "color:#1e40af;font-size:16px;margin:20px 0 8px;",
+    "p": "color:#374151;line-height:1.6;margin:0 0 12px;",
+    "ul": "margin:0 0 12px;padding-left:24px;",
+    "ol": "margin:0 0 12px;padding-left:24px;",
+    "li": "color:#374151;line-height:1.6;",
+    "table": "border-collapse:collapse;margin:0 0 16px;",
+    "th": "border:1px solid #cbd5e1;background:#f1f5f9;padding:6px 10px;text-align:left;",
+    "td": "border:1px solid #cbd5e1;padding:6px 10px;",
+    "pre": "background:#f8fafc;border:1px solid #e2e8f0;padding:12px;overflow-x:auto;",
+    "code": "font-family:Menlo,Consolas,monospace;font-size:13px;",
+    "blockquote": "border-left:4px solid #bfdbfe;margin:0 0 12px;padding-left:12px;color:#475569;",
+}
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def inline_css_enabled() -> bool:
+    """MARKDOWN_INLINE_CSS: add inline styles to the email HTML (default off)."""
+    return os.getenv("MARKDOWN_INLINE_CSS", "0").strip().lower() not in ("0", "false", "no", "off")
+
+
+def inline_styles(html: str, styles: Dict[str, str] = EMAIL_STYLES) -> str:
+    """Add ``style`` attributes to the opening tags named in ``styles`` that have none."""
+    pattern = re.compile(r"<(%s)(?=[\s>])([^>]*)>" % "|".join(map(re.escape, styles)))
+
+    def add_style(match):
+        tag, attributes = match.group(1), match.group(2)
+        if "style=" in attributes:
+            return match.group(0)
+        return f'<{tag}{attributes} style="{styles[tag]}">'
+
+    return pattern.sub(add_style, html)
+
+
+@dataclass
+class RendererStats:
+    """Cache and conversion counters of a MarkdownRenderer."""
+
+    hits: int = 0
+    misses: int = 0
+    instances: int = 0
+    render_seconds: float = 0.0
+
+    def describe(self) -> str:
+        return (
+            f"Markdown renderer: {self.misses} render(s) in {self.render_seconds:.3f}s, "
+            f"{self.hits} cache hit(s), {self.instances} Markdown instance(s)"
+        )
+
+
+class MarkdownRenderer:
+    """Converts Markdown to HTML with reused Markdown instances and an LRU of results.
+
+    Args:
+        extensions: Markdown extensions, as GmailTool has always used.
+        cache_size: Documents kept; defaults to MARKDOWN_CACHE_SIZE.
+        inline_css: Inline EMAIL_STYLES into email_html; defaults to MARKDOWN_INLINE_CSS.
+    """
+
+    def __init__(self, extensions: Sequence[str] = EXTENSIONS, cache_size: Optional[int] = None,
+                 inline_css: Optional[bool] = None):
+        self.extensions = list(extensions)
+        self.cache_size = _env_int("MARKDOWN_CACHE_SIZE", DEFAULT_CACHE_SIZE) if cache_size is None else cache_size
+        self.inline_css = inline_css_enabled() if inline_css is None else inline_css
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._stats = RendererStats()
+
+    def _markdown(self) -> "markdown.Markdown":
+        md = getattr(self._local, "md", None)
+        if md is None:
+            # Imported on the first render, not when the module is loaded
+            import markdown
+            md = self._local.md = markdown.Markdown(extensions=self.extensions)
+            with self._lock:
+                self._stats.instances += 1
+        return md
+
+    def _cached(self, kind: str, text: str, render) -> str:
+        key = (kind, hashlib.sha256(text.encode("utf-8")).hexdigest())
+        with self._lock:
+            html = self._cache.get(key)
+            if html is not None:
+                self._cache.move_to_end(key)
+                self._stats.hits += 1
+                return html
+        started = time.perf_counter()
+        html = render(text)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats.misses += 1
+            self._stats.render_seconds += elapsed
+            if self.cache_size > 0:
+                self._cache[key] = html
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return html
+
+    def _convert(self, text: str) -> str:
+        # reset() clears per-document state (e.g. fenced code placeholders) but keeps the extensions
+        return self._markdown().reset().convert(text)
+
+    def to_html(self, text: str) -> str:
+        """HTML fragment for ``text``."""
+        return self._cached("fragment", text, self._convert)
+
+    def email_html(self, text: str) -> str:
+        """Complete HTML email document for ``text``."""
+        def render(text):
+            body = self.to_html(text)
+            if self.inline_css:
+                body = inline_styles(body)
+            return HTML_TEMPLATE.format(final_email_body=body)
+
+        return self._cached("email-css" if self.inline_css else "email", text, render)
+
+    def stats(self) -> RendererStats:
+        with self._lock:
+            return RendererStats(**vars(self._stats))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+def get_renderer() -> MarkdownRenderer:
+    """The process-wide MarkdownRenderer."""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = MarkdownRenderer()
+        return _renderer
+
+
+def render_markdown(text: str) -> str:
+    """HTML fragment for ``text``, e.g. to show the minutes in Streamlit."""
+    return get_renderer().to_html(text)
+
+
+def render_email_html(text: str) -> str:
+    """Complete HTML email document for ``text``."""
+    return get_renderer().email_html(text)
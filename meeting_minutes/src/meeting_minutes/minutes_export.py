@@ -0,0 +1,81 @@
+"""
+Optional export of meeting minutes artifacts.
+
+The pipeline passes the summary, action items and sentiment between stages
+in memory. Set MEETING_MINUTES_EXPORT_DIR to also keep them on disk: each
+run is written to its own directory (timestamp plus transcript hash), so
+concurrent runs never overwrite each other. Writing happens on a background
+thread, off the path to the email draft.
+"""
+
+import hashlib
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+def get_export_dir() -> Optional[Path]:
+    """Base export directory from MEETING_MINUTES_EXPORT_DIR, or None when exports are off."""
+    value = os.getenv("MEETING_MINUTES_EXPORT_DIR")
+    return Path(value) if value else None
+
+
+def run_export_dir(base_dir, transcript: str) -> Path:
+    """Unique directory for one run under ``base_dir``."""
+    digest = hashlib.sha256(transcript.encode("utf-8")).hexdigest()[:8]
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return Path(base_dir) / f"{stamp}-{digest}"
+
+
+def _format_action_items(action_items) -> str:
+    lines = []
+    for item in action_items:
+        details = ", ".join(part for part in (item.owner, f"due {item.due}" if item.due else None) if part)
+        lines.append(f"- {item.description}" + (f" ({details})" if details else ""))
+    return "\n".join(lines)
+
+
+def export_minutes(run_dir, analysis, meeting_minutes: str) -> Path:
+    """Write the analysis and minutes of one run into ``run_dir``.
+
+    Files: summary.txt, action_items.txt, sentiment.txt, meeting_minutes.md
+    and analysis.json (the structured analysis).
+    """
+    run_dir = Path(run_dir)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    sentiment = analysis.sentiment
+    files = {
+        "summary.txt": analysis.summary,
+        "action_items.txt": _format_action_items(analysis.action_items),
+        "sentiment.txt": f"{sentiment.sentiment}: {sentiment.explanation}" if sentiment else "",
+        "meeting_minutes.md": meeting_minutes,
+        "analysis.json": analysis.model_dump_json(indent=2),
+    }
+    for name, content in files.items():
+        (run_dir / name).write_text(content, encoding="utf-8")
+    return run_dir
+
+
+def export_minutes_in_background(analysis, meeting_minutes: str, transcript: str,
+                                 base_dir=None) -> Optional[threading.Thread]:
+    """Start exporting on a background thread; None if exports are off.
+
+    The thread is not a daemon, so the process waits for it before exiting.
+    """
+    base_dir = base_dir or get_export_dir()
+    if base_dir is None:
+        return None
+    run_dir = run_export_dir(base_dir, transcript)
+
+    def export():
+        try:
+            export_minutes(run_dir, analysis, meeting_minutes)
+            print(f"Exported meeting minutes to {run_dir}")
+        except OSError as e:
+            print(f"⚠️  Could not export meeting minutes to {run_dir}: {e}")
+
+    thread = threading.Thread(target=export, name="minutes-export")
+    thread.start()
+    return thread
@@ -0,0 +1,231 @@
+"""
+Rate-limit-aware request scheduler for OpenAI calls.
+
+All transcription requests go through one process-wide RequestScheduler. It
+enforces a requests-per-minute budget with a token bucket and a cap on
+concurrent requests, retries 429s, 5xx responses and connection errors with
+jittered exponential backoff, and honors Retry-After. When the API throttles
+one request, every caller waits out the Retry-After period instead of piling
+more requests onto the limit.
+"""
+
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_MAX_CONCURRENT = 8
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "ConnectionError", "TimeoutError"}
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                delay = max(0.0, self._blocked_until - now)
+                if delay == 0.0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                if delay == 0.0:
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next ``seconds`` (e.g. after a Retry-After)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+@dataclass
+class SchedulerMetrics:
+    """Counters describing how requests moved through the scheduler."""
+
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    failures: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether ``error`` is a throttle, a transient server error or a connection problem."""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Delay requested by the server through Retry-After / retry-after-ms headers."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """Runs API calls under a rate limit and concurrency cap, retrying transient failures.
+
+    Args:
+        requests_per_minute: Sustained request rate (token bucket refill rate).
+        max_concurrent: Requests allowed in flight at once.
+        max_retries: Retries per call before the last error is raised.
+        base_delay: First backoff delay in seconds; doubles on every retry.
+        max_delay: Upper bound for a single backoff delay.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 max_concurrent: int = DEFAULT_MAX_CONCURRENT, max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_delay: float = DEFAULT_BASE_DELAY, max_delay: float = DEFAULT_MAX_DELAY):
+        self.bucket = TokenBucket(rate=requests_per_minute / 60.0, capacity=max(1.0, min(max_concurrent, requests_per_minute)))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._metrics = SchedulerMetrics()
+        self._lock = threading.Lock()
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        # Full jitter: uniform in [0, base * 2^attempt]
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _wait_for_slot(self) -> None:
+        started = time.monotonic()
+        with self._lock:
+            self._metrics.queue_depth += 1
+            self._metrics.max_queue_depth = max(self._metrics.max_queue_depth, self._metrics.queue_depth)
+        try:
+            self._slots.acquire()
+            self.bucket.acquire()
+        finally:
+            waited = time.monotonic() - started
+            with self._lock:
+                self._metrics.queue_depth -= 1
+                self._metrics.requests += 1
+                self._metrics.total_wait += waited
+                self._metrics.max_wait = max(self._metrics.max_wait, waited)
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run ``fn(*args, **kwargs)`` under the limits, retrying transient errors.
+
+        ``fn`` may run several times, so it must be safe to repeat (e.g.
+        rewind any file it uploads).
+        """
+        attempt = 0
+        while True:
+            self._wait_for_slot()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    with self._lock:
+                        self._metrics.failures += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                with self._lock:
+                    self._metrics.retries += 1
+                    if _status_code(e) == 429:
+                        self._metrics.throttled += 1
+                if _status_code(e) == 429:
+                    self.bucket.pause(delay)
+                print(f"⚠️  Request failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            finally:
+                self._slots.release()
+            time.sleep(delay)
+            attempt += 1
+
+    def metrics(self) -> SchedulerMetrics:
+        with self._lock:
+            return SchedulerMetrics(**vars(self._metrics))
+
+
+def _env_number(name: str, default, cast=float):
+    value = os.getenv(name)
+    try:
+        return cast(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def get_scheduler() -> RequestScheduler:
+    """Process-wide scheduler shared by every transcription call.
+
+    Configured by OPENAI_REQUESTS_PER_MINUTE, OPENAI_MAX_CONCURRENT_REQUESTS
+    and OPENAI_MAX_RETRIES.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(
+                requests_per_minute=_env_number("OPENAI_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE),
+                max_concurrent=_env_number("OPENAI_MAX_CONCURRENT_REQUESTS", DEFAULT_MAX_CONCURRENT, int),
+                max_retries=_env_number("OPENAI_MAX_RETRIES", DEFAULT_MAX_RETRIES, int),
+            )
+        return _scheduler
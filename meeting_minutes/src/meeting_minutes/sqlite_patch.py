@@ -96,5 +96,4 @@ def force_chromadb_compatibility():
     warnings.filterwarnings("ignore", message=".*unsupported version.*")
     warnings.filterwarnings("ignore", message=".*deprecated.*")
 
-# Apply the patch when this module is imported
-patch_sqlite_version() 
\ No newline at end of file
+# Applied once per process by bootstrap.bootstrap(), not on import
@@ -0,0 +1,208 @@
+"""
+Streaming mode: summarize the transcript while it is still being transcribed.
+
+In the staged pipeline the LLM stage starts only after the last chunk is
+transcribed, so its latency adds to the transcription time. In streaming
+mode (STREAMING_PIPELINE=1), chunks are handed over in chunk order as soon
+as they and every chunk before them are transcribed (see OrderedEmitter).
+The StreamingSummarizer packs the text into the same sentence-bounded
+sections the staged map-reduce would use and summarizes each section on a
+worker pool as soon as it is closed. When the last chunk lands, only the
+last section and the final reduce are left, so the total time approaches
+max(transcription, summarization) rather than their sum.
+
+Section summaries start once the transcript is known to need map-reduce:
+straight away for SUMMARY_MODE=map_reduce, after SUMMARY_MAX_TRANSCRIPT_TOKENS
+for auto, never for direct. Short transcripts therefore cost no extra calls.
+"""
+
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+try:
+    from .summarization import (DEFAULT_MAX_TRANSCRIPT_TOKENS, DEFAULT_MAX_WORKERS, DEFAULT_SECTION_TOKENS,
+                                SectionSummarizer, SummaryReduction, crew_section_summarizer,
+                                estimate_tokens, get_summary_mode, prepare_transcript, reduce_notes,
+                                split_into_sections)
+    from .transcript_normalizer import SEAM_MAX_WORDS, append_chunk, normalization_enabled, normalize_transcript
+except ImportError:
+    from summarization import (DEFAULT_MAX_TRANSCRIPT_TOKENS, DEFAULT_MAX_WORKERS, DEFAULT_SECTION_TOKENS,
+                               SectionSummarizer, SummaryReduction, crew_section_summarizer,
+                               estimate_tokens, get_summary_mode, prepare_transcript, reduce_notes,
+                               split_into_sections)
+    from transcript_normalizer import SEAM_MAX_WORDS, append_chunk, normalization_enabled, normalize_transcript
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def streaming_enabled() -> bool:
+    """STREAMING_PIPELINE: summarize sections while transcription is running (default off)."""
+    return os.getenv("STREAMING_PIPELINE", "0").strip().lower() not in ("0", "false", "no", "off")
+
+
+class OrderedEmitter:
+    """Turns chunks finishing in any order into an in-order stream.
+
+    ``add(index, text)`` may be called in completion order; ``emit(text)`` is
+    called for every chunk, in chunk order, as soon as all earlier chunks
+    have been added.
+    """
+
+    def __init__(self, emit: Callable[[str], None]):
+        self._emit = emit
+        self._waiting: Dict[int, str] = {}
+        self.next_index = 0
+
+    def add(self, index: int, text: str) -> None:
+        if index < self.next_index:
+            return
+        self._waiting[index] = text
+        while self.next_index in self._waiting:
+            self._emit(self._waiting.pop(self.next_index))
+            self.next_index += 1
+
+    def drain(self, chunks) -> None:
+        """Emit any of ``chunks`` (ChunkResults) not seen yet, e.g. a run resumed from the journal."""
+        for chunk in sorted(chunks, key=lambda c: c.index):
+            self.add(chunk.index, chunk.text)
+
+
+class StreamingSummarizer:
+    """Builds the minutes crew's ``{transcript}`` input while chunks arrive.
+
+    Feed chunk transcriptions in order with ``add_chunk`` (or through an
+    OrderedEmitter), then call ``finish`` for the SummaryReduction. Use as a
+    context manager so section summaries still running are abandoned if
+    transcription fails.
+    """
+
+    def __init__(self, summarize_section: Optional[SectionSummarizer] = None, mode: Optional[str] = None,
+                 section_tokens: Optional[int] = None, max_transcript_tokens: Optional[int] = None,
+                 max_workers: Optional[int] = None, normalize: Optional[bool] = None):
+        self.mode = mode or get_summary_mode()
+        self.section_tokens = section_tokens or _env_int("SUMMARY_SECTION_TOKENS", DEFAULT_SECTION_TOKENS)
+        self.max_transcript_tokens = max_transcript_tokens or _env_int(
+            "SUMMARY_MAX_TRANSCRIPT_TOKENS", DEFAULT_MAX_TRANSCRIPT_TOKENS)
+        self.max_workers = max_workers or _env_int("SUMMARY_MAX_WORKERS", DEFAULT_MAX_WORKERS)
+        self.normalize = normalization_enabled() if normalize is None else normalize
+        self._summarize_section = summarize_section
+
+        self.chunks: List[str] = []
+        self.sections: List[str] = []
+        self._words: List[str] = []
+        self._open_text = ""
+        self._futures: List[Future] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._started = False
+
+    def __enter__(self) -> "StreamingSummarizer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def started(self) -> bool:
+        """Whether section summaries are being produced."""
+        return self._started
+
+    def add_chunk(self, text: str) -> None:
+        """Add the next chunk's transcription (chunks must arrive in order)."""
+        text = (text or "").strip()
+        if not text:
+            return
+        self.chunks.append(text)
+        if self.normalize:
+            append_chunk(self._words, text)
+        else:
+            self._words.extend(text.split())
+        # The last words may still merge with the next chunk's start
+        stable, self._words = self._words[:-SEAM_MAX_WORDS], self._words[-SEAM_MAX_WORDS:]
+        self._extend(stable)
+        self._close_sections(final=False)
+
+    def _extend(self, words: List[str]) -> None:
+        if words:
+            self._open_text = " ".join(filter(None, (self._open_text, " ".join(words))))
+            if self.normalize:
+                # Normalizing is idempotent, so the open text can be normalized again as it grows
+                self._open_text = normalize_transcript(self._open_text).text
+
+    def _close_sections(self, final: bool) -> None:
+        sections = split_into_sections(self._open_text, self.section_tokens) if self._open_text else []
+        # Greedy packing: every section but the last is final once the next one has started
+        keep_open = [] if final else sections[-1:]
+        self._open_text = keep_open[0] if keep_open else ""
+        self.sections.extend(sections[:len(sections) - len(keep_open)])
+
+        if not self._started and self._should_start():
+            self._started = True
+            self._executor = ThreadPoolExecutor(max_workers=max(1, self.max_workers),
+                                                thread_name_prefix="stream-summarize")
+            if self._summarize_section is None:
+                self._summarize_section = crew_section_summarizer()
+        if self._executor is not None:
+            while len(self._futures) < len(self.sections):
+                number = len(self._futures) + 1
+                # The section count is unknown until the last chunk arrives
+                self._futures.append(self._executor.submit(
+                    self._summarize_section, self.sections[number - 1], number, None))
+
+    def _should_start(self) -> bool:
+        if self.mode == "map_reduce":
+            return True
+        if self.mode == "auto":
+            tokens = estimate_tokens(" ".join(self.sections)) + estimate_tokens(self._open_text)
+            return tokens > self.max_transcript_tokens
+        return False
+
+    def finish(self) -> SummaryReduction:
+        """Summarize what is left and reduce the section notes.
+
+        ``wall_time`` is the time spent here, i.e. the latency left after the
+        last chunk was transcribed.
+        """
+        started = time.perf_counter()
+        self._extend(self._words)
+        self._words = []
+        self._close_sections(final=True)
+        original_tokens = estimate_tokens(" ".join(self.chunks))
+
+        if not self.started:
+            # Short enough to go to the crew as it is
+            self.close()
+            text = normalize_transcript(self.chunks).text if self.normalize else " ".join(self.chunks)
+            return SummaryReduction(text=text, original_tokens=original_tokens,
+                                    wall_time=time.perf_counter() - started)
+
+        try:
+            notes = [future.result() for future in self._futures]
+        finally:
+            self.close()
+        result = SummaryReduction(text=reduce_notes(notes), original_tokens=original_tokens,
+                                  levels=1, sections=[len(notes)])
+        if result.tokens > self.max_transcript_tokens and len(notes) > 1:
+            # Still too long: reduce the notes the way the staged pipeline would
+            further = prepare_transcript(
+                result.text, self._summarize_section, mode="map_reduce", section_tokens=self.section_tokens,
+                max_transcript_tokens=self.max_transcript_tokens, max_workers=self.max_workers,
+            )
+            result.text = further.text
+            result.levels += further.levels
+            result.sections += further.sections
+        result.wall_time = time.perf_counter() - started
+        return result
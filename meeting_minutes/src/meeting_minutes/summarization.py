@@ -0,0 +1,192 @@
+"""
+Map-reduce summarization for long transcripts.
+
+Short transcripts go to the meeting minutes crew as they are. Transcripts
+over the token limit are split into token-bounded sections at sentence
+boundaries. The sections are summarized in parallel, each with its action
+items, by the section summary crew. The section notes are then joined, in
+order, into the text the minutes crew receives as ``{transcript}``. If the
+joined notes are still too long, the notes are reduced again. Every LLM call
+therefore sees a bounded prompt, however long the meeting is.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+try:
+    from .llm_cache import cached_kickoff
+except ImportError:
+    from llm_cache import cached_kickoff
+
+DEFAULT_SECTION_TOKENS = 4000
+DEFAULT_MAX_TRANSCRIPT_TOKENS = 12000
+DEFAULT_MAX_WORKERS = 4
+MAX_REDUCE_LEVELS = 3
+
+# Rough English average; good enough to keep prompts well inside the context window
+CHARS_PER_TOKEN = 4
+
+SUMMARY_MODES = ("auto", "direct", "map_reduce")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# summarize_section(section_text, section_number, section_count) -> notes;
+# section_count is None when sections are summarized while still transcribing
+SectionSummarizer = Callable[[str, int, Optional[int]], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def get_summary_mode() -> str:
+    """SUMMARY_MODE: ``auto`` (default), ``direct`` or ``map_reduce``."""
+    mode = (os.getenv("SUMMARY_MODE") or "auto").strip().lower()
+    if mode not in SUMMARY_MODES:
+        print(f"⚠️  Invalid SUMMARY_MODE={mode!r}, using auto")
+        return "auto"
+    return mode
+
+
+def split_into_sections(text: str, max_tokens: int) -> List[str]:
+    """Split ``text`` at sentence boundaries into sections of at most ``max_tokens``.
+
+    A single sentence longer than the limit is split between words.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+
+    sections = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            sections.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        sections.append(current)
+    return sections
+
+
+@dataclass
+class SummaryReduction:
+    """Text handed to the meeting minutes crew and how it was produced."""
+
+    text: str
+    original_tokens: int
+    levels: int = 0
+    sections: List[int] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    @property
+    def reduced(self) -> bool:
+        return self.levels > 0
+
+
+def map_sections(sections: List[str], summarize_section: SectionSummarizer,
+                 max_workers: Optional[int] = None) -> List[str]:
+    """Summarize ``sections`` concurrently; notes are returned in section order."""
+    if max_workers is None:
+        max_workers = _env_int("SUMMARY_MAX_WORKERS", DEFAULT_MAX_WORKERS)
+    count = len(sections)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, count)), thread_name_prefix="summarize") as executor:
+        futures = [executor.submit(summarize_section, section, i + 1, count) for i, section in enumerate(sections)]
+        return [future.result() for future in futures]
+
+
+def reduce_notes(notes: List[str]) -> str:
+    """Join section notes into one document, in order."""
+    count = len(notes)
+    return "\n\n".join(f"## Section {i + 1} of {count}\n{note.strip()}" for i, note in enumerate(notes))
+
+
+def prepare_transcript(transcript: str, summarize_section: Optional[SectionSummarizer] = None,
+                       mode: Optional[str] = None, section_tokens: Optional[int] = None,
+                       max_transcript_tokens: Optional[int] = None,
+                       max_workers: Optional[int] = None) -> SummaryReduction:
+    """Produce the ``{transcript}`` input for the meeting minutes crew.
+
+    Args:
+        transcript: Full meeting transcript.
+        summarize_section: Summarizes one section. Defaults to the section
+            summary crew (see crew_section_summarizer).
+        mode: ``auto`` reduces only transcripts over ``max_transcript_tokens``,
+            ``direct`` never reduces, ``map_reduce`` always does. Defaults to
+            SUMMARY_MODE.
+        section_tokens: Token limit per section. Defaults to
+            SUMMARY_SECTION_TOKENS.
+        max_transcript_tokens: Largest input passed to the crew unreduced.
+            Defaults to SUMMARY_MAX_TRANSCRIPT_TOKENS.
+        max_workers: Sections summarized at once. Defaults to
+            SUMMARY_MAX_WORKERS.
+    """
+    mode = mode or get_summary_mode()
+    if section_tokens is None:
+        section_tokens = _env_int("SUMMARY_SECTION_TOKENS", DEFAULT_SECTION_TOKENS)
+    if max_transcript_tokens is None:
+        max_transcript_tokens = _env_int("SUMMARY_MAX_TRANSCRIPT_TOKENS", DEFAULT_MAX_TRANSCRIPT_TOKENS)
+
+    started = time.perf_counter()
+    result = SummaryReduction(text=transcript, original_tokens=estimate_tokens(transcript))
+    if mode == "direct" or (mode == "auto" and result.original_tokens <= max_transcript_tokens):
+        return result
+
+    if summarize_section is None:
+        summarize_section = crew_section_summarizer()
+    while result.levels < MAX_REDUCE_LEVELS:
+        sections = split_into_sections(result.text, section_tokens)
+        result.text = reduce_notes(map_sections(sections, summarize_section, max_workers=max_workers))
+        result.levels += 1
+        result.sections.append(len(sections))
+        if result.tokens <= max_transcript_tokens or len(sections) == 1:
+            break
+    result.wall_time = time.perf_counter() - started
+    return result
+
+
+def crew_section_summarizer() -> SectionSummarizer:
+    """Section summarizer backed by the section summary crew (one crew per call).
+
+    Section summaries are served from the LLM kickoff cache when available.
+    """
+    # Package-relative first, as in main.py, so the crew modules are loaded under one name
+    try:
+        from .crews.section_summary_crew.section_summary_crew import SectionSummaryCrew
+    except ImportError:
+        from crews.section_summary_crew.section_summary_crew import SectionSummaryCrew
+
+    def summarize_section(section: str, number: int, count: Optional[int]) -> str:
+        output = cached_kickoff(
+            SectionSummaryCrew().crew(),
+            {"section": section, "section_number": number, "section_count": count or "?"},
+        )
+        return str(output.raw) if hasattr(output, "raw") else str(output)
+
+    return summarize_section
@@ -0,0 +1,293 @@
+"""
+Local tracing of the pipeline: spans with timing and resource usage.
+
+Spans wrap the flow stages, every chunk upload, LLM call and crew task, and
+the Gmail calls. Each records its wall time, process and thread CPU time and
+the process's peak RSS, plus what it moved (bytes uploaded, prompt and
+completion tokens). Spans opened inside another span, including on worker
+threads started with a copied context, join its trace.
+
+Finished spans are appended to a JSONL file (TELEMETRY_FILE, default
+``telemetry.jsonl`` under MEETING_MINUTES_CACHE_DIR), one OTLP/JSON
+ExportTraceServiceRequest per line: the format the OpenTelemetry Collector's
+file exporter writes and its ``otlpjson`` file receiver reads, so the file
+can be replayed into any OTel backend. Nothing is sent over the network. The
+file is rotated to ``.1`` past TELEMETRY_MAX_MB. TELEMETRY=0 turns it off.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from .disk_cache import get_cache_dir
+except ImportError:
+    from disk_cache import get_cache_dir
+
+SERVICE_NAME = "meeting-minutes"
+DEFAULT_MAX_MB = 20
+# Finished spans kept in memory for describe_trace
+RECENT_SPANS = 2000
+
+# OTLP enum values
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("meeting_minutes_span", default=None)
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def telemetry_enabled() -> bool:
+    """TELEMETRY: write spans to the local JSONL sink (default on)."""
+    return os.getenv("TELEMETRY", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class Span:
+    """One timed operation. Attributes may be set until it ends."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: str = "internal"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+    status: int = STATUS_OK
+    status_message: str = ""
+    _wall_start: float = field(default_factory=time.perf_counter, repr=False)
+    _cpu_start: float = field(default_factory=time.process_time, repr=False)
+    _thread_cpu_start: float = field(default_factory=time.thread_time, repr=False)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def add(self, key: str, amount: float) -> None:
+        """Add to a numeric attribute, e.g. bytes or tokens."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = time.time_ns()
+        self.attributes.setdefault("wall_time_s", round(time.perf_counter() - self._wall_start, 6))
+        self.attributes.setdefault("cpu_time_s", round(time.process_time() - self._cpu_start, 6))
+        self.attributes.setdefault("thread_cpu_time_s", round(time.thread_time() - self._thread_cpu_start, 6))
+        self.set_attribute("process.peak_rss_bytes", peak_rss_bytes())
+
+    @property
+    def wall_time(self) -> float:
+        return self.attributes.get("wall_time_s", 0.0)
+
+    def describe(self) -> str:
+        details = [f"{self.wall_time:.2f}s wall", f"{self.attributes.get('cpu_time_s', 0.0):.2f}s CPU"]
+        rss = self.attributes.get("process.peak_rss_bytes")
+        if rss:
+            details.append(f"peak RSS {rss / 1024 / 1024:.0f} MB")
+        if self.attributes.get("bytes_uploaded"):
+            details.append(f"{self.attributes['bytes_uploaded'] / 1024:.0f} KB uploaded")
+        tokens = self.attributes.get("llm.prompt_tokens", 0) + self.attributes.get("llm.completion_tokens", 0)
+        if tokens:
+            details.append(f"{tokens} tokens")
+        failed = f" FAILED ({self.status_message})" if self.status == STATUS_ERROR else ""
+        return f"{self.name}: {', '.join(details)}{failed}"
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # int64 values are strings in OTLP/JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[dict]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def to_otlp(span: Span, resource_attributes: Dict[str, Any]) -> dict:
+    """The span as an OTLP/JSON ExportTraceServiceRequest."""
+    otlp_span = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": SPAN_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(span.start_time_ns),
+        "endTimeUnixNano": str(span.end_time_ns or span.start_time_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": span.status, **({"message": span.status_message} if span.status_message else {})},
+    }
+    if span.parent_span_id:
+        otlp_span["parentSpanId"] = span.parent_span_id
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes(resource_attributes)},
+        "scopeSpans": [{"scope": {"name": "meeting_minutes"}, "spans": [otlp_span]}],
+    }]}
+
+
+class JsonlSpanSink:
+    """Appends spans to a JSONL file, rotating it to ``.1`` past ``max_bytes``."""
+
+    def __init__(self, path, max_bytes: Optional[int] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def export(self, record: dict) -> None:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self.max_bytes and self.path.exists() and self.path.stat().st_size + len(line) > self.max_bytes:
+                os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            with open(self.path, "a", encoding="utf-8") as sink_file:
+                sink_file.write(line)
+
+
+class Tracer:
+    """Creates spans and exports the finished ones to ``sink`` (None: keep them in memory only)."""
+
+    def __init__(self, sink: Optional[JsonlSpanSink] = None):
+        self.sink = sink
+        self.resource_attributes = {"service.name": SERVICE_NAME, "process.pid": os.getpid()}
+        self._finished: deque = deque(maxlen=RECENT_SPANS)
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, kind: str = "internal", **attributes) -> Span:
+        parent = _current_span.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent else None,
+            kind=kind,
+            attributes={key: value for key, value in attributes.items() if value is not None},
+        )
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes) -> Iterator[Span]:
+        """Time the block as a child of the current span."""
+        span = self.start_span(name, kind=kind, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(span)
+
+    def record_span(self, name: str, start_time_ns: int, end_time_ns: int, kind: str = "internal",
+                    **attributes) -> Span:
+        """Record an operation that was only observed after it ended (no CPU time or RSS)."""
+        span = self.start_span(name, kind=kind, **attributes)
+        span.start_time_ns, span.end_time_ns = start_time_ns, end_time_ns
+        span.attributes.setdefault("wall_time_s", round((end_time_ns - start_time_ns) / 1e9, 6))
+        self.finish(span)
+        return span
+
+    def finish(self, span: Span) -> None:
+        span.end()
+        with self._lock:
+            self._finished.append(span)
+        if self.sink is not None:
+            try:
+                self.sink.export(to_otlp(span, self.resource_attributes))
+            except OSError as e:
+                print(f"⚠️  Could not write span {span.name}: {e}")
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        """Recently finished spans, of one trace if given, in the order they ended."""
+        with self._lock:
+            return [span for span in self._finished if trace_id is None or span.trace_id == trace_id]
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer writing to TELEMETRY_FILE unless TELEMETRY is off."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            sink = None
+            if telemetry_enabled():
+                path = os.getenv("TELEMETRY_FILE") or get_cache_dir() / "telemetry.jsonl"
+                sink = JsonlSpanSink(path, max_bytes=int(_env_float("TELEMETRY_MAX_MB", DEFAULT_MAX_MB) * 1024 * 1024))
+            _tracer = Tracer(sink)
+        return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """Replace the process-wide tracer (None: rebuild from the environment). Returns the previous one."""
+    global _tracer
+    with _tracer_lock:
+        previous, _tracer = _tracer, tracer
+    return previous
+
+
+def span(name: str, kind: str = "internal", **attributes):
+    """Context manager timing a block as a span of the process-wide tracer."""
+    return get_tracer().span(name, kind=kind, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def traced(method):
+    """Run a function (e.g. a flow stage) in a span named after it."""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with span(method.__name__):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+def describe_trace(trace_id: str, limit: int = 8) -> List[str]:
+    """The slowest spans of a trace, slowest first, one line each."""
+    spans = sorted(get_tracer().spans(trace_id), key=lambda s: s.wall_time, reverse=True)
+    return [s.describe() for s in spans[:limit]]
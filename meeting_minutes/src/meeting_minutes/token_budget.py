@@ -0,0 +1,411 @@
+"""
+Token budgeting for the meeting minutes stage.
+
+Before the minutes crew runs, the prompt tokens of every task are estimated
+from the rendered YAML templates and the transcript. The estimate also gives
+the expected cost and latency. If the estimate exceeds LLM_TOKEN_BUDGET,
+LLM_BUDGET_POLICY decides what happens:
+- ``refuse``: raise TokenBudgetExceeded before any LLM call is made.
+- ``compress``: normalize the transcript (see transcript_normalizer) and
+  refuse if it still does not fit.
+- ``map_reduce`` (default): condense the transcript section by section (see
+  summarization) until the crew fits the budget.
+
+During the run, every LLM call made through CachedLLM is attributed to its
+task. After the run, the recorder reports prompt and completion tokens,
+calls and LLM time per task.
+
+Tokens are counted with tiktoken when it is installed, otherwise estimated
+at four characters per token.
+"""
+
+import contextvars
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    from .llm_cache import render_template
+    from .summarization import prepare_transcript
+    from .telemetry import get_tracer
+    from .transcript_normalizer import normalize_transcript
+except ImportError:
+    from llm_cache import render_template
+    from summarization import prepare_transcript
+    from telemetry import get_tracer
+    from transcript_normalizer import normalize_transcript
+
+CHARS_PER_TOKEN = 4
+
+# crewai wraps every task in a system prompt and output-format instructions
+TASK_PROMPT_OVERHEAD_TOKENS = 300
+# Completion length assumed for an analysis task and for the final writer task
+DEFAULT_COMPLETION_TOKENS = 500
+FINAL_COMPLETION_TOKENS = 1200
+
+# Throughput assumptions for latency estimates
+PROMPT_TOKENS_PER_SECOND = 5000
+COMPLETION_TOKENS_PER_SECOND = 60
+CALL_OVERHEAD_SECONDS = 0.5
+
+# USD per million (input, output) tokens; override with LLM_PRICE_INPUT_PER_MTOK / LLM_PRICE_OUTPUT_PER_MTOK
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+BUDGET_POLICIES = ("refuse", "compress", "map_reduce")
+
+_encodings: Dict[str, Any] = {}
+_encodings_lock = threading.Lock()
+# tiktoken module, or False if not installed; imported on the first count
+_tiktoken: Any = None
+
+
+def _load_tiktoken():
+    global _tiktoken
+    if _tiktoken is None:
+        try:
+            import tiktoken
+            _tiktoken = tiktoken
+        except ImportError:
+            _tiktoken = False
+    return _tiktoken or None
+
+
+def _encoding(model: Optional[str]):
+    name = (model or "gpt-4o-mini").split("/")[-1]
+    tiktoken = _load_tiktoken()
+    with _encodings_lock:
+        if name not in _encodings:
+            try:
+                _encodings[name] = tiktoken.encoding_for_model(name)
+            except KeyError:
+                _encodings[name] = tiktoken.get_encoding("o200k_base")
+        return _encodings[name]
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Tokens in ``text`` for ``model`` (tiktoken if installed, else an estimate)."""
+    if not text:
+        return 0
+    if _load_tiktoken() is not None:
+        return len(_encoding(model).encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def count_message_tokens(messages, model: Optional[str] = None) -> int:
+    """Tokens in a chat prompt (a string or a list of ``{"role", "content"}`` dicts)."""
+    if isinstance(messages, str):
+        return count_tokens(messages, model)
+    # ~4 tokens of framing per message
+    return sum(count_tokens(str(message.get("content") or ""), model) + 4 for message in messages)
+
+
+class TokenBudgetExceeded(Exception):
+    """The minutes stage would use more prompt tokens than LLM_TOKEN_BUDGET allows."""
+
+    def __init__(self, estimate: "CrewEstimate", budget: int):
+        super().__init__(
+            f"Meeting minutes need ~{estimate.prompt_tokens} prompt tokens, over the budget of {budget} "
+            f"(set LLM_BUDGET_POLICY=map_reduce or raise LLM_TOKEN_BUDGET)"
+        )
+        self.estimate = estimate
+        self.budget = budget
+
+
+@dataclass
+class TaskEstimate:
+    """Expected size of one task's LLM call."""
+
+    name: str
+    prompt_tokens: int
+    completion_tokens: int
+    parallel: bool = False
+
+
+@dataclass
+class CrewEstimate:
+    """Pre-flight token, cost and latency estimate for a crew run."""
+
+    model: str
+    tasks: List[TaskEstimate]
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(task.prompt_tokens for task in self.tasks)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(task.completion_tokens for task in self.tasks)
+
+    @property
+    def cost(self) -> Optional[float]:
+        """Estimated USD cost, or None if the model's price is unknown."""
+        prices = model_prices(self.model)
+        if prices is None:
+            return None
+        return (self.prompt_tokens * prices[0] + self.completion_tokens * prices[1]) / 1_000_000
+
+    @property
+    def latency(self) -> float:
+        """Estimated seconds: parallel tasks overlap, the others run one after another."""
+        def seconds(task):
+            return (CALL_OVERHEAD_SECONDS + task.prompt_tokens / PROMPT_TOKENS_PER_SECOND
+                    + task.completion_tokens / COMPLETION_TOKENS_PER_SECOND)
+
+        parallel = [seconds(task) for task in self.tasks if task.parallel]
+        return max(parallel, default=0.0) + sum(seconds(task) for task in self.tasks if not task.parallel)
+
+    def describe(self) -> str:
+        cost = f"${self.cost:.3f}" if self.cost is not None else "unknown cost"
+        return (
+            f"~{self.prompt_tokens} prompt + ~{self.completion_tokens} completion tokens on {self.model} "
+            f"across {len(self.tasks)} task(s), {cost}, ~{self.latency:.0f}s"
+        )
+
+
+def model_prices(model: str) -> Optional[tuple]:
+    """(input, output) USD per million tokens for ``model``."""
+    override = (os.getenv("LLM_PRICE_INPUT_PER_MTOK"), os.getenv("LLM_PRICE_OUTPUT_PER_MTOK"))
+    if all(override):
+        try:
+            return float(override[0]), float(override[1])
+        except ValueError:
+            print("⚠️  Invalid LLM_PRICE_*_PER_MTOK, using the built-in price table")
+    name = model.split("/")[-1]
+    # Longest prefix first so "gpt-4o-mini-2024-07-18" is not priced as "gpt-4o"
+    for prefix in sorted(MODEL_PRICES, key=len, reverse=True):
+        if name.startswith(prefix):
+            return MODEL_PRICES[prefix]
+    return None
+
+
+def _model_name(crew) -> str:
+    for agent in crew.agents:
+        model = getattr(getattr(agent, "llm", None), "model", None)
+        if model:
+            return str(model)
+    return os.getenv("MODEL") or os.getenv("OPENAI_MODEL_NAME") or "gpt-4o-mini"
+
+
+def estimate_crew_tokens(crew, inputs: Dict[str, Any]) -> CrewEstimate:
+    """Estimate each task's prompt from its rendered templates, agent and context."""
+    model = _model_name(crew)
+    estimates: Dict[int, TaskEstimate] = {}
+    for position, task in enumerate(crew.tasks):
+        agent = task.agent
+        prompt = "\n".join(
+            render_template(text, inputs) for text in (
+                getattr(agent, "role", ""), getattr(agent, "goal", ""), getattr(agent, "backstory", ""),
+                task.description, task.expected_output,
+            )
+        )
+        context_tokens = sum(
+            estimates[id(context)].completion_tokens
+            for context in (getattr(task, "context", None) or []) if id(context) in estimates
+        )
+        is_last = position == len(crew.tasks) - 1
+        estimates[id(task)] = TaskEstimate(
+            name=getattr(task, "name", None) or f"task {position + 1}",
+            prompt_tokens=count_tokens(prompt, model) + context_tokens + TASK_PROMPT_OVERHEAD_TOKENS,
+            completion_tokens=FINAL_COMPLETION_TOKENS if is_last else DEFAULT_COMPLETION_TOKENS,
+            parallel=bool(getattr(task, "async_execution", False)),
+        )
+    return CrewEstimate(model=model, tasks=list(estimates.values()))
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def get_budget_policy() -> str:
+    """LLM_BUDGET_POLICY: ``map_reduce`` (default), ``compress`` or ``refuse``."""
+    policy = (os.getenv("LLM_BUDGET_POLICY") or "map_reduce").strip().lower()
+    if policy not in BUDGET_POLICIES:
+        print(f"⚠️  Invalid LLM_BUDGET_POLICY={policy!r}, using map_reduce")
+        return "map_reduce"
+    return policy
+
+
+def budget_transcript(transcript: str, crew, budget: Optional[int] = None, policy: Optional[str] = None,
+                      summarize_section=None):
+    """Fit the minutes crew's input to the token budget.
+
+    Args:
+        transcript: Full meeting transcript.
+        crew: The crew that will run (its templates are rendered for the estimate).
+        budget: Prompt token budget for the crew. Defaults to LLM_TOKEN_BUDGET;
+            0 means unlimited.
+        policy: What to do over budget. Defaults to LLM_BUDGET_POLICY.
+        summarize_section: Section summarizer for map-reduce (see
+            summarization.prepare_transcript).
+
+    Returns:
+        ``(reduction, estimate)``: the SummaryReduction whose text becomes
+        ``{transcript}``, and the estimate for running the crew on it.
+
+    Raises:
+        TokenBudgetExceeded: The policy is ``refuse``, or the input cannot be
+            compressed or condensed enough.
+    """
+    if budget is None:
+        budget = _env_int("LLM_TOKEN_BUDGET", 0)
+    policy = policy or get_budget_policy()
+
+    reduction = prepare_transcript(transcript, summarize_section)
+    estimate = estimate_crew_tokens(crew, {"transcript": reduction.text})
+    if not budget or estimate.prompt_tokens <= budget:
+        return reduction, estimate
+    if policy == "refuse":
+        raise TokenBudgetExceeded(estimate, budget)
+    if policy == "compress":
+        # Normalizing an already normalized transcript is a no-op
+        reduction = prepare_transcript(normalize_transcript(transcript).text, summarize_section)
+        estimate = estimate_crew_tokens(crew, {"transcript": reduction.text})
+        if estimate.prompt_tokens > budget:
+            raise TokenBudgetExceeded(estimate, budget)
+        return reduction, estimate
+
+    # The transcript is repeated in every task prompt that references it
+    fixed = estimate_crew_tokens(crew, {"transcript": ""}).prompt_tokens
+    copies = sum("{transcript}" in (task.description or "") for task in crew.tasks) or 1
+    allowance = (budget - fixed) // copies
+    if allowance > 0:
+        reduction = prepare_transcript(
+            transcript, summarize_section, mode="map_reduce", max_transcript_tokens=allowance
+        )
+        estimate = estimate_crew_tokens(crew, {"transcript": reduction.text})
+    if estimate.prompt_tokens > budget:
+        raise TokenBudgetExceeded(estimate, budget)
+    return reduction, estimate
+
+
+@dataclass
+class TaskUsage:
+    """Tokens and time actually spent by one task."""
+
+    name: str
+    calls: int = 0
+    cached_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_seconds: float = 0.0
+    finished_after: Optional[float] = None
+    # Wall clock start of the task's first LLM call
+    first_call_ns: Optional[int] = None
+
+
+@dataclass
+class UsageRecorder:
+    """Collects per-task LLM usage for a crew run.
+
+    LLM calls are reported by CachedLLM; task completions by the crew's
+    ``task_callback`` (see instrument_crew). Each completed task is recorded
+    as a ``crew_task`` span from its first LLM call to its completion; the
+    analyses run in parallel, so the previous task's end says nothing about
+    when a task started. A task that made no LLM call gets a zero-length span
+    at its completion, marked ``start_unknown``.
+    """
+
+    tasks: Dict[str, TaskUsage] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _task(self, name: str) -> TaskUsage:
+        if name not in self.tasks:
+            self.tasks[name] = TaskUsage(name=name)
+        return self.tasks[name]
+
+    def record_call(self, task_name: str, prompt_tokens: int, completion_tokens: int,
+                    elapsed: float, cached: bool = False) -> None:
+        call_start_ns = time.time_ns() - int(elapsed * 1e9)
+        with self._lock:
+            usage = self._task(task_name)
+            if usage.first_call_ns is None or call_start_ns < usage.first_call_ns:
+                usage.first_call_ns = call_start_ns
+            usage.calls += 1
+            usage.cached_calls += int(cached)
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            usage.llm_seconds += elapsed
+
+    def on_task_complete(self, task_output) -> None:
+        name = getattr(task_output, "name", None) or str(getattr(task_output, "description", "task"))[:40]
+        now_ns = time.time_ns()
+        with self._lock:
+            usage = self._task(name)
+            usage.finished_after = time.perf_counter() - self.started
+            started_ns = usage.first_call_ns
+        get_tracer().record_span(
+            "crew_task", started_ns or now_ns, now_ns, task=name, llm_calls=usage.calls,
+            cached_calls=usage.cached_calls, start_unknown=True if started_ns is None else None,
+            **{"llm.prompt_tokens": usage.prompt_tokens, "llm.completion_tokens": usage.completion_tokens},
+        )
+
+    def describe(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{usage.name}: {usage.prompt_tokens} prompt + {usage.completion_tokens} completion tokens, "
+                f"{usage.calls} call(s) ({usage.cached_calls} cached), {usage.llm_seconds:.1f}s in LLM"
+                + (f", done after {usage.finished_after:.1f}s" if usage.finished_after is not None else "")
+                for usage in self.tasks.values()
+            ]
+
+
+# Recorder of the crew run started in this context (each Streamlit session and
+# flow run has its own), as telemetry keeps the current span
+_current_recorder: "contextvars.ContextVar[Optional[UsageRecorder]]" = contextvars.ContextVar(
+    "meeting_minutes_usage_recorder", default=None)
+# Recorder of each instrumented task, by id: crewai runs async tasks on threads
+# that do not inherit the context
+_task_recorders: "weakref.WeakValueDictionary[int, UsageRecorder]" = weakref.WeakValueDictionary()
+
+
+def get_usage_recorder(task=None) -> Optional[UsageRecorder]:
+    """Recorder of ``task``'s crew run, else of the crew run started in this context, if any."""
+    if task is not None:
+        recorder = _task_recorders.get(id(task))
+        if recorder is not None:
+            return recorder
+    return _current_recorder.get()
+
+
+def instrument_crew(crew) -> UsageRecorder:
+    """Start recording per-task usage for ``crew``'s next kickoff."""
+    recorder = UsageRecorder()
+    _current_recorder.set(recorder)
+    for task in getattr(crew, "tasks", None) or []:
+        _task_recorders[id(task)] = recorder
+    previous = getattr(crew, "task_callback", None)
+
+    def task_callback(task_output):
+        recorder.on_task_complete(task_output)
+        if previous:
+            previous(task_output)
+
+    crew.task_callback = task_callback
+    return recorder
+
+
+def describe_token_usage(output) -> Optional[str]:
+    """Provider-reported totals from a CrewOutput's ``token_usage``."""
+    usage = getattr(output, "token_usage", None)
+    if not usage:
+        return None
+    get = usage.get if isinstance(usage, dict) else lambda name: getattr(usage, name, 0)
+    return (
+        f"Provider usage: {get('prompt_tokens')} prompt + {get('completion_tokens')} completion tokens "
+        f"in {get('successful_requests')} request(s)"
+    )
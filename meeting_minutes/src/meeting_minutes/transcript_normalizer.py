@@ -0,0 +1,230 @@
+"""
+Deterministic clean-up of raw transcripts before the LLM stage.
+
+Whisper output is verbatim: fillers ("um", "you know"), false starts that
+repeat a word or phrase ("we we", "I think, I think") and, where chunks
+overlap, the same words at the end of one chunk and the start of the next.
+None of it carries meaning for the minutes, but every copy of the transcript
+in a task prompt pays for it. The normalizer removes it with plain string
+rules (no LLM call), so the same transcript always normalizes to the same
+text and the LLM cache keeps working.
+
+The original transcript is kept alongside the normalized one for display.
+Set TRANSCRIPT_NORMALIZE=0 to send the raw transcript to the LLM.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+try:
+    from .summarization import estimate_tokens
+except ImportError:
+    from summarization import estimate_tokens
+
+# Single-word fillers, dropped wherever they appear
+FILLER_WORDS = frozenset({"um", "umm", "uh", "uhh", "uhm", "er", "erm", "hmm", "hm", "mm", "mmm"})
+# Multi-word fillers, dropped only when set off by commas or starting a sentence,
+# so "do you know the date" and "what I mean is" are left alone
+FILLER_PHRASES = (("you", "know"), ("i", "mean"), ("like",))
+
+# Longest phrase checked for immediate repetition ("I think I think")
+MAX_REPEAT_WORDS = 4
+# Doubled words that are usually grammatical ("had had", "that that")
+ALLOWED_DOUBLES = frozenset({"had", "that"})
+
+# Overlap between the end of one chunk and the start of the next that is
+# treated as a duplicate; shorter matches are likely coincidence
+SEAM_MIN_WORDS = 3
+SEAM_MAX_WORDS = 25
+
+_SENTENCE_END = (".", "!", "?")
+
+
+def normalization_enabled() -> bool:
+    """TRANSCRIPT_NORMALIZE: clean the transcript before the LLM stage (default on)."""
+    return os.getenv("TRANSCRIPT_NORMALIZE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+@dataclass
+class NormalizedTranscript:
+    """Normalized transcript, the original it came from and what was removed."""
+
+    text: str
+    original: str
+    fillers_removed: int = 0
+    repeats_collapsed: int = 0
+    seam_words_removed: int = 0
+
+    @property
+    def original_tokens(self) -> int:
+        return estimate_tokens(self.original)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    @property
+    def reduction_ratio(self) -> float:
+        """Fraction of the original tokens removed."""
+        if not self.original_tokens:
+            return 0.0
+        return 1 - self.tokens / self.original_tokens
+
+    def describe(self) -> str:
+        return (
+            f"~{self.original_tokens} -> ~{self.tokens} tokens ({self.reduction_ratio:.0%} smaller): "
+            f"{self.fillers_removed} filler(s), {self.repeats_collapsed} repetition(s), "
+            f"{self.seam_words_removed} duplicated word(s) at chunk seams"
+        )
+
+
+def _core(word: str) -> str:
+    """Lowercase word without surrounding punctuation, for comparisons."""
+    return word.strip(".,;:!?\"'()[]-…").lower()
+
+
+def _starts_sentence(words: List[str], index: int) -> bool:
+    return index == 0 or words[index - 1].endswith(_SENTENCE_END)
+
+
+def _capitalize(word: str) -> str:
+    return word[:1].upper() + word[1:]
+
+
+def append_chunk(words: List[str], text: str) -> int:
+    """Append a chunk's words to ``words``, dropping those that repeat its end.
+
+    Only the last SEAM_MAX_WORDS of ``words`` are looked at (and only the
+    very last one may change), so words before them are final. Returns the
+    number of words dropped.
+    """
+    chunk = (text or "").split()
+    longest = min(SEAM_MAX_WORDS, len(words), len(chunk))
+    for size in range(longest, SEAM_MIN_WORDS - 1, -1):
+        if [_core(w) for w in words[-size:]] == [_core(w) for w in chunk[:size]]:
+            # Keep the second copy's ending: it has the punctuation of the continued sentence
+            words[-1] = chunk[size - 1]
+            words.extend(chunk[size:])
+            return size
+    words.extend(chunk)
+    return 0
+
+
+def merge_chunk_seams(chunk_texts: Sequence[str]):
+    """Join chunk transcriptions, dropping words repeated across each seam.
+
+    Returns ``(words, removed)``: the joined words and how many were dropped.
+    """
+    words: List[str] = []
+    removed = sum(append_chunk(words, text) for text in chunk_texts)
+    return words, removed
+
+
+def _filler_length(words: List[str], index: int) -> int:
+    """Number of words of the filler starting at ``index`` (0 if none)."""
+    if _core(words[index]) in FILLER_WORDS:
+        return 1
+    set_off = _starts_sentence(words, index) or words[index - 1].endswith(",")
+    if not set_off:
+        return 0
+    for phrase in FILLER_PHRASES:
+        end = index + len(phrase)
+        if (end <= len(words) and [_core(w) for w in words[index:end]] == list(phrase)
+                and words[end - 1].endswith(",")):
+            return len(phrase)
+    return 0
+
+
+def remove_fillers(words: List[str]):
+    """Drop fillers, keeping sentence punctuation and capitalization. Returns ``(words, removed)``."""
+    kept: List[str] = []
+    removed = 0
+    capitalize_next = False
+    index = 0
+    while index < len(words):
+        length = _filler_length(words, index)
+        if not length:
+            word = _capitalize(words[index]) if capitalize_next else words[index]
+            kept.append(word)
+            capitalize_next = False
+            index += 1
+            continue
+        last = words[index + length - 1]
+        if _starts_sentence(words, index) and not last.endswith(_SENTENCE_END):
+            capitalize_next = True
+        if last.endswith(_SENTENCE_END) and kept and not kept[-1].endswith(_SENTENCE_END):
+            # "we agreed, um." -> "we agreed."
+            kept[-1] = kept[-1].rstrip(",;:") + last[-1]
+        elif _core(words[index]) not in FILLER_WORDS and kept and kept[-1].endswith(","):
+            # "grew, you know, fast" -> "grew fast"
+            kept[-1] = kept[-1][:-1]
+        removed += 1
+        index += length
+    return kept, removed
+
+
+def collapse_repetitions(words: List[str]):
+    """Collapse immediately repeated words and short phrases. Returns ``(words, collapsed)``."""
+    kept: List[str] = []
+    collapsed = 0
+    index = 0
+    while index < len(words):
+        for size in range(MAX_REPEAT_WORDS, 0, -1):
+            first = words[index:index + size]
+            second = words[index + size:index + 2 * size]
+            if len(second) < size or first[-1].endswith(_SENTENCE_END):
+                continue
+            cores = [_core(w) for w in first]
+            if not all(cores) or cores != [_core(w) for w in second]:
+                continue
+            if size == 1 and cores[0] in ALLOWED_DOUBLES:
+                continue
+            # Drop the false start; the second copy continues the sentence
+            if _starts_sentence(words, index):
+                words[index + size] = _capitalize(words[index + size])
+            collapsed += 1
+            index += size
+            break
+        else:
+            kept.append(words[index])
+            index += 1
+    return kept, collapsed
+
+
+def _chunk_texts(transcript: Union[str, Sequence[str]]) -> List[str]:
+    return [transcript] if isinstance(transcript, str) else list(transcript)
+
+
+def _join(chunk_texts: Sequence[str]) -> str:
+    return " ".join(text.strip() for text in chunk_texts if text and text.strip())
+
+
+def normalize_transcript(transcript: Union[str, Sequence[str]]) -> NormalizedTranscript:
+    """Normalize a transcript, or a list of chunk transcriptions in order.
+
+    Passing the chunks lets duplicates at chunk seams be merged; the
+    original is then the chunks joined as TranscriptionResult.text joins them.
+    """
+    chunk_texts = _chunk_texts(transcript)
+    words, seam_words = merge_chunk_seams(chunk_texts)
+    words, fillers = remove_fillers(words)
+    words, repeats = collapse_repetitions(words)
+    return NormalizedTranscript(
+        text=" ".join(words),
+        original=_join(chunk_texts),
+        fillers_removed=fillers,
+        repeats_collapsed=repeats,
+        seam_words_removed=seam_words,
+    )
+
+
+def prepare_llm_transcript(transcript: Union[str, Sequence[str]],
+                           enabled: Optional[bool] = None) -> NormalizedTranscript:
+    """Normalize for the LLM stage unless TRANSCRIPT_NORMALIZE is off."""
+    if enabled is None:
+        enabled = normalization_enabled()
+    if enabled:
+        return normalize_transcript(transcript)
+    original = _join(_chunk_texts(transcript))
+    return NormalizedTranscript(text=original, original=original)
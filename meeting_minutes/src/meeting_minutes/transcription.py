@@ -0,0 +1,339 @@
+"""
+Concurrent chunk transcription engine.
+
+Uploads audio chunks to the transcription API from a bounded worker pool and
+puts the transcript back together in chunk order. Used by both the CLI flow
+(main.py) and the Streamlit app.
+"""
+
+import contextvars
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+try:
+    from .chunk_encoding import encode_chunk, encoded_size, get_encoding_profile
+    from .disk_cache import DiskCache, get_cache_dir
+    from .rate_limiter import RequestScheduler, get_scheduler
+    from .telemetry import span
+    from .transcription_backends import OpenAIBackend, TranscriptionBackend, get_transcription_backend
+    from .transcription_journal import TranscriptionJournal, journaling_enabled
+except ImportError:
+    from chunk_encoding import encode_chunk, encoded_size, get_encoding_profile
+    from disk_cache import DiskCache, get_cache_dir
+    from rate_limiter import RequestScheduler, get_scheduler
+    from telemetry import span
+    from transcription_backends import OpenAIBackend, TranscriptionBackend, get_transcription_backend
+    from transcription_journal import TranscriptionJournal, journaling_enabled
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_CACHE_MAX_MB = 100
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_max_workers(default: int = DEFAULT_MAX_WORKERS) -> int:
+    """Read the worker pool size from TRANSCRIPTION_MAX_WORKERS."""
+    value = os.getenv("TRANSCRIPTION_MAX_WORKERS")
+    if not value:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        print(f"⚠️  Invalid TRANSCRIPTION_MAX_WORKERS={value!r}, using {default}")
+        return default
+
+
+def max_chunks_in_flight(max_workers: Optional[int] = None) -> int:
+    """Chunks transcribe_chunks holds in memory at once: two per upload worker."""
+    if max_workers is None:
+        max_workers = get_max_workers()
+    return max(1, max_workers) * 2
+
+
+@dataclass
+class ChunkResult:
+    """Transcription of a single audio chunk."""
+
+    index: int
+    text: str
+    elapsed: float = 0.0
+    bytes_uploaded: int = 0
+    cached: bool = False
+    offset_ms: Optional[int] = None
+    resumed: bool = False
+
+
+@dataclass
+class TranscriptionResult:
+    """Ordered chunk transcriptions plus timing for the whole run."""
+
+    chunks: List[ChunkResult] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def text(self) -> str:
+        """Full transcript with chunks joined in order."""
+        return " ".join(c.text.strip() for c in self.chunks if c.text and c.text.strip())
+
+    @property
+    def bytes_uploaded(self) -> int:
+        """Total encoded audio bytes sent to the API."""
+        return sum(c.bytes_uploaded for c in self.chunks)
+
+    @property
+    def cached_chunks(self) -> int:
+        """Number of chunks served from the transcription cache."""
+        return sum(1 for c in self.chunks if c.cached)
+
+    @property
+    def resumed_chunks(self) -> int:
+        """Number of chunks taken from the journal of an earlier run."""
+        return sum(1 for c in self.chunks if c.resumed)
+
+
+ProgressCallback = Callable[[ChunkResult, int, Optional[int]], None]
+
+
+def _journal_result(entry: dict) -> ChunkResult:
+    return ChunkResult(index=entry["index"], text=entry["text"], offset_ms=entry.get("offset_ms"), resumed=True)
+
+
+def transcribe_chunks(
+    chunks: Iterable[Any],
+    transcribe_chunk: Callable[[int, Any], Union[str, ChunkResult]],
+    max_workers: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    journal: Optional[TranscriptionJournal] = None,
+) -> TranscriptionResult:
+    """Transcribe chunks concurrently and return them in chunk order.
+
+    Args:
+        chunks: Iterable of audio chunks. It is consumed lazily, so at most
+            ``2 * max_workers`` chunks are held in memory at any time. If it
+            has a ``chunk_offset_ms(index)`` method, chunk offsets are
+            recorded on the results.
+        transcribe_chunk: Callable ``(index, chunk) -> text`` run on a worker
+            thread for every chunk. It may return a ChunkResult instead of
+            plain text to report extra details such as bytes uploaded.
+        max_workers: Number of concurrent uploads. Defaults to
+            TRANSCRIPTION_MAX_WORKERS or DEFAULT_MAX_WORKERS.
+        on_progress: Optional callable ``(result, completed, total)`` invoked
+            on the calling thread as each chunk finishes (completion order,
+            not chunk order). ``total`` is None when the chunk count is unknown.
+        journal: Optional TranscriptionJournal. Chunks already recorded in it
+            are not transcribed again, and every newly finished chunk is
+            recorded as soon as it completes.
+
+    Returns:
+        TranscriptionResult with one ChunkResult per chunk, sorted by index.
+
+    Raises:
+        Whatever ``transcribe_chunk`` raised for the first failing chunk.
+        No new chunks are started after a failure, but chunks already in
+        flight are allowed to finish so the journal keeps their results.
+    """
+    started = time.perf_counter()
+    if journal is not None and journal.is_complete:
+        results = [_journal_result(entry) for entry in journal.entries()]
+        return TranscriptionResult(chunks=results, wall_time=time.perf_counter() - started)
+
+    if max_workers is None:
+        max_workers = get_max_workers()
+    max_workers = max(1, max_workers)
+    max_in_flight = max_chunks_in_flight(max_workers)
+
+    try:
+        total = len(chunks)  # type: ignore[arg-type]
+    except TypeError:
+        total = None
+
+    finished = journal.completed() if journal is not None else {}
+    chunk_offset_ms = getattr(chunks, "chunk_offset_ms", None)
+
+    def run(index: int, chunk: Any, offset_ms: Optional[int]) -> ChunkResult:
+        with span("transcribe_chunk", kind="client", chunk_index=index, chunk_offset_ms=offset_ms) as chunk_span:
+            started = time.perf_counter()
+            outcome = transcribe_chunk(index, chunk)
+            if not isinstance(outcome, ChunkResult):
+                outcome = ChunkResult(index=index, text=outcome or "")
+            outcome.elapsed = time.perf_counter() - started
+            outcome.offset_ms = offset_ms
+            chunk_span.set_attribute("bytes_uploaded", outcome.bytes_uploaded)
+            chunk_span.set_attribute("cached", outcome.cached)
+        return outcome
+
+    results: List[ChunkResult] = []
+    errors: List[BaseException] = []
+
+    def complete(result: ChunkResult) -> None:
+        results.append(result)
+        if on_progress:
+            on_progress(result, len(results), total)
+
+    chunk_iter = iter(enumerate(chunks))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcribe") as executor:
+        pending = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and not errors and len(pending) < max_in_flight:
+                    try:
+                        index, chunk = next(chunk_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    if index in finished:
+                        complete(_journal_result(finished[index]))
+                        continue
+                    offset_ms = chunk_offset_ms(index) if chunk_offset_ms else None
+                    # Each worker runs in a copy of this context, so chunk spans join the caller's trace
+                    pending.add(executor.submit(contextvars.copy_context().run, run, index, chunk, offset_ms))
+
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    if journal is not None:
+                        journal.record(result.index, result.text, result.offset_ms)
+                    complete(result)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    if errors:
+        if journal is not None:
+            print(f"⚠️  {len(errors)} chunk(s) failed; {len(results)} finished chunks kept in {journal.path}")
+        raise errors[0]
+
+    if journal is not None:
+        journal.mark_complete(len(results))
+
+    results.sort(key=lambda r: r.index)
+    return TranscriptionResult(chunks=results, wall_time=time.perf_counter() - started)
+
+
+def get_transcription_cache() -> Optional[DiskCache]:
+    """Process-wide transcription cache, or None if TRANSCRIPTION_CACHE is off.
+
+    Stored in ``transcriptions.sqlite3`` under MEETING_MINUTES_CACHE_DIR and
+    limited to TRANSCRIPTION_CACHE_MAX_MB of transcript text.
+    """
+    global _cache
+    if os.getenv("TRANSCRIPTION_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                max_mb = float(os.getenv("TRANSCRIPTION_CACHE_MAX_MB") or DEFAULT_CACHE_MAX_MB)
+            except ValueError:
+                max_mb = DEFAULT_CACHE_MAX_MB
+            _cache = DiskCache(get_cache_dir() / "transcriptions.sqlite3", max_bytes=int(max_mb * 1024 * 1024))
+        return _cache
+
+
+def transcription_cache_key(audio_file, model: str, profile_name: str) -> str:
+    """Hash of the encoded chunk bytes plus the parameters that affect the transcript.
+
+    Reads ``audio_file`` in blocks and leaves it rewound.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{model}\0{profile_name}\0".encode("utf-8"))
+    audio_file.seek(0)
+    for block in iter(lambda: audio_file.read(1024 * 1024), b""):
+        digest.update(block)
+    audio_file.seek(0)
+    return digest.hexdigest()
+
+
+def open_transcription_journal(audio_path: str, chunks, model: str = "whisper-1", profile=None,
+                               backend: Optional[TranscriptionBackend] = None) -> Optional[TranscriptionJournal]:
+    """Journal for transcribing ``audio_path`` split by ``chunks``, or None if TRANSCRIPTION_JOURNAL is off.
+
+    The run id covers the recording content plus everything that changes how
+    it is chunked and transcribed, so a rerun only resumes a compatible run.
+    """
+    if not journaling_enabled():
+        return None
+    if backend is None:
+        backend = get_transcription_backend()
+    return TranscriptionJournal.for_recording(
+        audio_path,
+        chunker=type(chunks).__name__,
+        chunk_length_ms=getattr(chunks, "chunk_length_ms", None),
+        silence_threshold_db=getattr(chunks, "silence_threshold_db", None),
+        profile=get_encoding_profile(profile).name,
+        model=backend.cache_model(model),
+    )
+
+
+def chunk_transcriber(backend: Optional[TranscriptionBackend] = None, model: str = "whisper-1",
+                      spill_dir: Optional[str] = None, profile=None, cache: Optional[DiskCache] = None,
+                      scheduler: Optional[RequestScheduler] = None):
+    """Build a ``transcribe_chunk`` callable that sends chunks to a transcription backend.
+
+    Chunks are encoded into in-memory buffers (see chunk_encoding) and handed
+    straight to the backend without touching the working directory. Chunks
+    whose encoded audio was transcribed before are answered from the cache.
+    Requests go through the shared request scheduler, which enforces the API
+    rate limit and retries throttled or failed requests.
+
+    Args:
+        backend: Transcription backend. Defaults to get_transcription_backend()
+            (TRANSCRIPTION_BACKEND, OpenAI Whisper unless configured).
+        model: Transcription model name.
+        spill_dir: Directory used only for chunks too large to keep in memory.
+        profile: Encoding profile name or EncodingProfile. Defaults to
+            TRANSCRIPTION_ENCODING_PROFILE or the 16 kHz mono FLAC profile
+            (WAV when ffmpeg is not installed).
+        cache: Transcription cache. Defaults to get_transcription_cache().
+        scheduler: Request scheduler. Defaults to get_scheduler().
+    """
+    if backend is None:
+        backend = get_transcription_backend()
+    profile = get_encoding_profile(profile)
+    if cache is None:
+        cache = get_transcription_cache()
+    if scheduler is None:
+        scheduler = get_scheduler()
+    cache_model = backend.cache_model(model)
+
+    def transcribe_chunk(index: int, chunk) -> ChunkResult:
+        with encode_chunk(chunk, profile=profile, spill_dir=spill_dir) as audio_file:
+            key = transcription_cache_key(audio_file, cache_model, profile.name) if cache else None
+            if key:
+                text = cache.get(key)
+                if text is not None:
+                    return ChunkResult(index=index, text=text, cached=True)
+
+            size = encoded_size(audio_file)
+
+            def upload():
+                # Retries send the buffer again from the start
+                audio_file.seek(0)
+                return backend.transcribe(audio_file, f"chunk_{index}.{profile.extension}", model)
+
+            text = scheduler.call(upload)
+        if key:
+            cache.set(key, text)
+        return ChunkResult(index=index, text=text, bytes_uploaded=size)
+
+    return transcribe_chunk
+
+
+def whisper_chunk_transcriber(client, model: str = "whisper-1", **kwargs):
+    """chunk_transcriber for an existing OpenAI client."""
+    return chunk_transcriber(OpenAIBackend(client), model=model, **kwargs)
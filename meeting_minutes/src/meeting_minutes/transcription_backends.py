@@ -0,0 +1,166 @@
+"""
+Pluggable transcription backends.
+
+The pipeline talks to a TranscriptionBackend instead of an OpenAI client, so
+the same code path can run against Whisper or against a local stand-in. The
+stand-in returns deterministic text derived from the uploaded bytes after a
+configurable latency and fails a configurable fraction of requests, which
+makes it possible to benchmark and load-test chunking, encoding, scheduling
+and retries on an offline machine.
+
+Selected with TRANSCRIPTION_BACKEND:
+- ``openai`` (default): OpenAI Whisper. Honors OPENAI_BASE_URL, so it can also
+  be pointed at the stand-in HTTP server in benchmarks/.
+- ``local``: in-process stand-in configured by LOCAL_TRANSCRIPTION_LATENCY_MS,
+  LOCAL_TRANSCRIPTION_JITTER_MS, LOCAL_TRANSCRIPTION_ERROR_RATE and
+  LOCAL_TRANSCRIPTION_THROTTLE_RATE.
+"""
+
+import abc
+import hashlib
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+STUB_VOCABULARY = (
+    "revenue", "quarter", "growth", "margin", "customers", "pipeline", "guidance", "product",
+    "launch", "costs", "hiring", "forecast", "team", "market", "results", "strategy",
+    "we", "expect", "the", "next", "year", "to", "improve", "our", "strong", "demand",
+)
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def stub_transcript(data: bytes, words: int = 12) -> str:
+    """Deterministic pseudo-transcript for ``data``: same bytes, same text."""
+    digest = hashlib.sha256(data).digest()
+    return " ".join(STUB_VOCABULARY[digest[i % len(digest)] % len(STUB_VOCABULARY)] for i in range(words)) + "."
+
+
+class StubAPIError(Exception):
+    """Failure raised by the stand-in backend, shaped like openai.APIStatusError."""
+
+    def __init__(self, status_code: int, headers: Optional[dict] = None):
+        super().__init__(f"Stand-in transcription backend returned HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class TranscriptionBackend(abc.ABC):
+    """Turns one encoded audio file into text."""
+
+    name = "base"
+
+    @abc.abstractmethod
+    def transcribe(self, audio_file, filename: str, model: str) -> str:
+        """Transcribe ``audio_file`` (a rewound binary file object) named ``filename``."""
+
+    def cache_model(self, model: str) -> str:
+        """Model identity used in cache keys and journal run ids.
+
+        Keeps transcripts from different backends from being mixed up.
+        """
+        return model if self.name == "openai" else f"{self.name}:{model}"
+
+
+class OpenAIBackend(TranscriptionBackend):
+    """OpenAI Whisper over the official client.
+
+    Args:
+        client: OpenAI client. Created on first use if omitted, with the
+            client's own retries disabled because the request scheduler
+            (see rate_limiter) retries instead.
+    """
+
+    name = "openai"
+
+    def __init__(self, client=None):
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from openai import OpenAI
+                self._client = OpenAI(max_retries=0)
+            return self._client
+
+    def transcribe(self, audio_file, filename: str, model: str) -> str:
+        transcription = self.client.audio.transcriptions.create(model=model, file=(filename, audio_file))
+        return transcription.text
+
+
+class LocalBackend(TranscriptionBackend):
+    """Offline stand-in that sleeps, sometimes fails, and returns deterministic text.
+
+    Args:
+        latency_ms: Time each request takes.
+        jitter_ms: Extra random latency, uniform in ``[0, jitter_ms]``.
+        error_rate: Fraction of requests failing with a 503.
+        throttle_rate: Fraction of requests failing with a 429 carrying a
+            Retry-After header.
+        seed: Seed for the latency and failure draws, for repeatable runs.
+    """
+
+    name = "local"
+
+    def __init__(self, latency_ms: float = 500, jitter_ms: float = 0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio_file, filename: str, model: str) -> str:
+        data = audio_file.read()
+        with self._lock:
+            self.requests += 1
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+            draw = self._random.random()
+        time.sleep(delay)
+        if draw < self.throttle_rate:
+            raise StubAPIError(429, {"retry-after-ms": str(int(self.latency_ms) or 100)})
+        if draw < self.throttle_rate + self.error_rate:
+            raise StubAPIError(503)
+        return stub_transcript(data)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+def create_transcription_backend(name: Optional[str] = None) -> TranscriptionBackend:
+    """Build the backend called ``name`` (default: TRANSCRIPTION_BACKEND or ``openai``)."""
+    name = (name or os.getenv("TRANSCRIPTION_BACKEND") or "openai").strip().lower()
+    if name == "openai":
+        return OpenAIBackend()
+    if name == "local":
+        return LocalBackend(
+            latency_ms=_env_float("LOCAL_TRANSCRIPTION_LATENCY_MS", 500),
+            jitter_ms=_env_float("LOCAL_TRANSCRIPTION_JITTER_MS", 0),
+            error_rate=_env_float("LOCAL_TRANSCRIPTION_ERROR_RATE", 0.0),
+            throttle_rate=_env_float("LOCAL_TRANSCRIPTION_THROTTLE_RATE", 0.0),
+        )
+    raise ValueError(f"Unknown transcription backend {name!r}. Available: openai, local")
+
+
+def get_transcription_backend() -> TranscriptionBackend:
+    """Process-wide backend selected by TRANSCRIPTION_BACKEND."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_transcription_backend()
+        return _backend
@@ -0,0 +1,106 @@
+"""
+Resumable transcription journal.
+
+Every finished chunk's text and offset is appended to a per-run JSONL file as
+soon as it completes. The run is identified by a hash of the input recording
+and the parameters that determine how it is chunked and transcribed, so
+rerunning the same input after a failure (network blip, 500, rate limit)
+only transcribes the chunks that are still missing. Journals not written to
+for RUN_STATE_TTL_HOURS (default a week) are deleted.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    from .disk_cache import get_cache_dir, prune_stale_files
+except ImportError:
+    from disk_cache import get_cache_dir, prune_stale_files
+
+
+def journaling_enabled() -> bool:
+    """TRANSCRIPTION_JOURNAL is on unless set to 0/false/off."""
+    return os.getenv("TRANSCRIPTION_JOURNAL", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def recording_run_id(audio_path: str, **params) -> str:
+    """Stable id for a transcription run of ``audio_path`` with ``params``."""
+    digest = hashlib.sha256()
+    with open(audio_path, "rb") as audio_file:
+        for block in iter(lambda: audio_file.read(1024 * 1024), b""):
+            digest.update(block)
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class TranscriptionJournal:
+    """Append-only record of the chunks finished in one transcription run."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: Dict[int, dict] = {}
+        self._complete = False
+        self._load()
+
+    @classmethod
+    def for_recording(cls, audio_path: str, **params) -> "TranscriptionJournal":
+        """Open the journal for ``audio_path`` transcribed with ``params``."""
+        run_id = recording_run_id(audio_path, **params)
+        directory = get_cache_dir() / "journals"
+        if directory.exists():
+            prune_stale_files(directory, "*.jsonl")
+        return cls(directory / f"{run_id}.jsonl")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write leaves a truncated last line
+                    continue
+                if entry.get("complete"):
+                    self._complete = True
+                elif "index" in entry:
+                    self._entries[entry["index"]] = entry
+
+    def _append(self, entry: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as journal_file:
+            journal_file.write(json.dumps(entry) + "\n")
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+    @property
+    def is_complete(self) -> bool:
+        return self._complete
+
+    def completed(self) -> Dict[int, dict]:
+        """Finished chunks by index, each a dict with ``text`` and ``offset_ms``."""
+        with self._lock:
+            return dict(self._entries)
+
+    def record(self, index: int, text: str, offset_ms=None) -> None:
+        """Persist a finished chunk."""
+        entry = {"index": index, "offset_ms": offset_ms, "text": text}
+        with self._lock:
+            self._entries[index] = entry
+            self._append(entry)
+
+    def mark_complete(self, chunk_count: int) -> None:
+        """Record that every chunk of the run has been transcribed."""
+        with self._lock:
+            self._complete = True
+            self._append({"complete": True, "chunks": chunk_count})
+
+    def entries(self) -> List[dict]:
+        """Finished chunks in chunk order."""
+        with self._lock:
+            return [self._entries[i] for i in sorted(self._entries)]
@@ -0,0 +1,268 @@
+"""
+Silence-aware chunking based on frame energy.
+
+Splits a recording into roughly ``chunk_length_ms`` chunks whose boundaries
+fall in pauses instead of at fixed offsets, and drops long silent stretches
+(breaks, hold music below the threshold, dead air) so they are neither
+uploaded nor paid for. Frame levels are computed with NumPy over the raw PCM
+samples, and the recording is streamed through audio_chunking so memory use
+stays bounded by the chunk length.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+try:
+    from .audio_chunking import DEFAULT_CHUNK_LENGTH_MS, PCMParams, iter_pcm_windows, probe_audio
+except ImportError:
+    from audio_chunking import DEFAULT_CHUNK_LENGTH_MS, PCMParams, iter_pcm_windows, probe_audio
+
+DEFAULT_SILENCE_THRESHOLD_DB = -50.0
+DEFAULT_MIN_SILENCE_MS = 2000
+DEFAULT_MIN_PAUSE_MS = 300
+DEFAULT_PADDING_MS = 250
+DEFAULT_FRAME_MS = 30
+READ_BLOCK_MS = 10000
+# Default limit on how far past the target length a chunk may grow while waiting for a pause
+MAX_CHUNK_OVERSHOOT = 1.25
+
+
+def frame_levels_db(pcm: bytes, params: PCMParams, frame_length: int) -> np.ndarray:
+    """RMS level in dBFS of every complete ``frame_length``-frame slice of ``pcm``.
+
+    Channels are downmixed to mono before measuring.
+    """
+    width = params.sample_width
+    if width == 3:
+        raw = np.frombuffer(pcm, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = (raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)).astype(np.float32)
+        samples[samples >= 2 ** 23] -= 2 ** 24
+    else:
+        dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[width]
+        samples = np.frombuffer(pcm, dtype=dtype).astype(np.float32)
+        if width == 1:
+            samples -= 128.0
+
+    samples = samples.reshape(-1, params.channels).mean(axis=1) / float(2 ** (8 * width - 1))
+    count = len(samples) // frame_length
+    frames = samples[:count * frame_length].reshape(count, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+def _runs(mask: np.ndarray) -> Iterator[Tuple[int, int, bool]]:
+    """Yield ``(start, end, value)`` for each run of equal values in ``mask``."""
+    if len(mask) == 0:
+        return
+    changes = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    starts = np.concatenate(([0], changes))
+    ends = np.concatenate((changes, [len(mask)]))
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        yield start, end, bool(mask[start])
+
+
+@dataclass
+class SilenceStats:
+    """How much of a recording was skipped as silence."""
+
+    total_ms: float = 0.0
+    skipped_ms: float = 0.0
+
+    @property
+    def kept_ms(self) -> float:
+        return self.total_ms - self.skipped_ms
+
+    @property
+    def skipped_ratio(self) -> float:
+        return self.skipped_ms / self.total_ms if self.total_ms else 0.0
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        print(f"⚠️  Invalid {name}={value!r}, using {default}")
+        return default
+
+
+class SilenceAwareChunkSource:
+    """Iterable of pydub.AudioSegment chunks cut at pauses, with long silences removed.
+
+    Chunks grow until they reach ``chunk_length_ms`` and are then closed at
+    the next pause of at least ``min_pause_ms``. A chunk that reaches
+    ``max_chunk_ms`` without a pause is split at its quietest frame. Silent
+    stretches longer than ``min_silence_ms`` are dropped, keeping
+    ``padding_ms`` on either side so words are not clipped. ``stats`` reports
+    how much audio was skipped once iteration finishes, and
+    ``chunk_offset_ms(index)`` where each yielded chunk starts in the
+    original recording.
+    """
+
+    def __init__(self, path: str, chunk_length_ms: int = DEFAULT_CHUNK_LENGTH_MS,
+                 silence_threshold_db: float = None, min_silence_ms: int = DEFAULT_MIN_SILENCE_MS,
+                 min_pause_ms: int = DEFAULT_MIN_PAUSE_MS, padding_ms: int = DEFAULT_PADDING_MS,
+                 max_chunk_ms: int = None, frame_ms: int = DEFAULT_FRAME_MS):
+        if silence_threshold_db is None:
+            silence_threshold_db = _env_float("TRANSCRIPTION_SILENCE_THRESHOLD_DB", DEFAULT_SILENCE_THRESHOLD_DB)
+        self.path = str(path)
+        self.chunk_length_ms = chunk_length_ms
+        self.silence_threshold_db = silence_threshold_db
+        self.params, self.duration_ms = probe_audio(self.path)
+        self.stats = SilenceStats()
+        self._offsets: List[int] = []
+
+        def to_frames(ms):
+            return max(1, int(round(ms / frame_ms)))
+
+        self._frame_length = self.params.frames_for(frame_ms)
+        self._frame_bytes = self._frame_length * self.params.frame_size
+        self._frame_ms = self._frame_length * 1000.0 / self.params.frame_rate
+        self._target = to_frames(chunk_length_ms)
+        self._max = max(self._target, to_frames(max_chunk_ms or chunk_length_ms * MAX_CHUNK_OVERSHOOT))
+        self._padding = to_frames(padding_ms)
+        self._min_silence = max(to_frames(min_silence_ms), 2 * self._padding + 1)
+        self._min_pause = to_frames(min_pause_ms)
+
+    def __iter__(self):
+        from pydub import AudioSegment
+
+        for data in self.iter_pcm_chunks():
+            yield AudioSegment(
+                data=data,
+                sample_width=self.params.sample_width,
+                frame_rate=self.params.frame_rate,
+                channels=self.params.channels,
+            )
+
+    def iter_pcm_chunks(self) -> Iterator[bytes]:
+        """Yield the raw PCM of each chunk."""
+        self.stats = SilenceStats()
+        self._offsets = []
+        self._chunk = bytearray()
+        self._chunk_levels: List[float] = []
+        self._chunk_positions: List[int] = []
+        self._chunk_has_speech = False
+        self._pause = bytearray()
+        self._pause_frames = 0
+        self._pause_start = 0
+        self._pause_long = False
+
+        fb = self._frame_bytes
+        carry = b""
+        position = 0
+        for block in iter_pcm_windows(self.path, READ_BLOCK_MS, self.params):
+            block = carry + block
+            usable = len(block) - len(block) % fb
+            carry = block[usable:]
+            pcm = block[:usable]
+            if not pcm:
+                continue
+
+            levels = frame_levels_db(pcm, self.params, self._frame_length)
+            self.stats.total_ms += len(levels) * self._frame_ms
+            speech = levels > self.silence_threshold_db
+            for start, end, is_speech in _runs(speech):
+                data = pcm[start * fb:end * fb]
+                if is_speech:
+                    yield from self._on_speech(data, levels[start:end].tolist(), position + start)
+                else:
+                    self._on_silence(data, position + start)
+            position += len(levels)
+
+        if carry:
+            self.stats.total_ms += len(carry) / self.params.frame_size * 1000.0 / self.params.frame_rate
+            self._on_silence(carry, position)
+        yield from self._finish()
+
+    def chunk_offset_ms(self, index: int) -> int:
+        """Start of chunk ``index`` in the original recording, once it has been yielded."""
+        return self._offsets[index]
+
+    def _on_silence(self, data: bytes, position: int) -> None:
+        if not self._pause:
+            self._pause_start = position
+        self._pause.extend(data)
+        self._pause_frames += len(data) // self._frame_bytes
+        if self._pause_frames > self._min_silence:
+            # Long pause: keep only the padding at each end, drop the middle
+            keep = self._padding * self._frame_bytes
+            dropped = self._pause_frames - 2 * self._padding
+            self._pause = self._pause[:keep] + self._pause[-keep:]
+            self._pause_frames = 2 * self._padding
+            self._pause_long = True
+            self.stats.skipped_ms += dropped * self._frame_ms
+
+    def _take_pause(self):
+        """Split the pending pause into the part kept before and after a boundary."""
+        pause, frames = self._pause, self._pause_frames
+        split = (self._padding if self._pause_long else frames // 2) * self._frame_bytes
+        is_boundary = self._pause_long or frames >= self._min_pause
+        self._pause = bytearray()
+        self._pause_frames = 0
+        self._pause_long = False
+        return pause[:split], pause[split:], is_boundary
+
+    def _append(self, data: bytes, position: int, level: float = None, levels: List[float] = None,
+                positions: List[int] = None) -> None:
+        self._chunk.extend(data)
+        frames = len(data) // self._frame_bytes
+        if levels is None:
+            levels = [level] * frames
+        if positions is None:
+            positions = list(range(position, position + frames))
+        self._chunk_levels.extend(levels)
+        self._chunk_positions.extend(positions)
+
+    def _emit(self) -> Iterator[bytes]:
+        chunk, has_speech = bytes(self._chunk), self._chunk_has_speech
+        start = self._chunk_positions[0] if self._chunk_positions else 0
+        self._chunk = bytearray()
+        self._chunk_levels = []
+        self._chunk_positions = []
+        self._chunk_has_speech = False
+        if has_speech and chunk:
+            self._offsets.append(int(start * self._frame_ms))
+            yield chunk
+        elif chunk:
+            self.stats.skipped_ms += len(chunk) / self._frame_bytes * self._frame_ms
+
+    def _on_speech(self, data: bytes, levels: List[float], position: int) -> Iterator[bytes]:
+        silent = self.silence_threshold_db - 1
+        if self._pause_frames:
+            pause_start = self._pause_start
+            head, tail, is_boundary = self._take_pause()
+            self._append(head, pause_start, silent)
+            if is_boundary and len(self._chunk_levels) >= self._target:
+                yield from self._emit()
+            self._append(tail, position - len(tail) // self._frame_bytes, silent)
+
+        self._append(data, position, levels=levels)
+        self._chunk_has_speech = True
+
+        while len(self._chunk_levels) >= self._max:
+            # No pause before the limit: cut at the quietest frame in the second half
+            low = self._target // 2
+            cut = low + int(np.argmin(self._chunk_levels[low:self._max])) + 1
+            # Both halves keep at least one frame, even when the quietest frame is the last one
+            cut = max(1, min(cut, len(self._chunk_levels) - 1))
+            rest = bytes(self._chunk[cut * self._frame_bytes:])
+            rest_levels = self._chunk_levels[cut:]
+            rest_positions = self._chunk_positions[cut:]
+            del self._chunk[cut * self._frame_bytes:]
+            del self._chunk_positions[cut:]
+            yield from self._emit()
+            if rest_positions:
+                self._append(rest, rest_positions[0], levels=rest_levels, positions=rest_positions)
+                self._chunk_has_speech = True
+
+    def _finish(self) -> Iterator[bytes]:
+        if self._pause_frames:
+            pause_start = self._pause_start
+            head, tail, _ = self._take_pause()
+            self._append(head, pause_start, self.silence_threshold_db - 1)
+            self.stats.skipped_ms += len(tail) / self._frame_bytes * self._frame_ms
+        yield from self._emit()
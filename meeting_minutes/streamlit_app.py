@@ -1,37 +1,5 @@
 import streamlit as st
-# SQLite compatibility fix - MUST be applied before any ChromaDB imports
 import sys
-import warnings
-import os
-
-# Set environment variables to suppress ChromaDB warnings
-os.environ["CHROMA_SILENCE_DEPRECATION_WARNINGS"] = "1"
-os.environ["TOKENIZERS_PARALLELISM"] = "false"
-os.environ["CHROMA_DB_IMPL"] = "duckdb+parquet"  # Alternative backend
-
-# Suppress all SQLite and ChromaDB warnings
-warnings.filterwarnings("ignore", message=".*sqlite3.*")
-warnings.filterwarnings("ignore", message=".*SQLite.*")
-warnings.filterwarnings("ignore", message=".*Chroma.*")
-warnings.filterwarnings("ignore", message=".*unsupported version.*")
-warnings.filterwarnings("ignore", category=RuntimeWarning)
-
-# Try to import and apply SQLite patch
-try:
-    from src.meeting_minutes.sqlite_patch import patch_sqlite_version, force_chromadb_compatibility
-    patch_sqlite_version()
-    force_chromadb_compatibility()
-    print("✅ SQLite compatibility patches applied successfully")
-except ImportError as e:
-    print(f"⚠️  Could not import SQLite patch: {e}")
-    # Try alternative approach
-    try:
-        import pysqlite3
-        sys.modules['sqlite3'] = pysqlite3
-        print("✅ Replaced sqlite3 with pysqlite3")
-    except ImportError:
-        print("⚠️  pysqlite3 not available, using system sqlite3")
-
 import os
 from datetime import datetime
 from pathlib import Path
@@ -43,11 +11,27 @@ current_dir = Path(__file__).parent
 src_path = current_dir / 'src' / 'meeting_minutes'
 sys.path.insert(0, str(src_path))
 
+# SQLite compatibility fix - MUST be applied before any ChromaDB imports
+from bootstrap import bootstrap, print_startup_report, startup_phase
+bootstrap()
+
 # Import your existing modules using the import helper
 try:
     # Try to import the helper first
     from import_helper import import_crews
-    MeetingMinutesCrew, GmailCrew = import_crews()
+    from crews.meeting_minutes_crew.models import MeetingAnalysis
+    from chunk_planner import open_planned_chunk_source
+    from email_delivery import deliver_minutes, describe_gmail_service, get_delivery_mode, get_recipients
+    from email_outbox import enqueue_minutes, get_outbox, meeting_id_for, outbox_enabled
+    from llm_cache import cached_kickoff, describe_cache_stats
+    from markdown_renderer import render_markdown
+    from minutes_export import export_minutes_in_background
+    from rate_limiter import get_scheduler
+    from streaming_pipeline import OrderedEmitter, StreamingSummarizer, streaming_enabled
+    from token_budget import budget_transcript, describe_token_usage, instrument_crew
+    from transcript_normalizer import prepare_llm_transcript
+    from transcription import chunk_transcriber, open_transcription_journal, transcribe_chunks
+    from transcription_backends import get_transcription_backend
 except ImportError as e:
     st.error(f"❌ Import error: {e}")
     st.error("Please check the module structure and paths")
@@ -57,6 +41,15 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+
+def load_meeting_minutes_crew():
+    """Import the crews (crewai, its tools and LLM clients) when minutes are first generated."""
+    with startup_phase("import crews"):
+        meeting_minutes_crew, _ = import_crews()
+    return meeting_minutes_crew
+
+print_startup_report()
+
 # Custom CSS for modern UI with softer colors
 st.markdown("""
 <style>
@@ -324,7 +317,7 @@ with st.sidebar:
     recipient = st.text_input(
         "📥 Recipient Email", 
         value=os.getenv("GMAIL_RECIPIENT", ""),
-        help="Email address to receive meeting minutes",
+        help="Email address(es) to receive meeting minutes, separated by commas",
         placeholder="recipient@company.com"
     )
     
@@ -387,6 +380,13 @@ with st.sidebar:
         </div>
         """, unsafe_allow_html=True)
 
+    # Delivery status of the most recently queued email drafts
+    outbox_entries = get_outbox().recent(5)
+    if outbox_entries:
+        st.markdown("### 📬 Outbox")
+        for entry in outbox_entries:
+            st.caption(f"{entry.meeting_id}: {entry.describe()}")
+
 # Main content area - centered upload section
 col1, col2, col3 = st.columns([1, 2, 1])
 
@@ -457,7 +457,8 @@ with col2:
                     progress_bar.progress(10)
                     
                     with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_audio_path = os.path.join(temp_dir, "temp_audio.wav")
+                        audio_suffix = Path(uploaded_file.name).suffix or ".wav"
+                        temp_audio_path = os.path.join(temp_dir, f"temp_audio{audio_suffix}")
                         with open(temp_audio_path, "wb") as f:
                             f.write(uploaded_file.getbuffer())
                         
@@ -466,29 +467,55 @@ with col2:
                         status_text.markdown("**Step 2:** 🎙️ Transcribing audio with OpenAI Whisper...")
                         progress_bar.progress(30)
                         
-                        from openai import OpenAI
-                        from pydub import AudioSegment
-                        from pydub.utils import make_chunks
+                        backend = get_transcription_backend()
                         
-                        client = OpenAI()
+                        # Pick the largest chunk that fits the upload limit, then stream the
+                        # audio one chunk at a time, cutting at pauses and skipping long silences
+                        plan, chunks = open_planned_chunk_source(temp_audio_path)
+                        status_text.markdown(
+                            f"**Step 2:** 🎙️ Transcribing audio with OpenAI Whisper... (planned {plan.describe()})"
+                        )
                         
-                        # Load and chunk audio
-                        audio = AudioSegment.from_file(temp_audio_path)
-                        chunk_length_ms = 60000
-                        chunks = make_chunks(audio, chunk_length_ms)
+                        # In streaming mode, transcript sections are summarized while later chunks upload
+                        streaming = StreamingSummarizer() if streaming_enabled() else None
+                        emitter = OrderedEmitter(streaming.add_chunk) if streaming else None
                         
-                        # Transcribe chunks with progress
-                        full_transcription = ""
-                        for i, chunk in enumerate(chunks):
-                            chunk_path = os.path.join(temp_dir, f"chunk_{i}.wav")
-                            chunk.export(chunk_path, format="wav")
-                            
-                            with open(chunk_path, "rb") as audio_file:
-                                transcription = client.audio.transcriptions.create(
-                                    model="whisper-1", 
-                                    file=audio_file
-                                )
-                                full_transcription += transcription.text + " "
+                        # Transcribe chunks concurrently with progress
+                        uploaded = {"bytes": 0}
+
+                        def update_transcription_progress(result, completed, total):
+                            uploaded["bytes"] += result.bytes_uploaded
+                            status_text.markdown(
+                                f"**Step 2:** 🎙️ Transcribing audio with OpenAI Whisper... "
+                                f"({completed}/{total or '?'} chunks, "
+                                f"{uploaded['bytes'] / 1024 / 1024:.1f} MB uploaded)"
+                            )
+                            if total:
+                                progress_bar.progress(30 + int(30 * completed / total))
+                            if emitter:
+                                emitter.add(result.index, result.text)
+
+                        try:
+                            transcription_result = transcribe_chunks(
+                                chunks,
+                                chunk_transcriber(backend, spill_dir=temp_dir),
+                                on_progress=update_transcription_progress,
+                                journal=open_transcription_journal(temp_audio_path, chunks, backend=backend),
+                            )
+                        except BaseException:
+                            if streaming:
+                                streaming.close()
+                            raise
+                        full_transcription = transcription_result.text
+                        silence = getattr(chunks, "stats", None)
+                        # The raw transcript is shown; the normalized one goes to the LLM
+                        normalized = prepare_llm_transcript([c.text for c in transcription_result.chunks])
+                        llm_transcript = normalized.text
+                        if streaming:
+                            status_text.markdown("**Step 2:** 🎙️ Finishing the section summaries...")
+                            emitter.drain(transcription_result.chunks)
+                            streamed = streaming.finish()
+                            llm_transcript = streamed.text
                         
                         progress_bar.progress(60)
                         
@@ -497,14 +524,35 @@ with col2:
                         status_text.markdown("**Step 3:** 📝 Generating meeting minutes with CrewAI...")
                         progress_bar.progress(70)
                         
-                        crew = MeetingMinutesCrew()
-                        inputs = {"transcript": full_transcription}
-                        meeting_minutes = crew.crew().kickoff(inputs)
+                        crew = load_meeting_minutes_crew()().crew()
+                        
+                        # Estimate prompt tokens up front; long transcripts and transcripts
+                        # over LLM_TOKEN_BUDGET are summarized section by section in parallel first
+                        reduction, estimate = budget_transcript(llm_transcript, crew)
+                        condensed = (
+                            f"condensed {reduction.sections[0]} transcript sections in {reduction.wall_time:.0f}s, "
+                            if reduction.reduced else ""
+                        )
+                        if streaming and streamed.reduced:
+                            condensed = (
+                                f"summarized {streamed.sections[0]} sections while transcribing, "
+                                f"final reduce {streamed.wall_time:.0f}s, " + condensed
+                            )
+                        status_text.markdown(
+                            f"**Step 3:** 📝 Generating meeting minutes with CrewAI... "
+                            f"({condensed}estimated {estimate.describe()})"
+                        )
+                        
+                        inputs = {"transcript": reduction.text}
+                        usage = instrument_crew(crew)
+                        meeting_minutes = cached_kickoff(crew, inputs)
                         
                         if hasattr(meeting_minutes, 'raw'):
                             meeting_minutes_str = str(meeting_minutes.raw)
                         else:
                             meeting_minutes_str = str(meeting_minutes)
+                        analysis = MeetingAnalysis.from_crew_output(meeting_minutes)
+                        export_minutes_in_background(analysis, meeting_minutes_str, full_transcription)
                         
                         progress_bar.progress(85)
                         
@@ -513,32 +561,96 @@ with col2:
                         status_text.markdown("**Step 4:** 📧 Creating email draft...")
                         progress_bar.progress(90)
                         
-                        gmail_crew = GmailCrew()
-                        gmail_inputs = {"body": meeting_minutes_str}
-                        result = gmail_crew.crew().kickoff(gmail_inputs)
+                        # Queued in the outbox and created in the background; a direct
+                        # Gmail API call with EMAIL_OUTBOX=0, the Gmail crew with EMAIL_DELIVERY=crew
+                        queued = None
+                        recipients = get_recipients(recipient)
+                        if get_delivery_mode() == "direct" and outbox_enabled() and sender and recipients:
+                            queued = enqueue_minutes(meeting_id_for(full_transcription), meeting_minutes_str,
+                                                     sender, recipients)
+                        else:
+                            result = deliver_minutes(meeting_minutes_str, sender, recipients)
                         
                         progress_bar.progress(100)
                         # Update step indicator to show all completed
                         update_step_indicator(5)  # This will show all steps as completed
-                        status_text.markdown("**✅ Complete!** Meeting minutes generated and email draft created!")
-                        
-                        # Success message
-                        st.success("🎉 **Success!** Your meeting minutes have been generated and an email draft has been created!")
+                        if queued:
+                            status_text.markdown("**✅ Complete!** Meeting minutes generated and email draft queued!")
+                            st.success("🎉 **Success!** Your meeting minutes have been generated and the email draft is being created!")
+                        elif result.success:
+                            status_text.markdown("**✅ Complete!** Meeting minutes generated and email draft created!")
+                            
+                            # Success message
+                            st.success("🎉 **Success!** Your meeting minutes have been generated and an email draft has been created!")
+                        else:
+                            status_text.markdown("**⚠️ Complete:** Meeting minutes generated, but the email draft failed")
+                            st.warning(f"Your meeting minutes have been generated, but the email draft failed: {result.error}")
                         
                         # Results in expandable cards
                         with st.expander("📄 View Raw Transcription", expanded=False):
                             st.text_area("Transcription", full_transcription, height=200, disabled=True)
+                            if normalized.text != normalized.original:
+                                st.caption(f"Normalized for the LLM: {normalized.describe()}")
+                            if transcription_result.resumed_chunks:
+                                st.caption(
+                                    f"Resumed {transcription_result.resumed_chunks}/{len(transcription_result.chunks)} "
+                                    f"chunks from an earlier run"
+                                )
+                            if transcription_result.cached_chunks:
+                                st.caption(
+                                    f"Reused {transcription_result.cached_chunks}/{len(transcription_result.chunks)} "
+                                    f"chunk transcriptions from cache"
+                                )
+                            requests = get_scheduler().metrics()
+                            if requests.retries:
+                                st.caption(
+                                    f"Whisper requests since the app started: {requests.retries} retried, "
+                                    f"{requests.throttled} throttled, average wait {requests.average_wait:.1f}s"
+                                )
+                            if silence and silence.total_ms:
+                                st.caption(
+                                    f"Skipped {silence.skipped_ms / 1000:.0f}s of silence "
+                                    f"({silence.skipped_ratio:.0%} of the recording)"
+                                )
                         
                         with st.expander("📋 View Generated Meeting Minutes", expanded=True):
-                            st.markdown(f"""
-                            <div class="meeting-minutes-content">
-                                {meeting_minutes_str}
-                            </div>
-                            """, unsafe_allow_html=True)
+                            # Rendered to HTML like the email body (and cached with it), since
+                            # Markdown inside an HTML block is shown as raw text
+                            st.markdown(
+                                f'<div class="meeting-minutes-content">{render_markdown(meeting_minutes_str)}</div>',
+                                unsafe_allow_html=True,
+                            )
+                            if getattr(meeting_minutes, "cached", False):
+                                st.caption("Served from the LLM cache")
+                            cache_report = describe_cache_stats()
+                            if cache_report:
+                                st.caption(cache_report)
+                            for line in usage.describe():
+                                st.caption(line)
+                            provider_usage = describe_token_usage(meeting_minutes)
+                            if provider_usage:
+                                st.caption(provider_usage)
+                        
+                        if analysis.action_items:
+                            with st.expander(f"✅ Action Items ({len(analysis.action_items)})", expanded=False):
+                                for item in analysis.action_items:
+                                    details = ", ".join(part for part in (item.owner, item.due) if part)
+                                    st.markdown(f"- {item.description}" + (f" *({details})*" if details else ""))
                         
                         with st.expander("📧 Email Status", expanded=False):
-                            st.info(f"**Email Draft Result:** {str(result)}")
-                            st.success(f"📬 Check your Gmail drafts folder for the email to: **{recipient}**")
+                            if queued:
+                                for entry in queued:
+                                    st.info(f"**Email Draft Result:** {get_outbox().get(entry.id).describe()}")
+                                st.caption(f"Meeting {queued[0].meeting_id}; see the outbox in the sidebar for updates")
+                            elif result.success:
+                                st.info(f"**Email Draft Result:** {result.describe()}")
+                                st.success(f"📬 Check your Gmail drafts folder for the email to: **{', '.join(recipients)}**")
+                            else:
+                                st.error(f"**Email Draft Result:** {result.describe()}")
+                            # The Gmail client is shared by all sessions of this app process
+                            gmail_report = describe_gmail_service()
+                            if gmail_report:
+                                st.caption(gmail_report)
                 
                 except Exception as e:
                     st.error(f"❌ **Error occurred:** {str(e)}")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Tests for the streaming audio chunker
+"""
+import os
+import sys
+import tempfile
+import wave
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from audio_chunking import PCMParams, iter_pcm_windows, probe_audio
+
+
+def write_wav(path, seconds, frame_rate=8000, channels=2):
+    """Write a silent 16-bit WAV file of the given length."""
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(b"\x00\x00" * channels * int(frame_rate * seconds))
+
+
+def test_probe_wav():
+    """WAV parameters and duration come from the header"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "meeting.wav")
+        write_wav(path, 2.5)
+
+        params, duration_ms = probe_audio(path)
+
+    assert (params.sample_width, params.frame_rate, params.channels) == (2, 8000, 2)
+    assert duration_ms == 2500
+    print("✓ WAV header probed")
+
+
+def test_windows_cover_recording():
+    """Windows have the requested length and cover the whole file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "meeting.wav")
+        write_wav(path, 2.5)
+
+        windows = [len(data) for data in iter_pcm_windows(path, chunk_length_ms=1000)]
+
+    frame_size = 2 * 2
+    assert windows == [8000 * frame_size, 8000 * frame_size, 4000 * frame_size]
+    print(f"✓ {len(windows)} windows streamed")
+
+
+def test_ffmpeg_stderr_does_not_stall_decoding():
+    """A decoder writing lots of warnings still streams, and its error is reported"""
+    from pydub import AudioSegment
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "meeting.mp3")
+        with open(path, "wb") as audio_file:
+            audio_file.write(b"ID3")
+        # Stand-in for ffmpeg: 1 MB of warnings, two windows of PCM, then a failure
+        fake_ffmpeg = os.path.join(temp_dir, "ffmpeg")
+        with open(fake_ffmpeg, "w") as script:
+            script.write(f"#!{sys.executable}\nimport sys\n"
+                         "sys.stderr.write('warning\\n' * 131072)\n"
+                         "sys.stdout.buffer.write(b'\\x00' * 32000)\n"
+                         "sys.stderr.write('bad input')\n"
+                         "sys.exit(1)\n")
+        os.chmod(fake_ffmpeg, 0o755)
+        converter, AudioSegment.converter = AudioSegment.converter, fake_ffmpeg
+        windows = []
+        try:
+            for data in iter_pcm_windows(path, chunk_length_ms=1000, params=PCMParams(2, 8000, 1)):
+                windows.append(len(data))
+        except RuntimeError as error:
+            assert str(error).endswith("bad input")
+        else:
+            raise AssertionError("expected RuntimeError")
+        finally:
+            AudioSegment.converter = converter
+
+    assert windows == [16000, 16000]
+    print("✓ ffmpeg stderr did not stall decoding")
+
+
+if __name__ == "__main__":
+    test_probe_wav()
+    test_windows_cover_recording()
+    test_ffmpeg_stderr_does_not_stall_decoding()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Tests for in-memory chunk encoding
+"""
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from chunk_encoding import encode_chunk, encoded_size, ffmpeg_available, get_encoding_profile
+
+
+class FakeChunk:
+    """Stands in for pydub.AudioSegment.export"""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def export(self, out_f, format="wav"):
+        out_f.write(self.payload)
+        return out_f
+
+
+def test_small_chunk_stays_in_memory():
+    """Chunks under the threshold never touch the disk"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with encode_chunk(FakeChunk(b"x" * 100), profile="source_wav", spill_threshold=1024, spill_dir=temp_dir) as buffer:
+            assert buffer.read() == b"x" * 100
+            assert not buffer._rolled
+        assert os.listdir(temp_dir) == []
+    print("✓ Small chunk encoded in memory")
+
+
+def test_large_chunk_spills_to_disk():
+    """Chunks over the threshold spill to a temporary file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with encode_chunk(FakeChunk(b"x" * 4096), profile="source_wav", spill_threshold=1024, spill_dir=temp_dir) as buffer:
+            assert buffer._rolled
+            assert buffer.read() == b"x" * 4096
+    print("✓ Large chunk spilled to disk")
+
+
+def test_encoded_size():
+    """The encoded size is reported and the buffer stays rewound"""
+    with encode_chunk(FakeChunk(b"x" * 300), profile="source_wav", spill_threshold=1024) as buffer:
+        assert encoded_size(buffer) == 300
+        assert buffer.tell() == 0
+    print("✓ Encoded size reported")
+
+
+def test_ffmpeg_output_streams_into_buffer():
+    """ffmpeg's output is copied into the spool buffer as it is produced"""
+    from pydub import AudioSegment
+
+    class PCMChunk:
+        raw_data = b"\x01\x02" * 300000
+        sample_width, frame_rate, channels = 2, 16000, 1
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Stand-in for ffmpeg that echoes its input
+        fake_ffmpeg = os.path.join(temp_dir, "ffmpeg")
+        with open(fake_ffmpeg, "w") as script:
+            script.write(f"#!{sys.executable}\nimport shutil, sys\n"
+                         "shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)\n")
+        os.chmod(fake_ffmpeg, 0o755)
+        converter, AudioSegment.converter = AudioSegment.converter, fake_ffmpeg
+        try:
+            with encode_chunk(PCMChunk(), profile="speech_flac", spill_threshold=1024, spill_dir=temp_dir) as buffer:
+                assert buffer._rolled
+                assert buffer.read() == PCMChunk.raw_data
+        finally:
+            AudioSegment.converter = converter
+    print("✓ ffmpeg output streamed into the buffer")
+
+
+def test_encoding_profiles():
+    """Profiles resolve from names and the environment"""
+    # Without ffmpeg the default falls back to WAV, which pydub writes itself
+    assert get_encoding_profile().name == ("speech_flac" if ffmpeg_available() else "speech_wav")
+    assert get_encoding_profile("speech_wav").sample_rate == 16000
+
+    os.environ["TRANSCRIPTION_ENCODING_PROFILE"] = "speech_mp3"
+    try:
+        assert get_encoding_profile().extension == "mp3"
+    finally:
+        del os.environ["TRANSCRIPTION_ENCODING_PROFILE"]
+
+    try:
+        get_encoding_profile("speech_aiff")
+    except ValueError:
+        print("✓ Encoding profiles resolved")
+    else:
+        raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_small_chunk_stays_in_memory()
+    test_large_chunk_spills_to_disk()
+    test_encoded_size()
+    test_ffmpeg_output_streams_into_buffer()
+    test_encoding_profiles()
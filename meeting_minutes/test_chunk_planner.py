@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Tests for chunk length planning
+"""
+import os
+import sys
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from audio_chunking import PCMParams
+from chunk_planner import plan_chunks
+
+TWO_HOURS_MS = 2 * 60 * 60 * 1000
+MB = 1024 * 1024
+
+
+def test_chunks_fit_upload_limit():
+    """Planned chunks stay under the upload limit after the safety margin"""
+    plan = plan_chunks(TWO_HOURS_MS, PCMParams(2, 16000, 1), profile="speech_mp3",
+                       upload_limit_bytes=25 * MB, safety_margin=0.8, max_pcm_bytes=1024 * MB)
+
+    assert plan.bytes_per_second * plan.max_chunk_ms / 1000 <= 25 * MB * 0.8
+    assert plan.chunk_count <= 6
+    assert plan.expected_total_bytes == plan.expected_chunk_bytes * plan.chunk_count
+    print(f"✓ Planned {plan.describe()}")
+
+
+def test_overshoot_leaves_room_for_pauses():
+    """Silence-aware chunks get a shorter target so their maximum still fits"""
+    fixed = plan_chunks(TWO_HOURS_MS, PCMParams(2, 16000, 1), profile="speech_flac", upload_limit_bytes=25 * MB)
+    aware = plan_chunks(TWO_HOURS_MS, PCMParams(2, 16000, 1), profile="speech_flac", upload_limit_bytes=25 * MB,
+                        overshoot=1.25)
+
+    assert aware.max_chunk_ms == fixed.max_chunk_ms
+    assert aware.chunk_length_ms < fixed.chunk_length_ms
+    print("✓ Overshoot accounted for")
+
+
+def test_memory_budget_caps_chunk_length():
+    """Raw PCM of the chunks in flight, in the source format, stays within the memory budget"""
+    params = PCMParams(2, 48000, 2)
+    plan = plan_chunks(TWO_HOURS_MS, params, profile="speech_mp3", max_pcm_bytes=64 * MB, in_flight_chunks=4)
+
+    assert plan.max_chunk_ms / 1000 * 48000 * 4 * 4 <= 64 * MB
+    assert plan.chunk_count > 6
+    print("✓ Memory budget respected")
+
+
+def test_source_format_sets_memory_cap():
+    """A 44.1 kHz stereo meeting is capped by its own PCM size for every speech profile"""
+    params = PCMParams(2, 44100, 2)
+    for profile in ("speech_flac", "speech_mp3", "speech_wav"):
+        plan = plan_chunks(TWO_HOURS_MS, params, profile=profile, upload_limit_bytes=25 * MB,
+                           max_pcm_bytes=512 * MB, in_flight_chunks=8)
+
+        in_flight_bytes = plan.max_chunk_ms / 1000 * params.frame_rate * params.frame_size * 8
+        assert in_flight_bytes <= 512 * MB, f"{profile}: {in_flight_bytes / MB:.0f} MB in flight"
+    print(f"✓ 2 h at 44.1 kHz stereo: {plan.describe()}")
+
+
+def test_small_upload_limit_is_never_exceeded():
+    """The minimum chunk length does not override the upload limit"""
+    plan = plan_chunks(TWO_HOURS_MS, PCMParams(2, 16000, 1), profile="speech_wav", upload_limit_bytes=512 * 1024,
+                       safety_margin=0.8)
+
+    assert plan.bytes_per_second * plan.max_chunk_ms / 1000 <= 512 * 1024 * 0.8
+    print(f"✓ Small upload limit respected: {plan.max_chunk_ms / 1000:.1f} s chunks")
+
+
+def test_short_recording_is_one_chunk():
+    """A recording shorter than the planned chunk is sent in one request"""
+    plan = plan_chunks(90000, PCMParams(2, 16000, 1))
+
+    assert plan.chunk_count == 1
+    assert plan.chunk_length_ms == 90000
+    print("✓ Short recording planned as a single chunk")
+
+
+if __name__ == "__main__":
+    test_chunks_fit_upload_limit()
+    test_overshoot_leaves_room_for_pauses()
+    test_memory_budget_caps_chunk_length()
+    test_source_format_sets_memory_cap()
+    test_small_upload_limit_is_never_exceeded()
+    test_short_recording_is_one_chunk()
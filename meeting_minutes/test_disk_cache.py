@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Tests for the SQLite-backed disk cache
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from disk_cache import DiskCache
+
+
+def test_hits_and_misses():
+    """Lookups are counted and values survive reopening"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "cache.sqlite3")
+        cache = DiskCache(path)
+        assert cache.get("a") is None
+        cache.set("a", "hello")
+        assert cache.get("a") == "hello"
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+        cache.close()
+
+        reopened = DiskCache(path)
+        assert reopened.get("a") == "hello"
+        reopened.close()
+    print("✓ Cache hits and misses counted")
+
+
+def test_lru_eviction():
+    """Least recently used entries are evicted once over the size limit"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = DiskCache(os.path.join(temp_dir, "cache.sqlite3"), max_bytes=25)
+        cache.set("a", "x" * 10)
+        cache.set("b", "x" * 10)
+        cache.get("a")
+        cache.set("c", "x" * 10)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.stats().size_bytes <= 25
+        cache.close()
+    print("✓ Least recently used entry evicted")
+
+
+def test_ttl_expiry():
+    """Entries older than the TTL are treated as missing and removed"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = DiskCache(os.path.join(temp_dir, "cache.sqlite3"), ttl=0.05)
+        cache.set("a", "old")
+        assert cache.get("a") == "old"
+        time.sleep(0.1)
+        cache.set("b", "new")
+
+        assert cache.get("a") is None
+        assert cache.get("b") == "new"
+        assert cache.stats().entries == 1
+        cache.close()
+    print("✓ Expired entries dropped")
+
+
+if __name__ == "__main__":
+    test_hits_and_misses()
+    test_lru_eviction()
+    test_ttl_expiry()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Tests for direct delivery of the minutes as a Gmail draft
+"""
+import os
+import sys
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from email_delivery import create_minutes_drafts, deliver_minutes, get_recipients
+from fake_gmail import FakeGmailService
+
+
+def test_direct_draft():
+    """The minutes are rendered and inserted as they are, without an LLM call"""
+    service = FakeGmailService()
+    result = deliver_minutes("# Minutes\n\n- Ship it", "me@example.com", "team@example.com",
+                             mode="direct", service=service)
+
+    assert result.success and result.mode == "direct" and result.latency >= 0
+    [draft] = result.results
+    assert draft.draft_id == "draft-1" and draft.recipient == "team@example.com"
+    assert service.drafts[0]["to"] == "team@example.com" and "<h1>Minutes</h1>" in service.drafts[0]["html"]
+    print(f"✓ {result.describe()}")
+
+
+def test_direct_draft_failure():
+    """API errors come back as a failed result instead of an exception"""
+    service = FakeGmailService(fail_recipients=["team@example.com"])
+    result = deliver_minutes("# Minutes", "me@example.com", "team@example.com", mode="direct", service=service)
+    assert not result.success and result.results[0].draft_id is None
+    assert "Invalid To header" in result.error
+    print(f"✓ {result.describe()}")
+
+
+def test_missing_configuration():
+    """Without a sender or recipient no draft is attempted"""
+    service = FakeGmailService()
+    saved = {name: os.environ.pop(name, None) for name in ("GMAIL_SENDER", "GMAIL_RECIPIENT")}
+    try:
+        result = deliver_minutes("# Minutes", mode="direct", service=service)
+    finally:
+        for name, value in saved.items():
+            if value is not None:
+                os.environ[name] = value
+    assert not result.success and not service.drafts and not service.http_requests
+    print(f"✓ {result.describe()}")
+
+
+def test_recipients_parsing():
+    """GMAIL_RECIPIENT may list several addresses"""
+    assert get_recipients("a@example.com, b@example.com;c@example.com") == [
+        "a@example.com", "b@example.com", "c@example.com"]
+    assert get_recipients(["a@example.com", "A@example.com", " "]) == ["a@example.com"]
+    print("✓ Recipients split and deduplicated")
+
+
+def test_batch_drafts_one_round_trip():
+    """Every recipient's draft is created in a single batch HTTP request"""
+    service = FakeGmailService()
+    recipients = [f"group{i}@example.com" for i in range(8)]
+    result = deliver_minutes("# Minutes\n\n- Ship it", "me@example.com", recipients, mode="direct",
+                             service=service)
+
+    assert result.success and len(result.results) == 8
+    assert service.http_requests == 1 and service.batches == 1
+    assert [draft["to"] for draft in service.drafts] == recipients
+    assert len({draft["html"] for draft in service.drafts}) == 1
+    assert all(draft.latency == result.latency for draft in result.results)
+    print(f"✓ {result.describe()}, {service.http_requests} HTTP request")
+
+
+def test_batch_partial_failure():
+    """A rejected recipient fails alone; the others still get their drafts"""
+    service = FakeGmailService(fail_recipients=["bad@example.com"])
+    result = create_minutes_drafts("# Minutes", "me@example.com",
+                                   ["a@example.com", "bad@example.com", "b@example.com"], service=service)
+
+    assert not result.success and [r.success for r in result.results] == [True, False, True]
+    assert result.results[1].recipient == "bad@example.com" and "Invalid To header" in result.error
+    assert len(service.drafts) == 2
+    print(f"✓ {result.describe()}")
+
+
+def test_failed_batch_request_fails_only_its_recipients():
+    """When a later batch request fails, drafts created by earlier batches are still reported"""
+    service = FakeGmailService(fail_batches=[2])
+    recipients = [f"group{i}@example.com" for i in range(60)]
+    result = create_minutes_drafts("# Minutes", "me@example.com", recipients, service=service)
+
+    assert [r.success for r in result.results] == [True] * 50 + [False] * 10
+    assert "Backend Error" in result.results[-1].error
+    assert len(service.drafts) == 50
+    print(f"✓ {result.describe()}")
+
+
+def test_batch_finds_existing_drafts():
+    """With Message-IDs, drafts created by an earlier attempt are reused"""
+    service = FakeGmailService()
+    recipients = ["a@example.com", "b@example.com"]
+    message_ids = ["<1@test>", "<2@test>"]
+    first = create_minutes_drafts("# Minutes", "me@example.com", recipients[:1], service=service,
+                                  message_ids=message_ids[:1])
+    second = create_minutes_drafts("# Minutes", "me@example.com", recipients, service=service,
+                                   message_ids=message_ids)
+
+    assert first.success and second.success
+    assert second.results[0].draft_id == first.results[0].draft_id
+    assert len(service.drafts) == 2
+    print("✓ Existing drafts found by Message-ID in one lookup batch")
+
+
+if __name__ == "__main__":
+    test_direct_draft()
+    test_direct_draft_failure()
+    test_missing_configuration()
+    test_recipients_parsing()
+    test_batch_drafts_one_round_trip()
+    test_batch_partial_failure()
+    test_failed_batch_request_fails_only_its_recipients()
+    test_batch_finds_existing_drafts()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""
+Tests for the durable email draft outbox
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from email_delivery import minutes_subject
+from email_outbox import DELIVERED, FAILED, PENDING, SENDING, EmailOutbox, OutboxWorker, gmail_outbox_sender
+from fake_gmail import FakeGmailService
+
+
+def _sender(service):
+    def send(entries):
+        return gmail_outbox_sender(entries, service=service)
+    return send
+
+
+def test_enqueue_is_idempotent():
+    """Queueing the same minutes twice gives one entry with one Message-ID"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        first = outbox.enqueue("meeting-1", "# Minutes", "me@example.com", "team@example.com")
+        second = outbox.enqueue("meeting-1", "# Minutes", "me@example.com", "team@example.com")
+        other = outbox.enqueue("meeting-1", "# Minutes", "me@example.com", "boss@example.com")
+        statuses = outbox.delivery_status("meeting-1")
+        outbox.close()
+
+    assert first.id == second.id and first.message_id == second.message_id
+    assert other.id != first.id
+    assert [entry.status for entry in statuses] == [PENDING, PENDING]
+    print("✓ Duplicate enqueue returns the existing entry")
+
+
+def test_enqueue_is_idempotent_across_days():
+    """Queueing the same minutes on a later day keeps the first entry and subject"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        first_subject = minutes_subject(datetime(2026, 10, 17, 23, 59))
+        first = outbox.enqueue("meeting-1", "# Minutes", "me@example.com", "team@example.com",
+                               subject=first_subject)
+        second = outbox.enqueue("meeting-1", "# Minutes", "me@example.com", "team@example.com",
+                                subject=minutes_subject(datetime(2026, 10, 18, 0, 1)))
+        statuses = outbox.delivery_status("meeting-1")
+        outbox.close()
+
+    assert first_subject != minutes_subject(datetime(2026, 10, 18))
+    assert first.id == second.id and first.message_id == second.message_id
+    assert second.subject == first_subject and len(statuses) == 1
+    print("✓ Enqueue on the next day returns the existing entry")
+
+def test_retry_does_not_duplicate_draft():
+    """A draft created but not acknowledged is found by Message-ID on retry"""
+    service = FakeGmailService(lose_responses=1)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        entry = outbox.enqueue("meeting-1", "# Minutes", "me@example.com", "team@example.com")
+        worker = OutboxWorker(outbox, send=_sender(service), max_attempts=3, base_delay=0.01)
+        worker.start()
+        worker.join(timeout=10)
+        final = outbox.get(entry.id)
+        outbox.close()
+
+    assert not worker.is_alive()
+    assert final.status == DELIVERED and final.attempts == 2
+    assert len(service.drafts) == 1
+    assert final.draft_id == "draft-1"
+    print(f"✓ {final.describe()}, one draft in Gmail")
+
+
+def test_permanent_failure_is_reported():
+    """After max attempts the entry is failed with the last error"""
+    def send(entries):
+        raise RuntimeError("invalid_grant")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        outbox.enqueue("meeting-2", "# Minutes", "me@example.com", "team@example.com")
+        worker = OutboxWorker(outbox, send=send, max_attempts=3, base_delay=0.01)
+        worker.start()
+        worker.join(timeout=10)
+        [final] = outbox.delivery_status("meeting-2")
+        outbox.close()
+
+    assert final.status == FAILED and final.attempts == 3
+    assert "invalid_grant" in final.last_error
+    print(f"✓ {final.describe()}")
+
+
+def test_failed_entry_is_queued_again():
+    """Enqueueing after a permanent failure retries the entry without duplicating a draft"""
+    service = FakeGmailService()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        entry = outbox.enqueue("meeting-7", "# Minutes", "me@example.com", "team@example.com")
+        outbox.claim()
+        outbox.mark_failed(entry.id, "invalid_grant", retry_at=None)
+
+        again = outbox.enqueue("meeting-7", "# Minutes", "me@example.com", "team@example.com")
+        worker = OutboxWorker(outbox, send=_sender(service), max_attempts=3, base_delay=0.01)
+        worker.start()
+        worker.join(timeout=10)
+        final = outbox.get(entry.id)
+        outbox.close()
+
+    assert again.id == entry.id and again.status == PENDING and again.attempts == 0
+    assert again.message_id == entry.message_id
+    assert final.status == DELIVERED and len(service.drafts) == 1
+    print("✓ Failed entry queued again")
+
+
+def test_stale_sending_entries_recovered():
+    """An entry claimed by a process that died is queued again"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        entry = outbox.enqueue("meeting-3", "# Minutes", "me@example.com", "team@example.com")
+        assert outbox.claim().id == entry.id
+        assert outbox.claim() is None
+        assert outbox.recover_stale(older_than=0) == 1
+        assert outbox.claim().attempts == 2
+        outbox.close()
+    print("✓ Stale entries recovered")
+
+
+def test_claim_batch_without_returning():
+    """Claims work in one transaction without UPDATE ... RETURNING"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        entries = [outbox.enqueue("meeting-5", "# Minutes", "me@example.com", f"r{i}@example.com") for i in range(3)]
+        claimed = outbox.claim_batch(2)
+        rest = outbox.claim_batch(5)
+        outbox.close()
+
+    assert [entry.id for entry in claimed] == [entry.id for entry in entries[:2]]
+    assert [entry.id for entry in rest] == [entries[2].id]
+    assert all(entry.status == SENDING and entry.attempts == 1 for entry in claimed + rest)
+    print("✓ Entries claimed with SELECT and UPDATE")
+
+
+def test_worker_survives_outbox_errors():
+    """An outbox error is logged and retried instead of killing the worker"""
+    service = FakeGmailService()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        entry = outbox.enqueue("meeting-6", "# Minutes", "me@example.com", "team@example.com")
+        claim_batch, failures = outbox.claim_batch, [sqlite3.OperationalError("database is locked")]
+
+        def flaky_claim(limit):
+            if failures:
+                raise failures.pop()
+            return claim_batch(limit)
+
+        outbox.claim_batch = flaky_claim
+        worker = OutboxWorker(outbox, send=_sender(service), max_attempts=3, base_delay=0.01)
+        worker.start()
+        worker.join(timeout=10)
+        final = outbox.get(entry.id)
+        outbox.close()
+
+    assert not worker.is_alive()
+    assert final.status == DELIVERED
+    print("✓ Worker recovered from an outbox error")
+
+
+def test_worker_batches_recipients():
+    """Due entries for several recipients are delivered in one batch request"""
+    service = FakeGmailService()
+    recipients = [f"group{i}@example.com" for i in range(5)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        for recipient in recipients:
+            outbox.enqueue("meeting-4", "# Minutes", "me@example.com", recipient)
+        worker = OutboxWorker(outbox, send=_sender(service), max_attempts=3, base_delay=0.01)
+        worker.start()
+        worker.join(timeout=10)
+        statuses = outbox.delivery_status("meeting-4")
+        outbox.close()
+
+    assert [entry.status for entry in statuses] == [DELIVERED] * 5
+    assert service.http_requests == 1
+    assert sorted(draft["to"] for draft in service.drafts) == recipients
+    print(f"✓ {len(statuses)} drafts delivered in {service.http_requests} HTTP request")
+
+
+def test_old_delivered_entries_are_pruned():
+    """Only delivered entries older than the TTL are deleted"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        old = outbox.enqueue("meeting-1", "# Minutes", "me@example.com", "old@example.com")
+        recent = outbox.enqueue("meeting-1", "# Minutes", "me@example.com", "recent@example.com")
+        pending = outbox.enqueue("meeting-1", "# Minutes", "me@example.com", "pending@example.com")
+        outbox.mark_delivered(old.id, "draft-1")
+        outbox.mark_delivered(recent.id, "draft-2")
+        outbox._conn.execute("UPDATE outbox SET updated_at = updated_at - 8 * 24 * 3600 WHERE id IN (?, ?)",
+                             (old.id, pending.id))
+
+        assert outbox.prune_delivered(7 * 24 * 3600) == 1
+        remaining = {entry.recipient for entry in outbox.delivery_status("meeting-1")}
+        outbox.close()
+    assert remaining == {"recent@example.com", "pending@example.com"}
+    print("✓ Old delivered entries pruned")
+
+
+if __name__ == "__main__":
+    test_enqueue_is_idempotent()
+    test_enqueue_is_idempotent_across_days()
+    test_retry_does_not_duplicate_draft()
+    test_permanent_failure_is_reported()
+    test_failed_entry_is_queued_again()
+    test_stale_sending_entries_recovered()
+    test_claim_batch_without_returning()
+    test_worker_survives_outbox_errors()
+    test_worker_batches_recipients()
+    test_old_delivered_entries_are_pruned()
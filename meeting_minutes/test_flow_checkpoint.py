@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+"""
+Tests for checkpointed flow state and resuming completed stages
+"""
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from email_outbox import PENDING, EmailOutbox, meeting_id_for
+from flow_checkpoint import STAGE_INCOMPLETE, FlowCheckpoint, checkpointed, flow_run_id
+
+
+@dataclass
+class State:
+    transcript: str = ""
+    meeting_minutes: str = ""
+    drafts: List[str] = field(default_factory=list)
+
+
+class Flow:
+    """The meeting minutes flow's stages, run in order as CrewAI would"""
+
+    def __init__(self, checkpoint, fail_draft=False):
+        self.state = State()
+        self.checkpoint = checkpoint
+        self.fail_draft = fail_draft
+        self.calls = []
+
+    @checkpointed
+    def transcribe_meeting(self):
+        self.calls.append("transcribe")
+        self.state.transcript = "we agreed to ship"
+
+    @checkpointed
+    def generate_meeting_minutes(self):
+        self.calls.append("generate")
+        self.state.meeting_minutes = f"# Minutes\n\n- {self.state.transcript} (v{len(self.calls)})"
+
+    @checkpointed
+    def create_meeting_minutes_draft(self):
+        self.calls.append("draft")
+        if self.fail_draft:
+            return STAGE_INCOMPLETE
+        self.state.drafts.append(self.state.meeting_minutes)
+
+    def kickoff(self):
+        self.transcribe_meeting()
+        self.generate_meeting_minutes()
+        self.create_meeting_minutes_draft()
+        return self
+
+
+def test_failed_stage_resumes_alone():
+    """A failed draft is retried without transcribing or generating again"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "run.json")
+        first = Flow(FlowCheckpoint(path), fail_draft=True).kickoff()
+        assert first.calls == ["transcribe", "generate", "draft"]
+
+        second = Flow(FlowCheckpoint(path)).kickoff()
+        assert second.calls == ["draft"]
+        assert second.state.drafts == [first.state.meeting_minutes]
+        assert FlowCheckpoint(path).completed_stages() == [
+            "transcribe_meeting", "generate_meeting_minutes", "create_meeting_minutes_draft"]
+
+        third = Flow(FlowCheckpoint(path)).kickoff()
+        assert third.calls == [] and third.state.meeting_minutes == first.state.meeting_minutes
+    print("✓ Only the failed stage ran again")
+
+
+class OutboxFlow(Flow):
+    """Queues the draft in an outbox and returns, as main.py does in outbox mode"""
+
+    def __init__(self, checkpoint, outbox):
+        super().__init__(checkpoint)
+        self.outbox = outbox
+
+    @checkpointed
+    def create_meeting_minutes_draft(self):
+        self.calls.append("draft")
+        self.outbox.enqueue(meeting_id_for(self.state.transcript), self.state.meeting_minutes,
+                            "me@example.com", "team@example.com")
+
+
+def test_resume_after_enqueue_skips_the_draft():
+    """Once the draft is queued the stage is complete, even before the outbox delivers it"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "run.json")
+        outbox = EmailOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        first = OutboxFlow(FlowCheckpoint(path), outbox).kickoff()
+        assert first.calls == ["transcribe", "generate", "draft"]
+
+        resumed = OutboxFlow(FlowCheckpoint(path), outbox).kickoff()
+        statuses = outbox.delivery_status(meeting_id_for(resumed.state.transcript))
+        outbox.close()
+    assert resumed.calls == []
+    assert [entry.status for entry in statuses] == [PENDING]
+    print("✓ Resume after enqueue left the queued draft to the outbox")
+
+def test_forced_stage_reruns_later_stages():
+    """Forcing a stage recomputes it and every stage after it"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "run.json")
+        Flow(FlowCheckpoint(path)).kickoff()
+        forced = Flow(FlowCheckpoint(path, force=["generate_meeting_minutes"])).kickoff()
+        assert forced.calls == ["generate", "draft"]
+        assert forced.state.transcript == "we agreed to ship"
+        assert forced.state.meeting_minutes.endswith("(v1)")
+
+        everything = Flow(FlowCheckpoint(path, force=["all"])).kickoff()
+        assert everything.calls == ["transcribe", "generate", "draft"]
+    print("✓ Forced stages recomputed")
+
+
+def test_interrupted_rerun_invalidates_later_stages():
+    """A forced stage that crashes leaves it and later stages incomplete"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "run.json")
+        Flow(FlowCheckpoint(path)).kickoff()
+
+        checkpoint = FlowCheckpoint(path, force=["generate_meeting_minutes"])
+        flow = Flow(checkpoint)
+        flow.transcribe_meeting()
+        checkpoint.start("generate_meeting_minutes")  # the process dies here
+
+        assert FlowCheckpoint(path).completed_stages() == ["transcribe_meeting"]
+        resumed = Flow(FlowCheckpoint(path)).kickoff()
+        assert resumed.calls == ["generate", "draft"]
+    print("✓ Interrupted rerun resumed from the forced stage")
+
+
+def test_run_id_follows_the_audio():
+    """The run id depends on the recording's content, not its name"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = [os.path.join(temp_dir, name) for name in ("a.wav", "b.wav", "c.wav")]
+        for path, content in zip(paths, (b"audio", b"audio", b"other")):
+            with open(path, "wb") as audio_file:
+                audio_file.write(content)
+        ids = [flow_run_id(path) for path in paths]
+    assert ids[0] == ids[1] != ids[2]
+    print("✓ Run id derived from the audio")
+
+
+def test_stale_checkpoints_are_deleted():
+    """Opening a checkpoint deletes the ones not written to within the TTL"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio = os.path.join(temp_dir, "meeting.wav")
+        with open(audio, "wb") as audio_file:
+            audio_file.write(b"audio")
+        flow_runs = os.path.join(temp_dir, "cache", "flow_runs")
+        os.makedirs(flow_runs)
+        stale, recent = os.path.join(flow_runs, "stale.json"), os.path.join(flow_runs, "recent.json")
+        for path in (stale, recent):
+            with open(path, "w") as checkpoint_file:
+                checkpoint_file.write("{}")
+        week_ago = time.time() - 8 * 24 * 3600
+        os.utime(stale, (week_ago, week_ago))
+
+        previous = os.environ.get("MEETING_MINUTES_CACHE_DIR")
+        os.environ["MEETING_MINUTES_CACHE_DIR"] = os.path.join(temp_dir, "cache")
+        try:
+            FlowCheckpoint.for_recording(audio)
+        finally:
+            if previous is None:
+                del os.environ["MEETING_MINUTES_CACHE_DIR"]
+            else:
+                os.environ["MEETING_MINUTES_CACHE_DIR"] = previous
+        assert not os.path.exists(stale) and os.path.exists(recent)
+    print("✓ Stale checkpoints deleted")
+
+
+if __name__ == "__main__":
+    test_failed_stage_resumes_alone()
+    test_resume_after_enqueue_skips_the_draft()
+    test_forced_stage_reruns_later_stages()
+    test_interrupted_rerun_invalidates_later_stages()
+    test_run_id_follows_the_audio()
+    test_stale_checkpoints_are_deleted()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""
+Tests for the process-wide Gmail service cache
+"""
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from crews.gmailcrew.tools.gmail_utility import GmailServiceCache
+
+
+def utcnow():
+    """Naive UTC now, as google-auth keeps expiry"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class FakeCredentials:
+    """Stands in for google.oauth2 Credentials"""
+
+    def __init__(self, expires_in):
+        self.expiry = utcnow() + timedelta(seconds=expires_in)
+        self.refresh_token = "refresh"
+
+    @property
+    def valid(self):
+        return self.expiry > utcnow()
+
+
+class FakeServiceCache(GmailServiceCache):
+    """Cache with the Google calls replaced by counters"""
+
+    def __init__(self, expires_in=3600, **kwargs):
+        super().__init__(token_path="unused", credentials_path="unused", **kwargs)
+        self.expires_in = expires_in
+        self.saved = 0
+
+    def _load_credentials(self):
+        return FakeCredentials(self.expires_in)
+
+    def _refresh(self, creds):
+        creds.expiry = utcnow() + timedelta(hours=1)
+
+    def _save(self, creds):
+        self.saved += 1
+
+    def _load_discovery(self):
+        return {"name": "gmail"}
+
+    def _build(self, discovery, creds):
+        return object()
+
+
+def test_service_reused_within_thread():
+    """One build per thread; later calls reuse it without touching disk"""
+    cache = FakeServiceCache(refresh_margin=300)
+    first = cache.service()
+    assert cache.service() is first and cache.service() is first
+
+    metrics = cache.metrics()
+    assert (metrics.credential_loads, metrics.builds, metrics.cache_hits, metrics.discovery_loads) == (1, 1, 2, 1)
+    assert cache.saved == 0
+    print(f"✓ {metrics.describe()}")
+
+
+def test_per_thread_services_share_discovery():
+    """Concurrent sessions get their own service; credentials and discovery are loaded once"""
+    cache = FakeServiceCache(refresh_margin=300)
+    services = []
+    lock = threading.Lock()
+
+    def session():
+        service = cache.service()
+        with lock:
+            services.append(service)
+
+    threads = [threading.Thread(target=session) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = cache.metrics()
+    assert len({id(service) for service in services}) == 8
+    assert metrics.builds == 8 and metrics.credential_loads == 1 and metrics.discovery_loads == 1
+    print("✓ 8 threads, 8 services, one credential load and discovery parse")
+
+
+def test_token_refreshed_before_expiry():
+    """A token inside the refresh margin is refreshed once and saved; services are kept"""
+    cache = FakeServiceCache(expires_in=60, refresh_margin=300)
+    first = cache.service()
+    second = cache.service()
+
+    metrics = cache.metrics()
+    assert metrics.refreshes == 1 and cache.saved == 1
+    assert second is first
+    print(f"✓ Token refreshed proactively ({metrics.refreshes} refresh)")
+
+
+def test_refresh_does_not_block_other_threads():
+    """While one thread refreshes a still-valid token, other threads keep using their services"""
+    refreshing, release = threading.Event(), threading.Event()
+
+    class SlowRefreshCache(FakeServiceCache):
+        def _refresh(self, creds):
+            refreshing.set()
+            release.wait(5)
+            super()._refresh(creds)
+
+    cache = SlowRefreshCache(expires_in=3600, refresh_margin=300)
+    first = cache.service()
+    cache._creds.expiry = utcnow() + timedelta(seconds=60)
+    refresher = threading.Thread(target=cache.service)
+    refresher.start()
+    assert refreshing.wait(5)
+    services = []
+    try:
+        # Another thread with its own service; it would wait on the refresh if that held the cache lock
+        other = threading.Thread(target=lambda: services.append(cache.service()))
+        other.start()
+        other.join(1)
+        assert services and not other.is_alive()
+        assert cache.service() is first
+    finally:
+        release.set()
+        refresher.join()
+    assert cache.metrics().refreshes == 1
+    print("✓ Token refreshed without blocking other threads")
+
+
+def test_invalidate_rebuilds():
+    """After invalidation the credentials are reloaded and the service rebuilt"""
+    cache = FakeServiceCache(refresh_margin=300)
+    first = cache.service()
+    cache.invalidate()
+    assert cache.service() is not first
+    assert cache.metrics().credential_loads == 2
+    print("✓ Invalidated cache reloads credentials")
+
+
+if __name__ == "__main__":
+    test_service_reused_within_thread()
+    test_per_thread_services_share_discovery()
+    test_token_refreshed_before_expiry()
+    test_refresh_does_not_block_other_threads()
+    test_invalidate_rebuilds()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Tests for the LLM response and crew kickoff cache
+"""
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from disk_cache import DiskCache
+from llm_cache import cached_kickoff, completion_cache_key, describe_cache_stats, kickoff_cache_key
+
+
+class FakeCrew:
+    """Minimal crew: one agent, one task, counts kickoffs"""
+
+    def __init__(self, description="Summarize {transcript}", model="gpt-4o-mini", tools=()):
+        agent = SimpleNamespace(role="Summarizer", goal="Summarize", backstory="", tools=list(tools),
+                                llm=SimpleNamespace(model=model))
+        self.agents = [agent]
+        self.tasks = [SimpleNamespace(description=description, expected_output="A summary", agent=agent, tools=[])]
+        self.process = "sequential"
+        self.kickoffs = 0
+
+    def kickoff(self, inputs):
+        self.kickoffs += 1
+        return SimpleNamespace(raw=f"summary of {inputs['transcript']}")
+
+
+def test_kickoff_key_covers_prompt_model_and_tools():
+    """Changing the input, task prompt, model or tool schema changes the key"""
+    inputs = {"transcript": "hello"}
+    base = kickoff_cache_key(FakeCrew(), inputs)
+    tool = SimpleNamespace(name="file_writer", description="Writes content to a file.", args_schema=None)
+
+    assert base == kickoff_cache_key(FakeCrew(), inputs)
+    assert base != kickoff_cache_key(FakeCrew(), {"transcript": "bye"})
+    assert base != kickoff_cache_key(FakeCrew(description="Condense {transcript}"), inputs)
+    assert base != kickoff_cache_key(FakeCrew(model="gpt-4o"), inputs)
+    assert base != kickoff_cache_key(FakeCrew(tools=[tool]), inputs)
+    assert completion_cache_key("m", [{"role": "user", "content": "a"}]) != completion_cache_key(
+        "m", [{"role": "user", "content": "b"}])
+    print("✓ Cache keys cover model, rendered prompt and tools")
+
+
+def test_repeat_kickoff_skips_crew():
+    """A repeat run is served from the cache; bypass forces a fresh run"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = DiskCache(os.path.join(temp_dir, "llm.sqlite3"))
+        crew = FakeCrew()
+
+        first = cached_kickoff(crew, {"transcript": "hello"}, cache=cache)
+        second = cached_kickoff(crew, {"transcript": "hello"}, cache=cache)
+        assert crew.kickoffs == 1
+        assert second.raw == first.raw and second.cached
+
+        os.environ["LLM_CACHE_BYPASS"] = "1"
+        try:
+            cached_kickoff(crew, {"transcript": "hello"}, cache=cache)
+        finally:
+            del os.environ["LLM_CACHE_BYPASS"]
+        assert crew.kickoffs == 2
+
+        report = describe_cache_stats(cache)
+        cache.close()
+    assert "1 hit(s), 1 miss(es)" in report
+    print(f"✓ Repeat kickoff served from cache ({report})")
+
+
+class FakeSummary:
+    """Stands in for a pydantic output model"""
+
+    def __init__(self, summary):
+        self.summary = summary
+
+    def model_dump_json(self):
+        return json.dumps({"summary": self.summary})
+
+    @classmethod
+    def model_validate_json(cls, data):
+        return cls(**json.loads(data))
+
+
+class StructuredCrew(FakeCrew):
+    """Crew whose task returns a structured output"""
+
+    def __init__(self):
+        super().__init__()
+        self.tasks[0].output_pydantic = FakeSummary
+
+    def kickoff(self, inputs):
+        self.kickoffs += 1
+        task_output = SimpleNamespace(raw='{"summary": "short"}', pydantic=FakeSummary("short"))
+        return SimpleNamespace(raw="# Minutes", tasks_output=[task_output])
+
+
+def test_structured_outputs_survive_cache():
+    """Cached kickoffs rebuild each task's structured output"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = DiskCache(os.path.join(temp_dir, "llm.sqlite3"))
+        crew = StructuredCrew()
+        cached_kickoff(crew, {"transcript": "hello"}, cache=cache)
+        output = cached_kickoff(crew, {"transcript": "hello"}, cache=cache)
+        cache.close()
+
+    assert crew.kickoffs == 1 and output.cached
+    assert output.raw == "# Minutes"
+    assert isinstance(output.tasks_output[0].pydantic, FakeSummary)
+    assert output.tasks_output[0].pydantic.summary == "short"
+    print("✓ Structured task outputs restored from cache")
+
+
+if __name__ == "__main__":
+    test_kickoff_key_covers_prompt_model_and_tools()
+    test_repeat_kickoff_skips_crew()
+    test_structured_outputs_survive_cache()
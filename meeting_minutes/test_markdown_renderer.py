@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Tests for the memoized Markdown renderer shared by the email and the Streamlit view
+"""
+import os
+import sys
+import threading
+
+import markdown
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from markdown_renderer import EXTENSIONS, HTML_TEMPLATE, MarkdownRenderer, inline_styles
+
+MINUTES = """# Meeting Minutes
+
+## Decisions
+- Ship the release on Friday
+- Hire two engineers
+
+| Owner | Task |
+|-------|------|
+| Ana   | Draft the plan |
+
+```python
+print("done")
+```
+Line one
+Line two
+"""
+
+
+def test_output_matches_fresh_markdown():
+    """Reusing one Markdown instance gives the same HTML as a new instance per document"""
+    renderer = MarkdownRenderer(cache_size=0)
+    documents = [MINUTES, "# Other\n\n```\ncode\n```", MINUTES.replace("Ana", "Bo")]
+    for text in documents * 2:
+        assert renderer.to_html(text) == markdown.Markdown(extensions=list(EXTENSIONS)).convert(text)
+    stats = renderer.stats()
+    assert stats.instances == 1 and stats.misses == 6 and stats.hits == 0
+    print(f"✓ {stats.describe()}")
+
+
+def test_cache_by_body_hash():
+    """The same minutes are converted once for the email and the view"""
+    renderer = MarkdownRenderer(cache_size=2, inline_css=False)
+    email_html = renderer.email_html(MINUTES)
+    assert email_html == HTML_TEMPLATE.format(final_email_body=renderer.to_html(MINUTES))
+    assert renderer.email_html(MINUTES) is email_html
+    stats = renderer.stats()
+    assert stats.misses == 2 and stats.hits == 2
+
+    renderer.to_html("a")
+    renderer.to_html("b")
+    renderer.to_html(MINUTES)
+    assert renderer.stats().misses == 5
+    print("✓ Rendered HTML cached by body hash, least recently used evicted")
+
+
+def test_inline_css():
+    """Inline styles are added to the email HTML only, and existing styles are kept"""
+    renderer = MarkdownRenderer(inline_css=True)
+    email_html = renderer.email_html(MINUTES)
+    assert '<h1 style="' in email_html and '<td style="' in email_html and '<pre style="' in email_html
+    assert 'style=' not in renderer.to_html(MINUTES)
+    assert inline_styles('<p style="color:red">x</p><pre>y</pre>', {"p": "margin:0;"}) == \
+        '<p style="color:red">x</p><pre>y</pre>'
+    print("✓ CSS inlined into the email HTML")
+
+
+def test_threads_get_their_own_instance():
+    """Markdown instances are not shared between threads"""
+    renderer = MarkdownRenderer(cache_size=0)
+    expected = markdown.Markdown(extensions=list(EXTENSIONS)).convert(MINUTES)
+    results = []
+
+    def render():
+        for _ in range(20):
+            results.append(renderer.to_html(MINUTES) == expected)
+
+    threads = [threading.Thread(target=render) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(results) and renderer.stats().instances == 4
+    print("✓ One Markdown instance per thread")
+
+
+if __name__ == "__main__":
+    test_output_matches_fresh_markdown()
+    test_cache_by_body_hash()
+    test_inline_css()
+    test_threads_get_their_own_instance()
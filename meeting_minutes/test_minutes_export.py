@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Tests for the optional per-run export of meeting minutes artifacts
+"""
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from minutes_export import export_minutes_in_background
+
+
+def _analysis():
+    """Stands in for MeetingAnalysis"""
+    analysis = SimpleNamespace(
+        summary="Revenue grew 12%.",
+        action_items=[
+            SimpleNamespace(description="Send the forecast", owner="Dana", due="Friday"),
+            SimpleNamespace(description="Book the offsite", owner=None, due=None),
+        ],
+        sentiment=SimpleNamespace(sentiment="positive", explanation="Upbeat results"),
+    )
+    analysis.model_dump_json = lambda indent=None: json.dumps({"summary": analysis.summary})
+    return analysis
+
+
+def test_export_is_off_by_default():
+    """Nothing is written unless an export directory is configured"""
+    os.environ.pop("MEETING_MINUTES_EXPORT_DIR", None)
+    assert export_minutes_in_background(_analysis(), "# Minutes", "transcript") is None
+    print("✓ Export off by default")
+
+
+def test_runs_export_to_separate_directories():
+    """Each run gets its own directory with every artifact"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        threads = [
+            export_minutes_in_background(_analysis(), "# Minutes", "same transcript", base_dir=temp_dir)
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.join()
+
+        runs = sorted(os.listdir(temp_dir))
+        assert len(runs) == 3
+        run_dir = os.path.join(temp_dir, runs[0])
+        assert sorted(os.listdir(run_dir)) == [
+            "action_items.txt", "analysis.json", "meeting_minutes.md", "sentiment.txt", "summary.txt"
+        ]
+        with open(os.path.join(run_dir, "action_items.txt"), encoding="utf-8") as f:
+            assert f.read() == "- Send the forecast (Dana, due Friday)\n- Book the offsite"
+        with open(os.path.join(run_dir, "sentiment.txt"), encoding="utf-8") as f:
+            assert f.read() == "positive: Upbeat results"
+    print("✓ Concurrent runs exported to separate directories")
+
+
+if __name__ == "__main__":
+    test_export_is_off_by_default()
+    test_runs_export_to_separate_directories()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Tests for the rate-limit-aware request scheduler
+"""
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from rate_limiter import RequestScheduler, TokenBucket, is_retryable, retry_after_seconds
+
+
+class FakeAPIError(Exception):
+    """Mimics openai.APIStatusError: a status code and a response with headers"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+def test_token_bucket_limits_rate():
+    """Once the burst is spent, tokens arrive at the refill rate"""
+    bucket = TokenBucket(rate=50, capacity=2)
+    started = time.monotonic()
+    for _ in range(7):
+        bucket.acquire()
+    elapsed = time.monotonic() - started
+
+    # 2 tokens from the burst, 5 more at 50/s take ~0.1s
+    assert 0.08 <= elapsed < 0.5
+    print(f"✓ Token bucket paced 7 requests over {elapsed:.2f}s")
+
+
+def test_retryable_errors():
+    """Throttles, 5xx and connection errors retry; client errors do not"""
+    assert is_retryable(FakeAPIError(429))
+    assert is_retryable(FakeAPIError(503))
+    assert is_retryable(ConnectionResetError())
+    assert not is_retryable(FakeAPIError(400))
+    assert not is_retryable(ValueError("bad input"))
+    print("✓ Retryable errors classified")
+
+
+def test_retry_after_header():
+    """Retry-After is read in seconds or milliseconds"""
+    assert retry_after_seconds(FakeAPIError(429, {"retry-after": "2"})) == 2.0
+    assert retry_after_seconds(FakeAPIError(429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(FakeAPIError(500)) is None
+    print("✓ Retry-After parsed")
+
+
+def test_retries_until_success():
+    """Transient failures are retried and counted in the metrics"""
+    scheduler = RequestScheduler(requests_per_minute=6000, max_retries=3, base_delay=0.001)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise FakeAPIError(429, {"retry-after-ms": "10"})
+        if len(attempts) == 2:
+            raise FakeAPIError(502)
+        return "ok"
+
+    assert scheduler.call(flaky) == "ok"
+    metrics = scheduler.metrics()
+    assert len(attempts) == 3
+    assert metrics.requests == 3 and metrics.retries == 2 and metrics.throttled == 1
+    print("✓ Throttled and failed requests retried")
+
+
+def test_gives_up_on_client_errors():
+    """Non-retryable errors and exhausted retries are raised"""
+    scheduler = RequestScheduler(requests_per_minute=6000, max_retries=2, base_delay=0.001)
+    attempts = []
+
+    def bad_request():
+        attempts.append(1)
+        raise FakeAPIError(400)
+
+    def always_down():
+        attempts.append(1)
+        raise FakeAPIError(500)
+
+    for fn in (bad_request, always_down):
+        try:
+            scheduler.call(fn)
+        except FakeAPIError:
+            pass
+        else:
+            raise AssertionError("expected FakeAPIError")
+    # One attempt for the bad request, one plus two retries for the outage
+    assert len(attempts) == 4
+    assert scheduler.metrics().failures == 2
+    print("✓ Client errors and exhausted retries raised")
+
+
+def test_concurrency_limit():
+    """No more than max_concurrent calls run at once"""
+    scheduler = RequestScheduler(requests_per_minute=60000, max_concurrent=2)
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    threads = [threading.Thread(target=scheduler.call, args=(work,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = scheduler.metrics()
+    assert peak == 2
+    assert metrics.max_queue_depth >= 2 and metrics.max_wait > 0
+    print(f"✓ Peak concurrency {peak}, peak queue depth {metrics.max_queue_depth}")
+
+
+if __name__ == "__main__":
+    test_token_bucket_limits_rate()
+    test_retryable_errors()
+    test_retry_after_header()
+    test_retries_until_success()
+    test_gives_up_on_client_errors()
+    test_concurrency_limit()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Tests for the one-time bootstrap and the import budget of the pipeline modules
+"""
+import importlib.util
+import os
+import subprocess
+import sys
+
+# Add the src directory to the path
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes')
+sys.path.append(SRC_DIR)
+
+from bootstrap import bootstrap, import_time_breakdown, lazy_import, startup_report
+
+# What main.py and the Streamlit app import before any work starts (crews aside)
+PIPELINE_MODULES = (
+    "bootstrap", "import_helper", "chunk_planner", "email_delivery", "email_outbox", "flow_checkpoint",
+    "llm_cache", "markdown_renderer", "minutes_export", "rate_limiter", "streaming_pipeline",
+    "summarization", "telemetry", "token_budget", "transcript_normalizer", "transcription",
+    "transcription_backends",
+)
+
+# Loaded on first use only
+HEAVY_MODULES = (
+    "crewai", "litellm", "openai", "agentops", "pydub", "numpy", "markdown", "tiktoken",
+    "googleapiclient", "streamlit",
+)
+
+# Cold import of PIPELINE_MODULES, cumulative over top-level imports (~120 ms here)
+IMPORT_BUDGET_MS = 750
+
+# main.py subclasses crewai's Flow, so crewai and the LLM clients its package
+# imports are exempt from the heavy-module check there, and its budget is larger
+MAIN_EXEMPT_MODULES = ("crewai", "litellm", "openai")
+MAIN_IMPORT_BUDGET_MS = 4000
+
+
+def test_pipeline_imports_no_heavy_modules():
+    """Importing the pipeline modules loads none of the heavy dependencies"""
+    statement = (
+        f"import sys; sys.path.insert(0, {SRC_DIR!r}); import {', '.join(PIPELINE_MODULES)}; "
+        f"print('loaded:' + ','.join(sorted({{name.split('.')[0] for name in sys.modules}} & set({HEAVY_MODULES!r}))))"
+    )
+    completed = subprocess.run([sys.executable, "-c", statement], capture_output=True, text=True, check=True)
+    loaded = completed.stdout.strip().splitlines()[-1][len("loaded:"):]
+    assert loaded == "", f"Heavy modules imported at startup: {loaded}"
+    print("✓ No heavy modules imported at startup")
+
+
+def test_import_budget():
+    """Cold import time of the pipeline modules stays within IMPORT_BUDGET_MS"""
+    entries = import_time_breakdown(f"import {', '.join(PIPELINE_MODULES)}", path=[SRC_DIR])
+    top_level = [entry for entry in entries if entry.depth == 0]
+    total_ms = sum(entry.cumulative_us for entry in top_level) / 1000
+    slowest = sorted(top_level, key=lambda entry: entry.cumulative_us, reverse=True)[:5]
+    assert any(entry.module == "email_delivery" for entry in top_level)
+    assert total_ms < IMPORT_BUDGET_MS, (
+        f"Startup imports took {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms); slowest: "
+        + ", ".join(f"{entry.module} {entry.cumulative_us / 1000:.0f} ms" for entry in slowest)
+    )
+    print(f"✓ Startup imports took {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)")
+
+
+def test_main_import_budget():
+    """The app entry point stays within MAIN_IMPORT_BUDGET_MS and loads nothing else heavy"""
+    if importlib.util.find_spec("crewai") is None:
+        print("- crewai is not installed, main.py import budget not checked")
+        return
+    entries = import_time_breakdown("import meeting_minutes.main", path=[os.path.dirname(SRC_DIR)])
+    total_ms = sum(entry.cumulative_us for entry in entries if entry.depth == 0) / 1000
+    heavy = {entry.module.split(".")[0] for entry in entries} & set(HEAVY_MODULES)
+    unexpected = sorted(heavy - set(MAIN_EXEMPT_MODULES))
+    assert not unexpected, f"main.py imported heavy modules: {', '.join(unexpected)}"
+    assert total_ms < MAIN_IMPORT_BUDGET_MS, (
+        f"main.py import took {total_ms:.0f} ms (budget {MAIN_IMPORT_BUDGET_MS} ms)"
+    )
+    print(f"✓ main.py import took {total_ms:.0f} ms (budget {MAIN_IMPORT_BUDGET_MS} ms)")
+
+def test_bootstrap_runs_once():
+    """Only the first bootstrap() call does anything"""
+    bootstrap()
+    assert bootstrap() is False
+    assert os.environ["TOKENIZERS_PARALLELISM"]
+    print("✓ bootstrap() is idempotent")
+
+
+def test_bootstrap_runs_once_under_both_module_names():
+    """The package and flat imports of bootstrap share one setup"""
+    code = (
+        f"import sys; sys.path.insert(0, {os.path.dirname(SRC_DIR)!r}); "
+        f"sys.path.insert(0, {SRC_DIR!r}); "
+        "import importlib; package = importlib.import_module('meeting_minutes.bootstrap'); import bootstrap as flat; "
+        "assert package is not flat; "
+        "print('second:', package.bootstrap(), flat.bootstrap())"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert completed.stdout.count("SQLite version") == 1, completed.stdout
+    assert completed.stdout.strip().splitlines()[-1] == "second: False False"
+    print("✓ bootstrap() runs once under both module names")
+
+
+def test_lazy_import_is_reported():
+    """lazy_import records the first import in the startup report"""
+    assert lazy_import("json") is sys.modules["json"]
+    already_loaded = "wave" in sys.modules
+    assert lazy_import("wave") is sys.modules["wave"]
+    report = startup_report()
+    assert report[0].startswith("Startup:")
+    assert already_loaded or any(line.strip().startswith("import wave:") for line in report)
+    print("✓ Lazy imports are reported")
+
+
+if __name__ == "__main__":
+    test_pipeline_imports_no_heavy_modules()
+    test_import_budget()
+    test_main_import_budget()
+    test_bootstrap_runs_once()
+    test_bootstrap_runs_once_under_both_module_names()
+    test_lazy_import_is_reported()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Tests for the streaming pipeline that summarizes while transcribing
+"""
+import os
+import sys
+import threading
+import time
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from streaming_pipeline import OrderedEmitter, StreamingSummarizer
+from summarization import prepare_transcript, split_into_sections
+from transcript_normalizer import normalize_transcript
+from transcription import transcribe_chunks
+
+
+def _chunks(count, sentences=20):
+    """Chunk transcriptions with fillers and repetitions for the normalizer to remove"""
+    return [
+        " ".join(f"In part {c} point {i} um the the figures were on track." for i in range(sentences))
+        for c in range(count)
+    ]
+
+
+def test_ordered_emitter():
+    """Chunks finishing out of order are emitted in chunk order"""
+    emitted = []
+    emitter = OrderedEmitter(emitted.append)
+    for index in (2, 0, 3, 1):
+        emitter.add(index, f"chunk {index}")
+    assert emitted == ["chunk 0", "chunk 1", "chunk 2", "chunk 3"]
+    print("✓ Chunks emitted in order")
+
+
+def test_sections_match_staged_pipeline():
+    """Streaming produces the same sections as normalizing then splitting the full transcript"""
+    calls = []
+    lock = threading.Lock()
+
+    def summarize_section(section, number, count):
+        with lock:
+            calls.append((number, count))
+        return f"Notes {number}"
+
+    chunks = _chunks(6)
+    with StreamingSummarizer(summarize_section, mode="map_reduce", section_tokens=200,
+                             max_transcript_tokens=10000, normalize=True) as streaming:
+        for chunk in chunks:
+            streaming.add_chunk(chunk)
+        reduction = streaming.finish()
+
+    expected = split_into_sections(normalize_transcript(chunks).text, 200)
+    assert streaming.sections == expected
+    assert reduction.reduced and reduction.sections == [len(expected)]
+    assert sorted(calls) == [(n, None) for n in range(1, len(expected) + 1)]
+    assert reduction.text.startswith("## Section 1 of") and f"Notes {len(expected)}" in reduction.text
+    print(f"✓ {len(expected)} sections, identical to the staged split")
+
+
+def test_short_transcript_is_not_summarized():
+    """In auto mode a short transcript makes no summary calls and is only normalized"""
+    def summarize_section(section, number, count):
+        raise AssertionError("no section should be summarized")
+
+    chunks = _chunks(2, sentences=3)
+    with StreamingSummarizer(summarize_section, mode="auto", section_tokens=200,
+                             max_transcript_tokens=10000, normalize=True) as streaming:
+        for chunk in chunks:
+            streaming.add_chunk(chunk)
+        reduction = streaming.finish()
+    assert not reduction.reduced
+    assert reduction.text == normalize_transcript(chunks).text
+    print("✓ Short transcript passed through unsummarized")
+
+
+def test_streaming_overlaps_transcription():
+    """Summaries run while later chunks transcribe, so little is left at the end"""
+    chunks = _chunks(8)
+    delay = 0.05
+
+    def transcribe_chunk(index, chunk):
+        time.sleep(delay)
+        return chunk
+
+    def summarize_section(section, number, count):
+        time.sleep(delay)
+        return f"Notes {number}"
+
+    settings = dict(mode="map_reduce", section_tokens=150, max_transcript_tokens=10000, max_workers=2)
+
+    started = time.perf_counter()
+    transcript = transcribe_chunks(chunks, transcribe_chunk, max_workers=1)
+    prepare_transcript(normalize_transcript(transcript.text).text, summarize_section, **settings)
+    staged = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with StreamingSummarizer(summarize_section, normalize=True, **settings) as streaming:
+        emitter = OrderedEmitter(streaming.add_chunk)
+        result = transcribe_chunks(chunks, transcribe_chunk, max_workers=1,
+                                   on_progress=lambda r, completed, total: emitter.add(r.index, r.text))
+        emitter.drain(result.chunks)
+        reduction = streaming.finish()
+    streamed = time.perf_counter() - started
+
+    assert reduction.reduced
+    assert streamed < staged * 0.8, (streamed, staged)
+    print(f"✓ Streaming {streamed:.2f}s vs staged {staged:.2f}s (final reduce {reduction.wall_time:.2f}s)")
+
+
+if __name__ == "__main__":
+    test_ordered_emitter()
+    test_sections_match_staged_pipeline()
+    test_short_transcript_is_not_summarized()
+    test_streaming_overlaps_transcription()
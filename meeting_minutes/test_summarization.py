@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Tests for map-reduce summarization of long transcripts
+"""
+import os
+import sys
+import threading
+import time
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from summarization import estimate_tokens, prepare_transcript, split_into_sections
+
+
+def _transcript(sentences):
+    return " ".join(f"Sentence number {i} covers the quarterly results." for i in range(sentences))
+
+
+def test_sections_respect_token_limit():
+    """Sections stay under the limit and keep every sentence, in order"""
+    text = _transcript(200)
+    sections = split_into_sections(text, max_tokens=100)
+
+    assert len(sections) > 1
+    assert all(estimate_tokens(section) <= 100 for section in sections)
+    assert " ".join(sections) == text
+    print(f"✓ Split into {len(sections)} bounded sections")
+
+
+def test_long_sentence_is_split():
+    """A sentence longer than the limit is cut between words"""
+    sections = split_into_sections("word " * 500, max_tokens=50)
+    assert all(estimate_tokens(section) <= 50 for section in sections)
+    assert " ".join(sections).split() == ["word"] * 500
+    print("✓ Oversized sentence split between words")
+
+
+def test_short_transcript_passes_through():
+    """Transcripts under the limit are not summarized first"""
+    def summarize_section(section, number, count):
+        raise AssertionError("should not be called")
+
+    result = prepare_transcript("Short meeting.", summarize_section, mode="auto", max_transcript_tokens=100)
+    assert result.text == "Short meeting." and not result.reduced
+    print("✓ Short transcript passed through unchanged")
+
+
+def test_map_reduce_runs_sections_in_parallel():
+    """Sections are summarized concurrently and reduced in order"""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def summarize_section(section, number, count):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return f"notes {number}/{count}"
+
+    result = prepare_transcript(
+        _transcript(200), summarize_section, mode="auto",
+        section_tokens=200, max_transcript_tokens=500, max_workers=4,
+    )
+
+    count = result.sections[0]
+    assert result.reduced and result.levels == 1
+    assert peak > 1
+    assert [line for line in result.text.splitlines() if line.startswith("notes")] == [
+        f"notes {i}/{count}" for i in range(1, count + 1)
+    ]
+    print(f"✓ {count} sections summarized with peak concurrency {peak}")
+
+
+def test_reduces_again_when_notes_too_long():
+    """Notes that are still over the limit are reduced another level"""
+    def summarize_section(section, number, count):
+        return section[: len(section) // 2]
+
+    result = prepare_transcript(
+        _transcript(400), summarize_section, mode="map_reduce",
+        section_tokens=400, max_transcript_tokens=1000, max_workers=2,
+    )
+
+    assert result.levels > 1
+    assert result.sections[1] < result.sections[0]
+    print(f"✓ Reduced over {result.levels} levels: {result.sections}")
+
+
+if __name__ == "__main__":
+    test_sections_respect_token_limit()
+    test_long_sentence_is_split()
+    test_short_transcript_passes_through()
+    test_map_reduce_runs_sections_in_parallel()
+    test_reduces_again_when_notes_too_long()
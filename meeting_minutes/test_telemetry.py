@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Tests for the local span tracing and its OTLP/JSON lines sink
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from email_delivery import create_minutes_drafts
+from fake_gmail import FakeGmailService
+from telemetry import STATUS_ERROR, JsonlSpanSink, Tracer, set_tracer, traced
+from transcription import ChunkResult, transcribe_chunks
+
+
+def _read_spans(path):
+    spans = []
+    with open(path, encoding="utf-8") as sink_file:
+        for line in sink_file:
+            [resource_spans] = json.loads(line)["resourceSpans"]
+            [scope_spans] = resource_spans["scopeSpans"]
+            spans.extend(scope_spans["spans"])
+    return spans
+
+
+def _attributes(otlp_span):
+    return {item["key"]: list(item["value"].values())[0] for item in otlp_span["attributes"]}
+
+
+def test_spans_nest_and_export_otlp_json():
+    """Nested spans share a trace and are written as OTLP/JSON lines"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "telemetry.jsonl")
+        tracer = Tracer(JsonlSpanSink(path))
+        with tracer.span("flow") as flow:
+            with tracer.span("stage", kind="client", chunk_index=3) as stage:
+                stage.add("bytes_uploaded", 1024)
+                sum(i * i for i in range(200000))
+        spans = _read_spans(path)
+
+    assert [s["name"] for s in spans] == ["stage", "flow"]
+    child, root = spans
+    assert child["traceId"] == root["traceId"] == flow.trace_id and len(root["traceId"]) == 32
+    assert child["parentSpanId"] == root["spanId"] and "parentSpanId" not in root
+    assert child["kind"] == 3 and child["status"]["code"] == 1
+    assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+    attributes = _attributes(child)
+    assert attributes["chunk_index"] == "3" and attributes["bytes_uploaded"] == "1024"
+    assert attributes["wall_time_s"] > 0 and attributes["cpu_time_s"] > 0
+    if "process.peak_rss_bytes" in attributes:
+        assert int(attributes["process.peak_rss_bytes"]) > 0
+    print(f"✓ {stage.describe()}")
+
+
+def test_errors_are_recorded():
+    """A failing block marks its span as an error and still exports it"""
+    tracer = Tracer()
+    try:
+        with tracer.span("gmail"):
+            raise TimeoutError("read timed out")
+    except TimeoutError:
+        pass
+    [failed] = tracer.spans()
+    assert failed.status == STATUS_ERROR and "read timed out" in failed.status_message
+    print(f"✓ {failed.describe()}")
+
+
+def test_chunk_upload_spans_join_the_stage_trace():
+    """Chunks transcribed on worker threads are spans of the calling stage"""
+    tracer = Tracer()
+    previous = set_tracer(tracer)
+    try:
+        @traced
+        def transcribe_meeting():
+            def transcribe(index, chunk):
+                time.sleep(0.01)
+                return ChunkResult(index=index, text=f"chunk {index}", bytes_uploaded=100 * (index + 1))
+            return transcribe_chunks(range(4), transcribe, max_workers=3)
+
+        transcribe_meeting()
+    finally:
+        set_tracer(previous)
+
+    spans = tracer.spans()
+    [stage] = [s for s in spans if s.name == "transcribe_meeting"]
+    chunks = [s for s in spans if s.name == "transcribe_chunk"]
+    assert len(chunks) == 4
+    assert all(s.trace_id == stage.trace_id and s.parent_span_id == stage.span_id for s in chunks)
+    assert sum(s.attributes["bytes_uploaded"] for s in chunks) == 1000
+    print("✓ Chunk upload spans joined the stage's trace")
+
+
+def test_gmail_batch_spans():
+    """Draft creation records the batch request and the bytes sent"""
+    tracer = Tracer()
+    previous = set_tracer(tracer)
+    try:
+        result = create_minutes_drafts("# Minutes", "me@example.com", ["a@example.com", "b@example.com"],
+                                       service=FakeGmailService())
+    finally:
+        set_tracer(previous)
+
+    assert result.success
+    spans = {s.name: s for s in tracer.spans()}
+    insert, batch = spans["gmail_insert_drafts"], spans["gmail_create_drafts"]
+    assert insert.parent_span_id == batch.span_id and insert.attributes["requests"] == 2
+    assert batch.attributes["bytes_uploaded"] == insert.attributes["bytes_uploaded"] > 0
+    assert batch.attributes["failed"] == 0
+    print(f"✓ {batch.describe()}")
+
+
+def test_sink_rotates():
+    """The JSONL file is rotated once it grows past its limit"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "telemetry.jsonl")
+        tracer = Tracer(JsonlSpanSink(path, max_bytes=2000))
+        for i in range(20):
+            with tracer.span("step", i=i):
+                pass
+        assert os.path.exists(path + ".1")
+        assert os.path.getsize(path) <= 2000
+    print("✓ Telemetry file rotated")
+
+
+if __name__ == "__main__":
+    test_spans_nest_and_export_otlp_json()
+    test_errors_are_recorded()
+    test_chunk_upload_spans_join_the_stage_trace()
+    test_gmail_batch_spans()
+    test_sink_rotates()
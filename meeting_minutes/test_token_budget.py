@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Tests for token budgeting and per-task usage recording
+"""
+import contextvars
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from telemetry import Tracer, get_tracer, set_tracer
+from token_budget import (TokenBudgetExceeded, UsageRecorder, budget_transcript, count_tokens,
+                          estimate_crew_tokens, get_usage_recorder, instrument_crew)
+
+
+def _crew():
+    """Three parallel analyses of {transcript} feeding a writer, like MeetingMinutesCrew"""
+    agent = SimpleNamespace(role="Analyst", goal="Analyze", backstory="", llm=SimpleNamespace(model="gpt-4o-mini"))
+    analyses = [
+        SimpleNamespace(name=name, description=f"{name} of:\n{{transcript}}", expected_output="Result",
+                        agent=agent, context=None, async_execution=True)
+        for name in ("summary", "action_items", "sentiment")
+    ]
+    writer = SimpleNamespace(name="writer", description="Write the minutes", expected_output="Minutes",
+                             agent=agent, context=analyses, async_execution=False)
+    return SimpleNamespace(agents=[agent], tasks=analyses + [writer])
+
+
+def _transcript(sentences):
+    return " ".join(f"Sentence number {i} covers the quarterly results." for i in range(sentences))
+
+
+def test_estimate_scales_with_transcript():
+    """Every task that renders {transcript} pays for it; the writer pays for its context"""
+    short = estimate_crew_tokens(_crew(), {"transcript": "hi"})
+    long = estimate_crew_tokens(_crew(), {"transcript": _transcript(100)})
+    transcript_tokens = count_tokens(_transcript(100)) - count_tokens("hi")
+
+    assert long.prompt_tokens - short.prompt_tokens == 3 * transcript_tokens
+    writer = long.tasks[-1]
+    assert writer.prompt_tokens > sum(task.completion_tokens for task in long.tasks[:3])
+    assert long.cost is not None and long.cost > short.cost
+    print(f"✓ Estimate: {long.describe()}")
+
+
+def test_parallel_tasks_overlap_in_latency():
+    """Parallel analyses count once (the slowest) in the latency estimate"""
+    estimate = estimate_crew_tokens(_crew(), {"transcript": _transcript(10)})
+    serial = estimate_crew_tokens(_crew(), {"transcript": _transcript(10)})
+    for task in serial.tasks:
+        task.parallel = False
+    assert estimate.latency < serial.latency
+    print(f"✓ Parallel latency {estimate.latency:.1f}s vs serial {serial.latency:.1f}s")
+
+
+def test_refuse_policy():
+    """Over budget with the refuse policy, no LLM stage runs"""
+    try:
+        budget_transcript(_transcript(500), _crew(), budget=2000, policy="refuse")
+    except TokenBudgetExceeded as e:
+        assert e.estimate.prompt_tokens > 2000
+        print("✓ Over-budget run refused")
+    else:
+        raise AssertionError("expected TokenBudgetExceeded")
+
+
+def test_map_reduce_policy_fits_budget():
+    """Over budget with map_reduce, the transcript is condensed until the crew fits"""
+    def summarize_section(section, number, count):
+        return f"Notes for section {number}."
+
+    reduction, estimate = budget_transcript(
+        _transcript(500), _crew(), budget=6000, policy="map_reduce", summarize_section=summarize_section
+    )
+    assert reduction.reduced
+    assert estimate.prompt_tokens <= 6000
+    print(f"✓ Condensed to fit the budget: ~{estimate.prompt_tokens} prompt tokens")
+
+
+def test_compress_policy():
+    """Over budget with compress, the normalized transcript is used if it fits"""
+    filler = "Um, uh, so the the plan is, you know, on track. " * 60
+    raw = estimate_crew_tokens(_crew(), {"transcript": filler}).prompt_tokens
+    budget = raw - 300
+    reduction, estimate = budget_transcript(filler, _crew(), budget=budget, policy="compress")
+    assert estimate.prompt_tokens <= budget
+    assert "Um" not in reduction.text and not reduction.reduced
+    try:
+        budget_transcript(filler, _crew(), budget=2000, policy="compress")
+    except TokenBudgetExceeded:
+        pass
+    else:
+        raise AssertionError("expected TokenBudgetExceeded")
+    print(f"✓ Compressed {raw} to {estimate.prompt_tokens} prompt tokens")
+
+
+def test_usage_recorder():
+    """Calls and completions are attributed to their task"""
+    recorder = UsageRecorder()
+    recorder.record_call("summary", prompt_tokens=100, completion_tokens=20, elapsed=0.5)
+    recorder.record_call("summary", prompt_tokens=50, completion_tokens=10, elapsed=0.25, cached=True)
+    recorder.on_task_complete(SimpleNamespace(name="summary"))
+
+    usage = recorder.tasks["summary"]
+    assert (usage.calls, usage.cached_calls, usage.prompt_tokens, usage.completion_tokens) == (2, 1, 150, 30)
+    assert usage.finished_after is not None
+    assert "150 prompt + 30 completion tokens" in recorder.describe()[0]
+    print("✓ Usage recorded per task")
+
+
+def test_recorders_are_isolated_per_crew():
+    """Each instrumented crew records into its own recorder, also from other contexts"""
+    first_task, second_task = SimpleNamespace(name="summary"), SimpleNamespace(name="summary")
+    first = SimpleNamespace(tasks=[first_task], task_callback=None)
+    second = SimpleNamespace(tasks=[second_task], task_callback=None)
+
+    first_recorder = contextvars.Context().run(instrument_crew, first)
+    second_context = contextvars.Context()
+    second_recorder = second_context.run(instrument_crew, second)
+
+    assert second_context.run(get_usage_recorder) is second_recorder
+    assert get_usage_recorder() is None
+    # A crewai async task runs on a thread without the context
+    assert get_usage_recorder(first_task) is first_recorder
+    first.task_callback(SimpleNamespace(name="summary"))
+    assert first_recorder.tasks["summary"].finished_after is not None
+    assert "summary" not in second_recorder.tasks
+    print("✓ Usage recorders isolated per crew run")
+
+
+def test_task_spans_start_at_first_llm_call():
+    """crew_task spans of parallel tasks start at their own first LLM call"""
+    previous = set_tracer(Tracer())
+    try:
+        recorder = UsageRecorder()
+        recorder.record_call("summary", prompt_tokens=10, completion_tokens=5, elapsed=0.2)
+        recorder.record_call("sentiment", prompt_tokens=10, completion_tokens=5, elapsed=0.1)
+        recorder.on_task_complete(SimpleNamespace(name="sentiment"))
+        recorder.on_task_complete(SimpleNamespace(name="summary"))
+        recorder.on_task_complete(SimpleNamespace(name="no_llm"))
+        spans = {span.attributes["task"]: span for span in get_tracer().spans()}
+    finally:
+        set_tracer(previous)
+
+    assert spans["summary"].wall_time >= 0.2
+    assert 0.1 <= spans["sentiment"].wall_time < 0.2
+    assert spans["no_llm"].wall_time == 0 and spans["no_llm"].attributes["start_unknown"]
+    print("✓ Task spans timed from their first LLM call")
+
+
+if __name__ == "__main__":
+    test_estimate_scales_with_transcript()
+    test_parallel_tasks_overlap_in_latency()
+    test_refuse_policy()
+    test_map_reduce_policy_fits_budget()
+    test_compress_policy()
+    test_usage_recorder()
+    test_recorders_are_isolated_per_crew()
+    test_task_spans_start_at_first_llm_call()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Tests for transcript normalization before the LLM stage
+"""
+import os
+import sys
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from transcript_normalizer import normalize_transcript, prepare_llm_transcript
+
+
+def test_fillers_removed():
+    """Fillers go; sentence punctuation, capitalization and real phrases stay"""
+    result = normalize_transcript(
+        "Um, so revenue grew, you know, ten percent. Do you know the date? We agreed, uh. Like, what I mean is fine."
+    )
+    assert result.text == "So revenue grew ten percent. Do you know the date? We agreed. What I mean is fine."
+    assert result.fillers_removed == 4
+    print(f"✓ Fillers removed: {result.text}")
+
+
+def test_repetitions_collapsed():
+    """False starts collapse to one copy; grammatical doubles are kept"""
+    result = normalize_transcript("We we should, I think, I think ship it. He had had enough. No. No.")
+    assert result.text == "We should, I think ship it. He had had enough. No. No."
+    assert result.repeats_collapsed == 2
+    print(f"✓ Repetitions collapsed: {result.text}")
+
+
+def test_chunk_seams_merged():
+    """Words repeated at the end of one chunk and the start of the next appear once"""
+    chunks = [
+        "Margins improved across all regions this quarter",
+        "all regions this quarter, and guidance is unchanged.",
+        "The end.",
+    ]
+    result = normalize_transcript(chunks)
+    assert result.text == "Margins improved across all regions this quarter, and guidance is unchanged. The end."
+    assert result.seam_words_removed == 4
+    # The original is the transcript exactly as transcribed
+    assert result.original == " ".join(chunks)
+    print(f"✓ Chunk seams merged ({result.describe()})")
+
+
+def test_reduction_is_reported_and_deterministic():
+    """The reduction ratio reflects the removed text; reruns give the same output"""
+    transcript = "Um, uh, so, um, the the plan is, you know, on track. " * 20
+    first = normalize_transcript(transcript)
+    assert first.text == normalize_transcript(transcript).text
+    assert normalize_transcript(first.text).text == first.text
+    assert 0.3 < first.reduction_ratio < 0.7
+    print(f"✓ {first.describe()}")
+
+
+def test_normalization_can_be_disabled():
+    """With normalization off, the LLM gets the transcript unchanged"""
+    result = prepare_llm_transcript(["Um, hello", "there."], enabled=False)
+    assert result.text == result.original == "Um, hello there."
+    assert result.reduction_ratio == 0
+    print("✓ Normalization disabled")
+
+
+if __name__ == "__main__":
+    test_fillers_removed()
+    test_repetitions_collapsed()
+    test_chunk_seams_merged()
+    test_reduction_is_reported_and_deterministic()
+    test_normalization_can_be_disabled()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+Tests for the concurrent chunk transcription engine
+"""
+import os
+import sys
+import random
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from disk_cache import DiskCache
+from transcription import transcribe_chunks, whisper_chunk_transcriber
+
+
+def test_preserves_chunk_order():
+    """Chunks finishing out of order are reassembled in chunk order"""
+    def transcribe_chunk(index, chunk):
+        time.sleep(random.uniform(0, 0.02))
+        return f"chunk-{chunk}"
+
+    result = transcribe_chunks(list(range(20)), transcribe_chunk, max_workers=8)
+
+    assert [c.index for c in result.chunks] == list(range(20))
+    assert result.text == " ".join(f"chunk-{i}" for i in range(20))
+    print("✓ Transcript reassembled in chunk order")
+
+
+def test_respects_max_workers():
+    """No more than max_workers chunks are transcribed at once"""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def transcribe_chunk(index, chunk):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return str(index)
+
+    transcribe_chunks(range(12), transcribe_chunk, max_workers=3)
+
+    assert 1 < peak <= 3
+    print(f"✓ Peak concurrency {peak} within limit")
+
+
+def test_progress_callback():
+    """The progress callback fires once per chunk on the calling thread"""
+    caller = threading.current_thread()
+    calls = []
+
+    def on_progress(result, completed, total):
+        assert threading.current_thread() is caller
+        calls.append((completed, total))
+
+    transcribe_chunks(["a", "b", "c"], lambda i, c: c, max_workers=2, on_progress=on_progress)
+
+    assert [completed for completed, _ in calls] == [1, 2, 3]
+    assert all(total == 3 for _, total in calls)
+    print("✓ Progress reported for every chunk")
+
+
+def test_failure_propagates():
+    """A failing chunk aborts the run with the original exception"""
+    def transcribe_chunk(index, chunk):
+        if index == 2:
+            raise RuntimeError("upload failed")
+        return "ok"
+
+    try:
+        transcribe_chunks(range(5), transcribe_chunk, max_workers=2)
+    except RuntimeError as e:
+        assert "upload failed" in str(e)
+        print("✓ Chunk failure propagated")
+    else:
+        raise AssertionError("expected RuntimeError")
+
+
+class FakeChunk:
+    """Stands in for pydub.AudioSegment.export"""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def export(self, out_f, format="wav"):
+        out_f.write(self.payload)
+        return out_f
+
+
+class FakeWhisperClient:
+    """Records uploads and echoes the uploaded bytes back as text"""
+
+    def __init__(self):
+        self.uploads = []
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self.create))
+
+    def create(self, model, file):
+        name, audio_file = file
+        data = audio_file.read()
+        self.uploads.append(name)
+        return SimpleNamespace(text=data.decode())
+
+
+def test_cached_chunks_skip_upload():
+    """Re-transcribing identical audio is answered from the cache"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = DiskCache(os.path.join(temp_dir, "cache.sqlite3"))
+        client = FakeWhisperClient()
+        transcriber = whisper_chunk_transcriber(client, profile="source_wav", cache=cache)
+        chunks = [FakeChunk(b"hello"), FakeChunk(b"world")]
+
+        first = transcribe_chunks(chunks, transcriber, max_workers=2)
+        second = transcribe_chunks(chunks, transcriber, max_workers=2)
+        cache.close()
+
+    assert first.text == second.text == "hello world"
+    assert len(client.uploads) == 2
+    assert first.cached_chunks == 0 and second.cached_chunks == 2
+    assert first.bytes_uploaded == 10 and second.bytes_uploaded == 0
+    print("✓ Cached chunks not uploaded again")
+
+
+if __name__ == "__main__":
+    test_preserves_chunk_order()
+    test_respects_max_workers()
+    test_progress_callback()
+    test_failure_propagates()
+    test_cached_chunks_skip_upload()
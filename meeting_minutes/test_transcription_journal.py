@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Tests for resumable transcription journals
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from transcription import transcribe_chunks
+from disk_cache import prune_stale_files
+from transcription_journal import TranscriptionJournal, recording_run_id
+
+
+def test_journal_survives_reopen():
+    """Recorded chunks and completion are read back from disk"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "run.jsonl")
+        journal = TranscriptionJournal(path)
+        journal.record(1, "world", 60000)
+        journal.record(0, "hello", 0)
+        with open(path, "a") as journal_file:
+            journal_file.write('{"index": 2, "te')
+
+        reopened = TranscriptionJournal(path)
+        assert [e["text"] for e in reopened.entries()] == ["hello", "world"]
+        assert reopened.entries()[1]["offset_ms"] == 60000
+        assert not reopened.is_complete
+    print("✓ Journal reloaded, truncated line ignored")
+
+
+def test_run_id_depends_on_content_and_params():
+    """Identical recordings share a run id unless parameters differ"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = os.path.join(temp_dir, "a.wav")
+        second = os.path.join(temp_dir, "b.wav")
+        for path in (first, second):
+            with open(path, "wb") as audio_file:
+                audio_file.write(b"RIFF meeting")
+
+        assert recording_run_id(first, chunk_length_ms=60000) == recording_run_id(second, chunk_length_ms=60000)
+        assert recording_run_id(first, chunk_length_ms=60000) != recording_run_id(first, chunk_length_ms=30000)
+    print("✓ Run id derived from content and parameters")
+
+
+def test_rerun_retries_only_failed_chunks():
+    """A failed run keeps finished chunks; the rerun only transcribes the rest"""
+    calls = []
+
+    def flaky(index, chunk):
+        calls.append(index)
+        if index == 3:
+            raise ConnectionError("network blip")
+        return chunk
+
+    def healthy(index, chunk):
+        calls.append(index)
+        return chunk
+
+    chunks = ["a", "b", "c", "d", "e"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "run.jsonl")
+        try:
+            transcribe_chunks(chunks, flaky, max_workers=1, journal=TranscriptionJournal(path))
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("expected ConnectionError")
+
+        calls.clear()
+        result = transcribe_chunks(chunks, healthy, max_workers=2, journal=TranscriptionJournal(path))
+        assert result.text == "a b c d e"
+        assert 3 in calls and not set(calls) & {0, 1, 2}
+        assert result.resumed_chunks == 5 - len(calls)
+
+        calls.clear()
+        again = transcribe_chunks(chunks, healthy, journal=TranscriptionJournal(path))
+        assert again.text == "a b c d e" and calls == []
+    print("✓ Rerun resumed from the journal")
+
+
+def test_stale_journals_are_deleted():
+    """Opening a journal deletes the ones not written to within the TTL"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio = os.path.join(temp_dir, "meeting.wav")
+        with open(audio, "wb") as audio_file:
+            audio_file.write(b"RIFF meeting")
+        journals = os.path.join(temp_dir, "cache", "journals")
+        os.makedirs(journals)
+        stale, recent = os.path.join(journals, "stale.jsonl"), os.path.join(journals, "recent.jsonl")
+        for path in (stale, recent):
+            with open(path, "w") as journal_file:
+                journal_file.write('{"index": 0, "text": "hello"}\n')
+        week_ago = time.time() - 8 * 24 * 3600
+        os.utime(stale, (week_ago, week_ago))
+
+        previous = os.environ.get("MEETING_MINUTES_CACHE_DIR")
+        os.environ["MEETING_MINUTES_CACHE_DIR"] = os.path.join(temp_dir, "cache")
+        try:
+            journal = TranscriptionJournal.for_recording(audio, chunk_length_ms=60000)
+        finally:
+            if previous is None:
+                del os.environ["MEETING_MINUTES_CACHE_DIR"]
+            else:
+                os.environ["MEETING_MINUTES_CACHE_DIR"] = previous
+        assert not os.path.exists(stale) and os.path.exists(recent)
+        assert os.path.dirname(str(journal.path)) == journals
+
+        os.utime(recent, (week_ago, week_ago))
+        assert prune_stale_files(journals, "*.jsonl", ttl=3600) == 0  # once per process
+        assert prune_stale_files(journals, "*.jsonl", ttl=3600, force=True) == 1
+    print("✓ Stale journals deleted")
+
+
+if __name__ == "__main__":
+    test_journal_survives_reopen()
+    test_run_id_depends_on_content_and_params()
+    test_rerun_retries_only_failed_chunks()
+    test_stale_journals_are_deleted()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Tests for silence-aware chunking
+"""
+import os
+import sys
+import tempfile
+import wave
+
+import numpy as np
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'meeting_minutes'))
+
+from audio_chunking import PCMParams
+from voice_activity import SilenceAwareChunkSource, frame_levels_db
+
+RATE = 8000
+
+
+def speech(seconds):
+    return (np.sin(np.arange(int(RATE * seconds)) * 0.3) * 8000).astype(np.int16)
+
+
+def silence(seconds):
+    return np.zeros(int(RATE * seconds), dtype=np.int16)
+
+
+def write_wav(path, *parts, rate=RATE):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.concatenate(parts).tobytes())
+
+
+def test_frame_levels():
+    """Loud frames measure near full scale, silent frames at the floor"""
+    pcm = np.concatenate([np.full(80, 16384, dtype=np.int16), silence(0.01)]).tobytes()
+    levels = frame_levels_db(pcm, PCMParams(2, RATE, 1), 80)
+
+    assert len(levels) == 2
+    assert -7 < levels[0] < -5
+    assert levels[1] < -150
+    print("✓ Frame levels measured")
+
+
+def test_long_silence_is_skipped():
+    """Silence longer than min_silence_ms is dropped and reported"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "meeting.wav")
+        write_wav(path, speech(2), silence(10), speech(2))
+
+        source = SilenceAwareChunkSource(path, chunk_length_ms=60000)
+        chunks = list(source.iter_pcm_chunks())
+
+    kept_seconds = sum(len(c) for c in chunks) / 2 / RATE
+    assert len(chunks) == 1
+    assert source.chunk_offset_ms(0) == 0
+    assert 4 < kept_seconds < 5
+    assert 9000 < source.stats.skipped_ms < 10000
+    print(f"✓ Skipped {source.stats.skipped_ms / 1000:.1f}s of silence")
+
+
+def test_boundaries_fall_in_pauses():
+    """Chunks close at the first pause after reaching the target length"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "meeting.wav")
+        write_wav(path, speech(3), silence(0.5), speech(1.5), silence(0.5), speech(3))
+
+        source = SilenceAwareChunkSource(path, chunk_length_ms=4000, max_chunk_ms=8000)
+        chunks = list(source.iter_pcm_chunks())
+
+    lengths = [len(c) / 2 / RATE for c in chunks]
+    assert len(chunks) == 2
+    assert 4.5 < lengths[0] < 5.5
+    assert 4500 < source.chunk_offset_ms(1) < 5500
+    print(f"✓ Chunks cut at pauses: {lengths}")
+
+
+def test_split_at_max_length_never_yields_empty_chunk():
+    """A chunk split at max_chunk_ms whose quietest frame is its last keeps audio on both sides"""
+    fade = speech(3) * np.linspace(1, 0.05, int(RATE * 3))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "meeting.wav")
+        write_wav(path, fade.astype(np.int16), silence(0.1), speech(1))
+
+        source = SilenceAwareChunkSource(path, chunk_length_ms=3000, max_chunk_ms=3000)
+        chunks = list(source.iter_pcm_chunks())
+
+    assert len(chunks) == 2
+    assert all(chunks)
+    assert len(chunks[0]) / 2 / RATE <= 3
+    print("✓ Split at max length keeps both halves non-empty")
+
+
+def test_split_at_max_length_at_16khz():
+    """Regression: a fading 16 kHz tone split at max_chunk_ms raised IndexError"""
+    rate = 16000
+    samples = np.arange(rate * 3)
+    fade = np.sin(samples * 0.3) * (16000 * (1 - samples / (rate * 3)) + 800)
+    tone = np.sin(np.arange(rate) * 0.3) * 8000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "meeting.wav")
+        write_wav(path, fade.astype(np.int16), np.zeros(rate // 10, dtype=np.int16), tone.astype(np.int16),
+                  rate=rate)
+
+        source = SilenceAwareChunkSource(path, chunk_length_ms=3000, max_chunk_ms=3000)
+        chunks = list(source.iter_pcm_chunks())
+
+    assert len(chunks) == 2
+    assert all(chunks)
+    assert source.chunk_offset_ms(1) > 2000
+    print("✓ 16 kHz split at max length")
+
+
+def test_all_silence_yields_nothing():
+    """A recording with no speech produces no chunks"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "meeting.wav")
+        write_wav(path, silence(5))
+
+        source = SilenceAwareChunkSource(path)
+        assert list(source.iter_pcm_chunks()) == []
+    print("✓ Silent recording skipped entirely")
+
+
+if __name__ == "__main__":
+    test_frame_levels()
+    test_long_silence_is_skipped()
+    test_boundaries_fall_in_pauses()
+    test_split_at_max_length_never_yields_empty_chunk()
+    test_split_at_max_length_at_16khz()
+    test_all_silence_yields_nothing()